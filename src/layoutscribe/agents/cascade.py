@@ -0,0 +1,102 @@
+"""Model cascade.
+
+Responsibilities:
+- Describe an ordered list of model tiers (cheap first) with per-call cost
+  estimates.
+- Decide when a page escalates to the next tier: reviewer errors that would
+  trigger a re-ask, or mean block confidence below a threshold.
+- Count per-tier calls, final pages and estimated cost for run metadata.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .reviewer import needs_reask
+
+
+@dataclass(frozen=True)
+class ModelTier:
+  model: str
+  cost_per_page_usd: float
+
+
+def parse_tier(spec: str, default_cost_usd: float) -> ModelTier:
+  """Parse `model` or `model=cost_usd` (e.g. `openai/gpt-4o=0.02`)."""
+  model, sep, cost = spec.strip().rpartition("=")
+  if not sep:
+    return ModelTier(model=spec.strip(), cost_per_page_usd=default_cost_usd)
+  try:
+    return ModelTier(model=model.strip(), cost_per_page_usd=float(cost))
+  except ValueError as exc:
+    raise ValueError(f"Invalid tier cost in '{spec}'") from exc
+
+
+def mean_confidence(page: Dict[str, Any]) -> Optional[float]:
+  confs = [b["conf"] for b in page.get("blocks") or [] if b.get("conf") is not None]
+  return sum(confs) / len(confs) if confs else None
+
+
+class Cascade:
+  """Escalate pages through `tiers` until one gives an acceptable answer.
+
+  `may_escalate(tier)` is consulted (and may charge budget) before each
+  escalation; when it refuses, the current answer is kept.
+  """
+
+  def __init__(
+    self,
+    tiers: Sequence[ModelTier],
+    min_conf: Optional[float] = None,
+    may_escalate: Optional[Callable[[ModelTier], bool]] = None,
+  ) -> None:
+    if not tiers:
+      raise ValueError("a cascade needs at least one tier")
+    self.tiers = list(tiers)
+    self.min_conf = min_conf
+    self.may_escalate = may_escalate
+    self.calls = [0] * len(self.tiers)
+    self.pages = [0] * len(self.tiers)
+
+  def needs_escalation(self, page: Dict[str, Any], errors: List[str]) -> bool:
+    if needs_reask(errors):
+      return True
+    if self.min_conf is None:
+      return False
+    conf = mean_confidence(page)
+    return conf is not None and conf < self.min_conf
+
+  def record_call(self, tier: int) -> None:
+    self.calls[tier] += 1
+
+  async def run(
+    self,
+    call: Callable[[str], Awaitable[Dict[str, Any]]],
+    review: Callable[[Dict[str, Any]], List[str]],
+  ) -> Tuple[Dict[str, Any], List[str], int]:
+    """Return the accepted page, its review errors and the tier index used."""
+    tier = 0
+    self.record_call(tier)
+    page = await call(self.tiers[tier].model)
+    errors = review(page)
+    while tier + 1 < len(self.tiers) and self.needs_escalation(page, errors):
+      if self.may_escalate is not None and not self.may_escalate(self.tiers[tier + 1]):
+        break
+      tier += 1
+      self.record_call(tier)
+      page = await call(self.tiers[tier].model)
+      errors = review(page)
+    self.pages[tier] += 1
+    return page, errors, tier
+
+  def stats(self) -> List[Dict[str, Any]]:
+    return [
+      {
+        "model": t.model,
+        "pages": self.pages[i],
+        "calls": self.calls[i],
+        "cost_usd": round(self.calls[i] * t.cost_per_page_usd, 6),
+      }
+      for i, t in enumerate(self.tiers)
+    ]
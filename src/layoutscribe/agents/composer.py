@@ -8,13 +8,14 @@ Responsibilities:
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Dict
 
+from ..layout.compose import Pages
 from ..layout.compose import compose_markdown as _compose_markdown
 from ..layout.compose import compose_text as _compose_text
 
 
-def compose_outputs(pages: List[Dict[str, Any]]) -> Dict[str, str]:
+def compose_outputs(pages: Pages) -> Dict[str, str]:
   """Compose Markdown and plain text from page blocks."""
   markdown = _compose_markdown(pages)
   text = _compose_text(pages)
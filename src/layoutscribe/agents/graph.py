@@ -9,64 +9,128 @@ Responsibilities:
 from __future__ import annotations
 
 import asyncio
-import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from ..utils.io import create_temp_dir
+from ..exceptions import BudgetExceededError, DeadlineExceededError, ProviderAuthError
+from ..utils.io import ArtifactSink, atomic_path, parse_pages_spec
+from ..utils.jsonl import LayoutJsonlWriter
 from ..utils.images import RenderedPage, render_pdf_to_images, pdf_num_pages
-from ..loaders.pptx import render_pptx_to_images
-from ..loaders.docx import render_docx_to_images
+from ..layout.index import INDEX_FILENAME, LayoutIndexBuilder
+from ..layout.store import BlockStore, canonical_page
 from ..layout.validate import build_default_validator
+from ..tracing.profile import span, spanned
 from ..types import DocumentMetadata, PageMetadata
+from ..llm.hedging import Hedger, HedgePolicy
+from ..llm.pool import EndpointPool, EndpointSpec
+from ..llm.compact import WireFormat
+from ..llm.structured import StructuredMode
+from ..llm.usage import TokenUsage
 from .page_vision import run_page_vision
-from .reviewer import review_page, needs_reask
+from .reviewer import ReaskStats, review_page, needs_reask
 from .composer import compose_outputs
-from .planner import plan
-from ..utils.overlays import draw_overlays
-from ..utils.cost import should_abort_budget
+from .cascade import Cascade, ModelTier
+from .scheduler import ScheduleMode, run_ordered, run_streamed, schedule_order
+from ..utils.cost import CostLedger, PriceTable
+from ..utils.crop import trim_margins as trim_page_margins, uncrop_page, vision_input
+from ..utils.deadlines import PageDeadline
+from ..utils.render_cache import RenderCache
 
 
-async def run_pipeline(config: Dict[str, Any]) -> Dict[str, Any]:
-  """Run the end-to-end pipeline and return artifacts."""
+async def run_pipeline(
+  config: Dict[str, Any],
+  sink: Optional[ArtifactSink] = None,
+  on_page: Optional[Callable[[Dict[str, Any]], None]] = None,
+  limiter: Optional[asyncio.Semaphore] = None,
+) -> Dict[str, Any]:
+  """Run the end-to-end pipeline and return artifacts.
+
+  Overlays and intermediate JSON are written through `sink`. When no sink
+  is given, a temporary one is created and closed before returning.
+  `on_page` receives each finished page (canonical shape) as it completes;
+  `limiter` replaces the per-run provider semaphore so concurrent runs in
+  one process share a single provider budget.
+
+  Pages are dispatched in `schedule` order (longest predicted first by
+  default) to at most `parallel_pages` page workers at a time.
+
+  A page that fails is isolated: its error class is recorded in
+  `metadata.page_status`, it is retried in up to `page_retries` later
+  passes, and it falls back to its text layer if it never succeeds. Once
+  the budget is exhausted no further page is dispatched: those pages are
+  marked `skipped_budget` and fall back to their text layer too. The run
+  aborts only when every page fails, or when the budget ran out before
+  any page was answered (`BudgetExceededError`).
+  """
+  if sink is None:
+    own_sink = ArtifactSink(retention=config.get("temp_retention", "delete"))
+    failed = True
+    try:
+      artifacts = await run_pipeline(config, sink=own_sink, on_page=on_page, limiter=limiter)
+      failed = False
+      return artifacts
+    finally:
+      own_sink.close(failed=failed)
+
+  deadline_s: Optional[float] = config.get("deadline_s")
+  page_timeout_s: Optional[float] = config.get("page_timeout_s")
+  page_retries = int(config.get("page_retries", 1))
+  page_retry_backoff_s = float(config.get("page_retry_backoff_s", 10.0))
+  # The document deadline counts from here, rendering included.
+  deadline_at = (
+    asyncio.get_running_loop().time() + deadline_s if deadline_s is not None else None
+  )
   input_path = Path(config["path"]).resolve()
   dpi = int(config.get("dpi", 180))
   pages_spec: Optional[str] = config.get("pages_spec")
   model_id = config["llm"]
   temperature = config.get("llm_params", {}).get("temperature", 0.0)
   provider_concurrency = config.get("provider_concurrency")
+  parallel_pages = int(config.get("parallel_pages") or 0)
+  schedule: ScheduleMode = config.get("schedule", "lpt")
+  trim_margins = bool(config.get("trim_margins", True))
   save_overlays = bool(config.get("save_overlays"))
+  persist_overlays = bool(config.get("persist_overlays", save_overlays))
   save_intermediate = bool(config.get("save_intermediate"))
+  outputs: List[str] = list(config.get("outputs") or [])
   cost_per_page_usd = float(config.get("cost_per_page_usd", 0.0))
   budget_usd = config.get("budget_usd")
+  hedge_policy: Optional[HedgePolicy] = config.get("hedge")
+  escalate_to: List[ModelTier] = list(config.get("escalate_to") or [])
+  endpoints: List[EndpointSpec] = list(config.get("endpoints") or [])
+  stream = bool(config.get("stream"))
+  structured_output: StructuredMode = config.get("structured_output", "json_object")
+  reask_stats = ReaskStats()
+  wire_format: WireFormat = config.get("wire_format", "full")
+  prompt_cache = bool(config.get("prompt_cache", True))
+  ledger = CostLedger(
+    PriceTable(config.get("prices")),
+    budget_usd=budget_usd,
+    default_call_usd=cost_per_page_usd,
+    priors={tier.model: tier.cost_per_page_usd for tier in escalate_to},
+  )
 
   selected_pages: Optional[List[int]] = None
-  if input_path.suffix.lower() == ".pdf" and pages_spec:
-    total = pdf_num_pages(input_path)
-    sel: List[int] = []
-    for part in pages_spec.split(","):
-      part = part.strip()
-      if not part:
-        continue
-      if "-" in part:
-        s, e = part.split("-", 1)
-        a, b = int(s), int(e)
-        if a > b:
-          a, b = b, a
-        sel.extend([p for p in range(a, b + 1) if 1 <= p <= total])
-      else:
-        p = int(part)
-        if 1 <= p <= total:
-          sel.append(p)
-    selected_pages = sorted(set(sel))
-
-  tmp = create_temp_dir()
+  if pages_spec:
+    total = pdf_num_pages(input_path) if input_path.suffix.lower() == ".pdf" else None
+    selected_pages = parse_pages_spec(pages_spec, total)
+
+  tmp = sink.scratch_dir
   rendered: List[RenderedPage] = []
+  page_stream: Optional[Iterator[RenderedPage]] = None
   suffix = input_path.suffix.lower()
+  render_cache: Optional[RenderCache] = None
+  if suffix == ".pdf" and config.get("render_cache"):
+    max_mb = int(config.get("render_cache_max_mb") or 2048)
+    render_cache = RenderCache(Path(config["render_cache"]), max_bytes=max_mb * 1024**2)
   if suffix == ".pdf":
-    rendered = render_pdf_to_images(input_path, dpi, tmp, selected_pages)
+    with span("render pdf", "render", dpi=dpi):
+      rendered = render_pdf_to_images(input_path, dpi, tmp, selected_pages, cache=render_cache)
   elif suffix == ".pptx":
-    slides = render_pptx_to_images(input_path, dpi, tmp)
+    from ..loaders.pptx import render_pptx_to_images
+
+    with span("render pptx", "render", dpi=dpi):
+      slides = render_pptx_to_images(input_path, dpi, tmp, selected_pages)
     rendered = [
       RenderedPage(
         index0=s.index0,
@@ -74,162 +138,413 @@ async def run_pipeline(config: Dict[str, Any]) -> Dict[str, Any]:
         width_px=s.width_px,
         height_px=s.height_px,
         text=s.text,
+        drawings=s.drawings,
+        images=s.images,
       )
       for s in slides
     ]
   elif suffix == ".docx":
-    pages = render_docx_to_images(input_path, dpi, tmp)
-    rendered = [
+    from ..loaders.docx import render_docx_pages
+
+    # Pages are laid out lazily and stream into vision as they are rendered.
+    docx_pages = render_docx_pages(input_path, dpi, tmp, selected_pages)
+    page_stream = (
       RenderedPage(
         index0=p.index0,
         image_path=p.image_path,
         width_px=p.width_px,
         height_px=p.height_px,
         text=p.text,
+        drawings=p.drawings,
+        images=p.images,
       )
-      for p in pages
-    ]
+      for p in spanned(docx_pages, "render page", "render")
+    )
   else:
     rendered = []
+  if trim_margins:
+
+    def _trim(rp: RenderedPage) -> RenderedPage:
+      with span("trim margins", "crop", page=rp.index0 + 1):
+        return trim_page_margins(rp)
+
+    rendered = [_trim(rp) for rp in rendered]
+    if page_stream is not None:
+      page_stream = (_trim(rp) for rp in page_stream)
 
   # Load schema validator from packaged resources
   validator = build_default_validator()
 
   # Run vision for each page with optional provider semaphore
-  semaphore = None
-  if isinstance(provider_concurrency, int) and provider_concurrency > 0:
+  semaphore = limiter
+  if semaphore is None and isinstance(provider_concurrency, int) and provider_concurrency > 0:
     semaphore = asyncio.Semaphore(provider_concurrency)
-  tasks = [
-    run_page_vision(
-      rp.image_path,
+  jsonl_writer: Optional[LayoutJsonlWriter] = None
+  if "layout_jsonl" in outputs:
+    jsonl_writer = LayoutJsonlWriter(sink.primary_path("layout.jsonl"))
+  index_builder: Optional[LayoutIndexBuilder] = None
+  if "layout_index" in outputs:
+    index_builder = LayoutIndexBuilder(config.get("doc_id") or input_path.stem)
+
+  pool: Optional[EndpointPool] = None
+  if endpoints:
+    pool = EndpointPool(
+      [EndpointSpec(model=model_id), *endpoints],
+      cooldown_s=float(config.get("endpoint_cooldown_s", 30.0)),
+    )
+
+  cascade: Optional[Cascade] = None
+  if escalate_to:
+    cascade = Cascade(
+      [ModelTier(model_id, cost_per_page_usd), *escalate_to],
+      min_conf=config.get("escalate_min_conf"),
+      may_escalate=lambda tier: ledger.affordable(tier.model),
+    )
+
+  hedger: Optional[Hedger] = None
+  if hedge_policy is not None:
+    hedger = Hedger(
+      hedge_policy,
+      accept=lambda page: not needs_reask(review_page(page, validator)),
+      may_spend=lambda: ledger.affordable(hedge_policy.hedge_model or model_id),
+    )
+
+  timed_out: List[int] = []
+  budget_errors: List[BudgetExceededError] = []
+  page_status: Dict[int, Dict[str, Any]] = {}
+  failures: Dict[int, Exception] = {}
+
+  async def _attempt(rp: RenderedPage) -> Optional[Dict[str, Any]]:
+    """One try at a page; failures are recorded, not raised."""
+    number = rp.index0 + 1
+    entry = page_status.setdefault(number, {"status": "ok", "attempts": 0})
+    if budget_errors:
+      entry["status"] = "skipped_budget"
+      return None
+    entry["attempts"] += 1
+    clock = PageDeadline(deadline_at, page_timeout_s)
+
+    def _before_dispatch(model: str) -> None:
+      ledger.require(model)
+      clock.start()
+
+    work = analyze_page(
+      rp,
       model_id,
-      rp.width_px,
-      rp.height_px,
       temperature,
-      reask=False,
-      semaphore=semaphore,
+      validator,
+      semaphore,
+      lambda: ledger.affordable(model_id),
+      hedger=hedger,
+      cascade=cascade,
+      pool=pool,
+      stream=stream,
+      structured_output=structured_output,
+      reask_stats=reask_stats,
+      wire_format=wire_format,
+      prompt_cache=prompt_cache,
+      usage=ledger.for_page(number),
+      before_dispatch=_before_dispatch,
+    )
+    try:
+      page = await clock.run(work)
+    except DeadlineExceededError:
+      timed_out.append(number)
+      entry["status"] = "timed_out"
+      return None
+    except BudgetExceededError as exc:
+      budget_errors.append(exc)
+      entry.update(status="skipped_budget", error=type(exc).__name__, message=str(exc)[:500])
+      return None
+    except Exception as exc:
+      failures[number] = exc
+      entry.update(status="failed", error=type(exc).__name__, message=str(exc)[:500])
+      return None
+    if entry["status"] == "failed":
+      entry["status"] = "recovered"
+    return page
+
+  def _finish(rp: RenderedPage, page: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if page is None:
+      # finalize_page fills the page from the text layer.
+      page = {"width_px": rp.width_px, "height_px": rp.height_px, "blocks": []}
+    with span("finalize page", "finalize", page=rp.index0 + 1):
+      finalize_page(rp, page)
+    if jsonl_writer is not None or index_builder is not None or on_page is not None:
+      finished = canonical_page(page)
+      if jsonl_writer is not None:
+        jsonl_writer.write_page(finished)
+      if index_builder is not None:
+        index_builder.add_page(finished)
+      if on_page is not None:
+        on_page(finished)
+    return page
+
+  async def _process_page(rp: RenderedPage) -> Optional[Dict[str, Any]]:
+    with span(f"page {rp.index0 + 1}", "page", page=rp.index0 + 1):
+      page = await _attempt(rp)
+    if page is None and page_status[rp.index0 + 1]["status"] == "failed":
+      return None  # left for the retry pass
+    return _finish(rp, page)
+
+  def _retryable(rp: RenderedPage) -> bool:
+    number = rp.index0 + 1
+    return page_status[number]["status"] == "failed" and not isinstance(
+      failures[number], ProviderAuthError
     )
-    for rp in rendered
-  ]
-  pages_json: List[Dict[str, Any]] = await asyncio.gather(*tasks)
-  current_spend = cost_per_page_usd * len(pages_json)
-
-  # Validate pages and collect errors (non-blocking for MVP)
-  for idx, page in enumerate(pages_json):
-    errs = review_page(page, validator)
-    if needs_reask(errs):
-      if should_abort_budget(current_spend, budget_usd):
+
+  try:
+    if page_stream is not None:
+      # Streamed pages start in page order; there is no full list to sort.
+      rendered, results = await run_streamed(page_stream, _process_page, parallel_pages)
+    else:
+      order = schedule_order(rendered, schedule, head=parallel_pages)
+      results = await run_ordered(rendered, order, _process_page, parallel_pages)
+    # Failed pages get further passes after a longer backoff than the
+    # per-call retries, so transient provider trouble can clear first.
+    for retry_round in range(page_retries):
+      pending = [i for i, rp in enumerate(rendered) if results[i] is None and _retryable(rp)]
+      if not pending:
         break
-      # Targeted re-ask once per page for MVP
-      page = await run_page_vision(
-        rendered[idx].image_path,
-        model_id,
-        rendered[idx].width_px,
-        rendered[idx].height_px,
-        temperature,
-        reask=True,
-        semaphore=semaphore,
-      )
-      # Re-validate
-      errs2 = review_page(page, validator)
-      pages_json[idx] = page if len(errs2) <= len(errs) else pages_json[idx]
-      current_spend += cost_per_page_usd
-      if should_abort_budget(current_spend, budget_usd):
+      delay = page_retry_backoff_s * (2**retry_round)
+      loop = asyncio.get_running_loop()
+      if deadline_at is not None and loop.time() + delay >= deadline_at:
         break
-
-  # Fallback: inject plain-text blocks when LLM returns empty content
-  for idx, rp in enumerate(rendered):
-    if idx >= len(pages_json):
-      break
-    page = pages_json[idx]
-    blocks = page.get("blocks") or []
-    has_text = any((block.get("text") or "").strip() for block in blocks)
-    fallback_text = (rp.text or "").strip()
-    if (not has_text) and fallback_text:
-      page.setdefault("blocks", []).append(
-        {
-          "id": f"fallback-{idx+1}",
-          "type": "paragraph",
-          "bbox": [0.0, 0.0, 1.0, 1.0],
-          "text": fallback_text,
-          "conf": None,
-        }
+      with span("page retry backoff", "backoff", seconds=delay, pages=len(pending)):
+        await asyncio.sleep(delay)
+      retried = await run_ordered(
+        [rendered[i] for i in pending], range(len(pending)), _attempt, parallel_pages
       )
-      blocks = page["blocks"]
-    if not page.get("page_number"):
-      page["page_number"] = idx + 1
-    if not page.get("width_px"):
-      page["width_px"] = rp.width_px
-    if not page.get("height_px"):
-      page["height_px"] = rp.height_px
-    pages_json[idx] = page
-
-  # Compose outputs
-  composed = compose_outputs(pages_json)
+      for i, page in zip(pending, retried):
+        if page is not None or page_status[rendered[i].index0 + 1]["status"] != "failed":
+          results[i] = _finish(rendered[i], page)
+    answered = any(entry["status"] in ("ok", "recovered") for entry in page_status.values())
+    if rendered and budget_errors and not answered:
+      raise budget_errors[0]
+    if rendered and all(entry["status"] == "failed" for entry in page_status.values()):
+      # Nothing succeeded: surface the error (e.g. bad credentials) instead
+      # of returning a document made only of fallbacks.
+      raise failures[min(failures)]
+    pages_json: List[Dict[str, Any]] = [
+      page if page is not None else _finish(rp, None) for rp, page in zip(rendered, results)
+    ]
+  except BaseException:
+    if jsonl_writer is not None:
+      jsonl_writer.close(commit=False)
+    raise
+  if jsonl_writer is not None:
+    jsonl_writer.close()
+    sink.record("primary", jsonl_writer.path)
+  if index_builder is not None:
+    with span("write layout index", "export"):
+      sink.record("primary", index_builder.build().save(sink.primary_path(INDEX_FILENAME)))
+
+  with span("assemble document", "compose", pages=len(pages_json)):
+    assembled = assemble_document(pages_json)
+  if hedger is not None:
+    assembled["metadata"]["hedging"] = hedger.stats()
+  if cascade is not None:
+    tiers = cascade.stats()
+    for tier in tiers:
+      tier["cost_usd"] = ledger.model_cost(tier["model"])
+    assembled["metadata"]["tiers"] = tiers
+  if pool is not None:
+    assembled["metadata"]["endpoints"] = pool.stats()
+  assembled["metadata"]["reasks"] = reask_stats.stats()
+  if render_cache is not None:
+    assembled["metadata"]["render_cache"] = render_cache.stats()
+  assembled["metadata"]["usage"] = ledger.stats()
+  assembled["metadata"]["cost"] = ledger.summary()
+  for page_meta in assembled["metadata"]["pages"]:
+    page_meta.update(ledger.page_totals(page_meta["page_number"]))
+    if page_meta["page_number"] in timed_out:
+      page_meta["timed_out"] = True
+  if deadline_s is not None or page_timeout_s is not None:
+    assembled["metadata"]["timed_out_pages"] = sorted(timed_out)
+  assembled["metadata"]["page_status"] = {n: page_status[n] for n in sorted(page_status)}
 
   overlays_dir_path: Optional[Path] = None
   if save_overlays:
-    overlays_dir_path = tmp / "overlays"
+    from ..utils.overlays import draw_overlays
+
+    overlays_dir_path = sink.dir_for("overlays", persist=persist_overlays)
     for rp, page in zip(rendered, pages_json):
       out = overlays_dir_path / f"page-{page['page_number']:04d}.png"
       try:
-        draw_overlays(rp.image_path, page, out)
+        with span("draw overlay", "overlays", page=page["page_number"]), atomic_path(out) as part:
+          draw_overlays(rp.image_path, page, part)
+        sink.record("overlays", out)
       except Exception:
         pass
 
   intermediate_dir_path: Optional[Path] = None
   if save_intermediate:
-    intermediate_dir_path = tmp / "intermediate"
-    intermediate_dir_path.mkdir(parents=True, exist_ok=True)
+    intermediate_dir_path = sink.dir_for("intermediate")
     for page in pages_json:
-      page_path = intermediate_dir_path / f"page-{page['page_number']:04d}.json"
       try:
-        with page_path.open("w", encoding="utf-8") as f:
-          json.dump(page, f, indent=2)
+        sink.write_json("intermediate", f"page-{page['page_number']:04d}.json", page)
       except Exception:
         pass
 
-  metadata = _build_metadata(pages_json)
+  return {
+    **assembled,
+    "overlays_dir": overlays_dir_path.as_posix() if overlays_dir_path else None,
+    "intermediate_dir": intermediate_dir_path.as_posix() if intermediate_dir_path else None,
+  }
+
+
+async def analyze_page(
+  rp: RenderedPage,
+  model_id: str,
+  temperature: float,
+  validator: Any,
+  semaphore: Optional[asyncio.Semaphore] = None,
+  may_reask: Optional[Callable[[], bool]] = None,
+  hedger: Optional[Hedger] = None,
+  cascade: Optional[Cascade] = None,
+  pool: Optional[EndpointPool] = None,
+  stream: bool = False,
+  structured_output: StructuredMode = "json_object",
+  reask_stats: Optional[ReaskStats] = None,
+  wire_format: WireFormat = "full",
+  prompt_cache: bool = True,
+  usage: Optional[TokenUsage] = None,
+  before_dispatch: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+  """Run vision on one rendered page, re-asking once on reviewer errors.
 
+  `may_reask` is consulted (and may charge budget) before the re-ask;
+  `hedger` races slow calls against a duplicate request. With a `cascade`,
+  its tiers replace `model_id` and the re-ask goes to the last tier tried.
+  Calls for the `pool`'s primary model are balanced across its endpoints;
+  `stream` consumes responses incrementally and `structured_output` picks
+  the response contract; `wire_format="compact"` asks for the short
+  encoding, expanded before review. `prompt_cache` adds cache hints to the
+  shared instruction prefix and token usage is totalled in `usage`.
+  `before_dispatch(model)` guards each first-tier first-pass call (it may
+  raise `BudgetExceededError`); escalations and re-asks are gated by their
+  own `may_*` callbacks. First-pass answers are counted per provider in
+  `reask_stats`. A margin-trimmed page is sent as its crop, and answers are
+  remapped to full-page coordinates before review.
+  """
+  # First-pass review errors by answer id. The answer is kept next to its
+  # errors, so an entry is only reused for that same object and its id
+  # cannot be recycled while the entry lives.
+  reviewed: Dict[int, Tuple[Dict[str, Any], List[str]]] = {}
+  first_model = cascade.tiers[0].model if cascade is not None else model_id
+
+  image_path, width_px, height_px = vision_input(rp)
+
+  async def _call(model: str, reask: bool = False) -> Dict[str, Any]:
+    answer = await run_page_vision(
+      image_path,
+      model,
+      width_px,
+      height_px,
+      temperature,
+      reask=reask,
+      semaphore=semaphore,
+      hedger=hedger,
+      pool=pool,
+      stream=stream,
+      structured_output=structured_output,
+      wire_format=wire_format,
+      prompt_cache=prompt_cache,
+      usage=usage,
+      before_dispatch=before_dispatch if not reask and model == first_model else None,
+    )
+    uncrop_page(answer, rp)
+    if reask_stats is not None and not reask:
+      with span("review", "review"):
+        errors = review_page(answer, validator)
+      reviewed[id(answer)] = (answer, errors)
+      reask_stats.record(model, needs_reask(errors))
+    return answer
+
+  def _review(candidate: Dict[str, Any]) -> List[str]:
+    entry = reviewed.pop(id(candidate), None)
+    if entry is not None and entry[0] is candidate:
+      return entry[1]
+    with span("review", "review"):
+      return review_page(candidate, validator)
+
+  tier = 0
+  if cascade is not None:
+    page, errs, tier = await cascade.run(_call, _review)
+    model_id = cascade.tiers[tier].model
+  else:
+    page = await _call(model_id)
+    errs = _review(page)
+  if needs_reask(errs) and (may_reask is None or may_reask()):
+    # Targeted re-ask once per page for MVP
+    if cascade is not None:
+      cascade.record_call(tier)
+    with span("re-ask", "reask", model=model_id, errors=len(errs)):
+      retry = await _call(model_id, reask=True)
+    if len(_review(retry)) <= len(errs):
+      page = retry
+  return page
+
+
+def assemble_document(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+  """Pack finished pages and compose the document-level outputs."""
+  store = BlockStore.from_pages(pages)
+  composed = compose_outputs(store)
   return {
-    "pages": pages_json,
+    "store": store,
     "markdown": composed["markdown"],
     "text": composed["text"],
-    "overlays_dir": overlays_dir_path.as_posix() if overlays_dir_path else None,
-    "intermediate_dir": intermediate_dir_path.as_posix() if intermediate_dir_path else None,
-    "metadata": metadata.model_dump() if metadata else None,
+    "metadata": _build_metadata(store).model_dump(),
   }
 
 
-def _build_metadata(pages: List[Dict[str, Any]]) -> DocumentMetadata:
+def finalize_page(rp: RenderedPage, page: Dict[str, Any]) -> None:
+  """Inject fallback text for empty pages and fill page-level fields."""
+  blocks = page.get("blocks") or []
+  has_text = any((block.get("text") or "").strip() for block in blocks)
+  fallback_text = (rp.text or "").strip()
+  if (not has_text) and fallback_text:
+    page.setdefault("blocks", []).append(
+      {
+        "id": f"fallback-{rp.index0 + 1}",
+        "type": "paragraph",
+        "bbox": [0.0, 0.0, 1.0, 1.0],
+        "text": fallback_text,
+        "conf": None,
+      }
+    )
+  # The model cannot know the page's position in the document.
+  page["page_number"] = rp.index0 + 1
+  if not page.get("width_px"):
+    page["width_px"] = rp.width_px
+  if not page.get("height_px"):
+    page["height_px"] = rp.height_px
+
+
+def _build_metadata(store: BlockStore) -> DocumentMetadata:
+  table_code = store.type_code("table")
   page_meta: List[PageMetadata] = []
-  blocks_total = 0
-  tables_total = 0
-  for page in pages:
-    blocks = page.get("blocks", []) or []
-    block_count = len(blocks)
-    table_count = sum(1 for b in blocks if b.get("type") == "table")
-    blocks_total += block_count
-    tables_total += table_count
+  for page_pos in range(store.page_count):
+    rows = store.page_slice(page_pos)
+    codes = store.type_codes[rows]
+    table_count = int((codes == table_code).sum()) if table_code is not None else 0
     preview_text = ""
-    for block in blocks:
-      text = (block.get("text") or "").strip()
+    for row in range(rows.start, rows.stop):
+      text = (store.text(row) or "").strip()
       if text:
         preview_text = text[:200]
         break
     page_meta.append(
       PageMetadata(
-        page_number=page.get("page_number", len(page_meta) + 1),
-        block_count=block_count,
+        page_number=int(store.page_numbers[page_pos]),
+        block_count=rows.stop - rows.start,
         table_count=table_count,
         text_preview=preview_text,
       )
     )
   return DocumentMetadata(
     page_count=len(page_meta),
-    blocks_total=blocks_total,
-    table_total=tables_total,
+    blocks_total=store.block_count,
+    table_total=sum(p.table_count for p in page_meta),
     pages=page_meta,
   )
-
-
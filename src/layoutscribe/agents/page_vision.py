@@ -9,10 +9,26 @@ Responsibilities:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
-from ..llm.prompts import page_vision_instruction, reviewer_reask_hint
-from ..llm.router import vision_json_call
+from ..llm.compact import WireFormat, expand_page
+from ..llm.prompts import (
+  compact_reask_hint,
+  page_prompt,
+  page_vision_instruction,
+  page_vision_instruction_compact,
+  reviewer_reask_hint,
+)
+from ..llm.router import request_vision_json, vision_json_call
+from ..llm.structured import JSON_OBJECT_FORMAT, StructuredMode, response_format_for
+from ..tracing.profile import span
+
+if TYPE_CHECKING:
+  import asyncio
+
+  from ..llm.hedging import Hedger
+  from ..llm.pool import EndpointPool
+  from ..llm.usage import TokenUsage
 
 
 async def run_page_vision(
@@ -23,21 +39,82 @@ async def run_page_vision(
   temperature: float = 0.0,
   reask: bool = False,
   semaphore: Optional["asyncio.Semaphore"] = None,
+  hedger: Optional["Hedger"] = None,
+  pool: Optional["EndpointPool"] = None,
+  stream: bool = False,
+  structured_output: StructuredMode = "json_object",
+  wire_format: WireFormat = "full",
+  prompt_cache: bool = True,
+  usage: Optional["TokenUsage"] = None,
+  before_dispatch: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
-  """Run the vision model on a page image and return layout JSON."""
-  import asyncio
+  """Run the vision model on a page image and return layout JSON.
 
-  with image_path.open("rb") as f:
+  With a `hedger`, a slow call may be raced against a duplicate request.
+  Calls for the `pool`'s primary model are spread over its endpoints.
+  `stream` parses the response incrementally as tokens arrive, and
+  `structured_output` selects the response contract per model. With the
+  `compact` wire format the model answers in the short encoding (always as
+  `json_object`), expanded here into the canonical page dict.
+
+  The instruction is a static system prefix shared by every page (cache
+  hinted when `prompt_cache`); page size and re-ask hints follow the image.
+  Token usage of each call is recorded in `usage`. `before_dispatch(model)`
+  runs once a provider slot is held, right before the call (budget guard).
+  """
+  with span("read image", "encode"), image_path.open("rb") as f:
     image_bytes = f.read()
 
-  instruction = page_vision_instruction(width_px, height_px)
-  if reask:
-    instruction = instruction + "\n" + reviewer_reask_hint()
+  compact = wire_format == "compact"
+  instruction = page_vision_instruction_compact() if compact else page_vision_instruction()
+  hint = (compact_reask_hint() if compact else reviewer_reask_hint()) if reask else ""
+  tail = page_prompt(width_px, height_px, hint)
+
+  def _format(model: str) -> Dict[str, Any]:
+    return JSON_OBJECT_FORMAT if compact else response_format_for(model, structured_output)
+
+  async def _answer(model: str) -> Dict[str, Any]:
+    if pool is not None and model == pool.primary_model:
+      return await pool.call(
+        lambda ep: request_vision_json(
+          ep.model,
+          image_bytes,
+          instruction,
+          temperature,
+          stream,
+          _format(ep.model),
+          tail,
+          prompt_cache,
+          usage,
+          **ep.completion_kwargs(),
+        )
+      )
+    return await vision_json_call(
+      model,
+      image_bytes,
+      instruction,
+      temperature,
+      stream,
+      _format(model),
+      tail,
+      prompt_cache,
+      usage,
+    )
+
+  async def _request(model: str) -> Dict[str, Any]:
+    page = await _answer(model)
+    return expand_page(page, width_px, height_px) if compact else page
 
   if semaphore is not None:
-    await semaphore.acquire()
+    with span("provider slot wait", "wait"):
+      await semaphore.acquire()
   try:
-    page_json = await vision_json_call(model_id, image_bytes, instruction, temperature)
+    if before_dispatch is not None:
+      before_dispatch(model_id)
+    if hedger is not None:
+      page_json = await hedger.run(_request, model_id, semaphore)
+    else:
+      page_json = await _request(model_id)
   finally:
     if semaphore is not None:
       semaphore.release()
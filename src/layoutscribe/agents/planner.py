@@ -21,7 +21,14 @@ class PageTask:
 
 
 def plan(input_path: Path, dpi: int, pages: Optional[List[int]] = None) -> List[PageTask]:
-  """Plan page tasks for the given input (PDF-only for now)."""
+  """Plan page tasks for the given input (PDF-only for now).
+
+  `pages` are 1-based page numbers; when omitted, every page is planned.
+  """
+  if pages is None and input_path.suffix.lower() == ".pdf":
+    from ..utils.images import pdf_num_pages
+
+    pages = list(range(1, pdf_num_pages(input_path) + 1))
   tasks: List[PageTask] = []
   if pages:
     for p in pages:
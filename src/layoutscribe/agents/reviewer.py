@@ -8,12 +8,13 @@ Responsibilities:
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
-
-from jsonschema import Draft202012Validator
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from ..layout.validate import geometry_checks
 
+if TYPE_CHECKING:
+  from jsonschema import Draft202012Validator
+
 
 def review_page(page: Dict[str, Any], validator: Draft202012Validator) -> List[str]:
   errs: List[str] = []
@@ -30,3 +31,28 @@ def needs_reask(errors: List[str]) -> bool:
   return any("overlap" in e.lower() or "required" in e.lower() or "bbox" in e.lower() for e in errors)
 
 
+def provider_of(model_id: str) -> str:
+  return model_id.split("/", 1)[0] if "/" in model_id else model_id
+
+
+class ReaskStats:
+  """Per-provider count of first-pass answers and those that needed a re-ask."""
+
+  def __init__(self) -> None:
+    self._counts: Dict[str, List[int]] = {}
+
+  def record(self, model_id: str, needed_reask: bool) -> None:
+    counts = self._counts.setdefault(provider_of(model_id), [0, 0])
+    counts[0] += 1
+    counts[1] += int(needed_reask)
+
+  def stats(self) -> List[Dict[str, Any]]:
+    return [
+      {
+        "provider": provider,
+        "answers": answers,
+        "reasks": reasks,
+        "reask_rate": round(reasks / answers, 4) if answers else 0.0,
+      }
+      for provider, (answers, reasks) in sorted(self._counts.items())
+    ]
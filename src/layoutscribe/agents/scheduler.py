@@ -0,0 +1,151 @@
+"""Page scheduling.
+
+Responsibilities:
+- Predict each page's relative vision cost from cheap signals available
+  before any call: text-layer length, vector drawing count (tables, rules,
+  charts), embedded images and the compressed size of the rendered image.
+- Order pages for dispatch: longest predicted first (LPT) so a dense page
+  late in the document does not start last and set the makespan, plain
+  page order, or the first pages first (for early output) then LPT.
+- Run page work from that order over a fixed number of workers, returning
+  results in page order.
+- Start work on pages from a blocking page iterator (e.g. a paginating
+  renderer) as each one is produced, rendering ahead in a worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Iterator, List, Literal, Sequence, Tuple, TypeVar
+
+from ..utils.images import RenderedPage
+
+ScheduleMode = Literal["lpt", "first_pages", "page_order"]
+SCHEDULE_MODES = ("lpt", "first_pages", "page_order")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Rough output-token equivalents per signal unit. Output length dominates
+# call latency; drawings stand in for table and figure structure.
+_CHARS_PER_TOKEN = 4.0
+_TOKENS_PER_DRAWING = 2.0
+_MAX_DRAWINGS = 2000  # vector-heavy pages (maps, plots) are not all structure
+_TOKENS_PER_IMAGE = 50.0
+_TOKENS_PER_IMAGE_KB = 0.5
+
+
+def predicted_cost(rp: RenderedPage) -> float:
+  """Relative cost of a page's vision call; only the ordering is meaningful."""
+  try:
+    image_kb = rp.image_path.stat().st_size / 1024
+  except OSError:
+    image_kb = 0.0
+  return (
+    len(rp.text) / _CHARS_PER_TOKEN
+    + _TOKENS_PER_DRAWING * min(rp.drawings, _MAX_DRAWINGS)
+    + _TOKENS_PER_IMAGE * rp.images
+    + _TOKENS_PER_IMAGE_KB * image_kb
+  )
+
+
+def schedule_order(
+  pages: Sequence[RenderedPage], mode: ScheduleMode = "lpt", head: int = 0
+) -> List[int]:
+  """Indices into `pages` in dispatch order.
+
+  `first_pages` dispatches the first `head` pages in page order (the first
+  wave of workers), then the rest longest first.
+  """
+  if mode not in SCHEDULE_MODES:
+    raise ValueError(f"Unknown schedule '{mode}'; expected one of {', '.join(SCHEDULE_MODES)}")
+  indices = list(range(len(pages)))
+  if mode == "page_order":
+    return indices
+  split = max(head, 0) if mode == "first_pages" else 0
+  rest = sorted(indices[split:], key=lambda i: predicted_cost(pages[i]), reverse=True)
+  return indices[:split] + rest
+
+
+async def run_ordered(
+  items: Sequence[T],
+  order: Sequence[int],
+  work: Callable[[T], Awaitable[R]],
+  concurrency: int = 0,
+) -> List[R]:
+  """Await `work(item)` for `items` in `order`, at most `concurrency` at once.
+
+  Results are returned in `items` order. `concurrency` <= 0 starts every
+  item at once. If one item raises, the others are cancelled.
+  """
+  results: List[R] = [None] * len(items)  # type: ignore[list-item]
+  queue = iter(order)
+
+  async def _worker() -> None:
+    for i in queue:
+      results[i] = await work(items[i])
+
+  size = len(order) if concurrency <= 0 else min(concurrency, len(order))
+  # Named tasks label the worker tracks of `--profile` traces.
+  tasks = [asyncio.create_task(_worker(), name=f"worker-{n + 1}") for n in range(size)]
+  try:
+    await asyncio.gather(*tasks)
+  except BaseException:
+    for task in tasks:
+      task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    raise
+  return results
+
+
+_END = object()
+
+
+async def run_streamed(
+  source: Iterator[T],
+  work: Callable[[T], Awaitable[R]],
+  concurrency: int = 0,
+) -> Tuple[List[T], List[R]]:
+  """Await `work(item)` for each item of `source` as it is produced.
+
+  `source` is advanced in a worker thread, one item ahead of the free
+  workers, so producing the next item overlaps with work on earlier ones.
+  Returns the items and their results in production order. If one item
+  raises, no further items are pulled and the others are cancelled.
+  """
+  items: List[T] = []
+  results: List[R] = []
+  slots = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+  tasks: List["asyncio.Future[None]"] = []
+
+  async def _run(i: int) -> None:
+    try:
+      results[i] = await work(items[i])
+    finally:
+      if slots is not None:
+        slots.release()
+
+  def _raise_failed() -> None:
+    for task in tasks:
+      if task.done() and not task.cancelled() and task.exception() is not None:
+        raise task.exception()  # type: ignore[misc]
+
+  try:
+    while True:
+      item = await asyncio.to_thread(next, source, _END)
+      if item is _END:
+        break
+      _raise_failed()
+      if slots is not None:
+        await slots.acquire()
+      _raise_failed()
+      items.append(item)  # type: ignore[arg-type]
+      results.append(None)  # type: ignore[arg-type]
+      tasks.append(asyncio.create_task(_run(len(items) - 1), name=f"item-{len(items)}"))
+    await asyncio.gather(*tasks)
+  except BaseException:
+    for task in tasks:
+      task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    raise
+  return items, results
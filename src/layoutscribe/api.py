@@ -11,11 +11,17 @@ Responsibilities:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
-from .agents.graph import run_pipeline
-from .types import ParsedDocument, DocumentLayout, DocumentMetadata
-from .utils.io import export_outputs
+from .types import ParsedDocument, DocumentMetadata
+from .utils.io import ArtifactSink, TempRetention
+
+if TYPE_CHECKING:
+  import asyncio
+
+  from .agents.scheduler import ScheduleMode
+  from .llm.compact import WireFormat
+  from .llm.structured import StructuredMode
 
 
 async def parse(
@@ -33,53 +39,231 @@ async def parse(
   save_intermediate: bool = False,
   cost_per_page_usd: float = 0.02,
   output_dir: Optional[Path] = None,
+  temp_retention: TempRetention = "delete",
+  sink: Optional[ArtifactSink] = None,
+  blocks_dataset: Optional[Path] = None,
+  doc_id: Optional[str] = None,
+  on_page: Optional[Callable[[Dict[str, Any]], None]] = None,
+  limiter: Optional["asyncio.Semaphore"] = None,
+  hedge_percentile: Optional[float] = None,
+  hedge_model: Optional[str] = None,
+  hedge_max_fraction: float = 0.1,
+  escalate_to: Optional[List[str]] = None,
+  escalate_min_conf: Optional[float] = None,
+  endpoints: Optional[List[str]] = None,
+  endpoint_cooldown_s: float = 30.0,
+  stream: bool = False,
+  structured_output: "StructuredMode" = "json_object",
+  wire_format: "WireFormat" = "full",
+  prompt_cache: bool = True,
+  prices: Optional[List[str]] = None,
+  deadline_s: Optional[float] = None,
+  page_timeout_s: Optional[float] = None,
+  page_retries: int = 1,
+  page_retry_backoff_s: float = 10.0,
+  schedule: "ScheduleMode" = "lpt",
+  trim_margins: bool = True,
+  render_cache: Optional[Path] = None,
+  render_cache_max_mb: int = 2048,
+  profile: Optional[Path] = None,
+) -> ParsedDocument:
+  """Parse a document and return its outputs.
+
+  Artifacts are written once, in place, under `output_dir`. Callers that
+  need temp artifacts to outlive this call (e.g. for tracing) may pass their
+  own `sink` and are then responsible for closing it.
+
+  With `blocks_dataset`, every block is also appended to that partitioned
+  Parquet dataset under `doc_id` (default: the input file's stem). The
+  `layout_index` output writes `layout.index.npz`, a queryable block index
+  for `doc_id` built as pages finish (see `layout.index.LayoutIndex`).
+  `on_page` is called with each page dict as soon as it is finished, and
+  `limiter` is a provider semaphore shared with other concurrent parses.
+
+  With `hedge_percentile` (e.g. 0.95), a vision call slower than that
+  percentile of the run's own latencies is duplicated to `hedge_model`
+  (default: `llm`); at most `hedge_max_fraction` of calls are hedged, and
+  hedges count against `budget_usd`.
+
+  `escalate_to` turns `llm` into the first tier of a model cascade: pages
+  that fail review, or whose mean block confidence is below
+  `escalate_min_conf`, are re-run on the next tier. Tiers are `model` or
+  `model=cost_usd`; the cost is the tier's estimate before it has answered
+  (default: `cost_per_page_usd`).
+
+  `endpoints` adds endpoints equivalent to `llm` (specs like
+  `azure/gpt-4o,weight=2,concurrency=8,api_base=...`); calls for `llm` are
+  balanced across the pool by live latency and error rate, and throttled or
+  failing endpoints are drained for `endpoint_cooldown_s`.
+
+  `stream` consumes model responses as they arrive, abandoning clearly
+  malformed output early. `structured_output="json_schema"` sends the
+  packaged page schema as a strict response schema; `"auto"` does so only
+  for models LiteLLM reports as supporting it (others get `json_object`).
+  `wire_format="compact"` asks models for a short encoding (short keys,
+  type codes, 0–1000 integer bboxes, delimited tables) to cut output
+  tokens; it is expanded locally and always requested as `json_object`.
+
+  The vision instruction is sent as a static system prefix shared by every
+  call, with page size and re-ask hints after the image, so providers can
+  reuse their prompt cache. `prompt_cache` also marks that prefix with an
+  explicit cache hint for providers that need one (Anthropic Claude).
+  Prompt, cached and completion tokens per model are in `metadata.usage`.
+
+  Every answered call is priced from its reported token usage: `prices`
+  overrides (`model=prompt,completion[,cached[,cache_write]]`, USD per 1M
+  tokens), then LiteLLM's cost map. Calls to unpriced models cost
+  `cost_per_page_usd`, which is also the estimate for a model's calls
+  until it has answered once. `budget_usd` is checked before each call.
+  When the spend, the calls in flight and the next call's estimate would
+  exceed it, re-asks, hedges and escalations are skipped, and a page's
+  first call stops the run from dispatching further pages: pages not yet
+  answered are marked `skipped_budget` in `metadata.page_status` and fall
+  back to their text layer, and the document is composed from the rest.
+  `BudgetExceededError` is raised only if no page was answered. Per-page tokens and cost
+  are in `metadata.pages` and run totals in `metadata.cost`.
+
+  `deadline_s` bounds the whole parse and `page_timeout_s` each page, from
+  its first vision call holding a provider slot. In-flight calls, retry
+  backoff and slot waits of a page that runs out of time are cancelled;
+  the page falls back to its text layer and is listed in
+  `metadata.timed_out_pages` (and flagged `timed_out` in `metadata.pages`),
+  so the document is composed from whatever finished in time.
+
+  A page whose calls fail after their own retries does not fail the
+  document: the failure (exception class and message) is recorded in
+  `metadata.page_status`, and the page is retried in up to `page_retries`
+  later passes, `page_retry_backoff_s` apart (doubling each pass).
+  Authentication errors are not retried. Pages that never succeed fall
+  back to their text layer. The error is raised only if every page fails.
+
+  At most `parallel_pages` pages are processed at once. `schedule="lpt"`
+  starts the pages predicted to be slowest first (from their text length,
+  vector drawings and images) so one dense page does not finish last;
+  `"first_pages"` starts the first `parallel_pages` pages in order for
+  early output, then the rest longest first; `"page_order"` keeps page
+  order. Results are always in page order.
+
+  With `trim_margins`, each rendered page is cropped to its content box
+  (plus padding) before upload when that removes at least a tenth of its
+  area; returned bboxes are remapped to full-page coordinates.
+
+  With `render_cache` (a directory, shareable between processes), PDF pages
+  are cached by file content hash, page, DPI and renderer, so re-runs and
+  runs with other models or outputs skip rasterization; the least recently
+  used pages are evicted past `render_cache_max_mb`.
+
+  With `profile` (a directory), the run is profiled: every render, encode,
+  LLM call, provider-slot wait, retry backoff, review, re-ask and export is
+  recorded as a span, and `trace.json` (Chrome/Perfetto trace, one track
+  per asyncio task), `cpu.pstats` (cProfile of the event-loop thread) and
+  `stages.json` (per-stage time, concurrency and tracemalloc peak) are
+  written there, also when the run fails. Profiling slows the run.
+  """
+  from .agents.cascade import parse_tier
+  from .agents.graph import run_pipeline
+  from .llm.hedging import HedgePolicy
+  from .llm.pool import parse_endpoint
+  from .tracing.profile import Profiler, span
+  from .utils.cost import parse_price
+
+  owns_sink = sink is None
+  if sink is None:
+    sink = ArtifactSink(Path(output_dir) if output_dir else None, retention=temp_retention)
+  profiler = Profiler().start() if profile is not None else None
+  failed = True
+  try:
+    config: Dict[str, Any] = {
+      "path": path,
+      "outputs": outputs,
+      "llm": llm,
+      "llm_params": llm_params or {"temperature": 0},
+      "dpi": dpi,
+      "parallel_pages": parallel_pages,
+      "trace_mlflow": trace_mlflow,
+      "provider_concurrency": provider_concurrency,
+      "budget_usd": budget_usd,
+      "pages_spec": pages_spec,
+      "save_overlays": save_overlays or trace_mlflow,
+      "persist_overlays": save_overlays,
+      "save_intermediate": save_intermediate,
+      "cost_per_page_usd": cost_per_page_usd,
+      "hedge": (
+        HedgePolicy(
+          percentile=hedge_percentile, hedge_model=hedge_model, max_fraction=hedge_max_fraction
+        )
+        if hedge_percentile is not None
+        else None
+      ),
+      "escalate_to": [parse_tier(spec, cost_per_page_usd) for spec in escalate_to or []],
+      "escalate_min_conf": escalate_min_conf,
+      "endpoints": [parse_endpoint(spec) for spec in endpoints or []],
+      "endpoint_cooldown_s": endpoint_cooldown_s,
+      "stream": stream,
+      "structured_output": structured_output,
+      "wire_format": wire_format,
+      "prompt_cache": prompt_cache,
+      "prices": dict(parse_price(spec) for spec in prices or []),
+      "deadline_s": deadline_s,
+      "page_timeout_s": page_timeout_s,
+      "page_retries": page_retries,
+      "page_retry_backoff_s": page_retry_backoff_s,
+      "schedule": schedule,
+      "doc_id": doc_id or Path(path).stem,
+      "trim_margins": trim_margins,
+      "render_cache": render_cache,
+      "render_cache_max_mb": render_cache_max_mb,
+    }
+    artifacts = await run_pipeline(config, sink=sink, on_page=on_page, limiter=limiter)
+
+    with span("build document", "export"):
+      parsed = document_from_artifacts(artifacts, outputs, save_intermediate)
+
+    if blocks_dataset is not None:
+      from .utils.columnar import append_blocks
+
+      with span("append blocks", "export"):
+        blocks_file = append_blocks(
+          Path(blocks_dataset), artifacts["store"], doc_id or Path(path).stem
+        )
+      sink.record("blocks", blocks_file)
+    with span("write outputs", "export", outputs=",".join(outputs)):
+      manifest = sink.export(parsed, outputs)
+    if profiler is not None:
+      for profile_file in profiler.write(Path(profile)):
+        sink.record("profile", profile_file)
+    if any(manifest.values()):
+      parsed.artifact_paths = manifest
+
+    failed = False
+    return parsed
+  finally:
+    if profiler is not None and failed:
+      try:
+        profiler.write(Path(profile))  # keep the profile of a failed run
+      except OSError:
+        pass
+    if owns_sink:
+      sink.close(failed=failed)
+
+
+def document_from_artifacts(
+  artifacts: Dict[str, Any], outputs: List[str], save_intermediate: bool = False
 ) -> ParsedDocument:
-  config: Dict[str, Any] = {
-    "path": path,
-    "outputs": outputs,
-    "llm": llm,
-    "llm_params": llm_params or {"temperature": 0},
-    "dpi": dpi,
-    "parallel_pages": parallel_pages,
-    "trace_mlflow": trace_mlflow,
-    "provider_concurrency": provider_concurrency,
-    "budget_usd": budget_usd,
-    "pages_spec": pages_spec,
-    "save_overlays": save_overlays or trace_mlflow,
-    "save_intermediate": save_intermediate,
-    "cost_per_page_usd": cost_per_page_usd,
-  }
-  artifacts = await run_pipeline(config)
-  
+  """Build the public `ParsedDocument` from pipeline artifacts."""
   markdown = artifacts.get("markdown") if "markdown" in outputs else None
   text = artifacts.get("text") if "text" in outputs else None
-  layout_json = DocumentLayout(pages=[]) if "layout_json" in outputs else None
-  if layout_json and artifacts.get("pages"):
-    layout_json = DocumentLayout.model_validate({"pages": artifacts["pages"]})
+  layout_store = artifacts.get("store") if "layout_json" in outputs else None
   metadata = None
   if artifacts.get("metadata"):
     metadata = DocumentMetadata.model_validate(artifacts["metadata"])
   overlays_dir = artifacts.get("overlays_dir") if "layout_json" in outputs else None
   intermediate_dir = artifacts.get("intermediate_dir") if save_intermediate else None
-  parsed = ParsedDocument(
+  return ParsedDocument(
     markdown=markdown,
     text=text,
-    layout_json=layout_json,
+    layout_store=layout_store,
     overlays_dir=overlays_dir,
     intermediate_dir=intermediate_dir,
     metadata=metadata,
   )
-
-  if output_dir:
-    manifest = export_outputs(
-      parsed,
-      outputs=outputs,
-      target_dir=Path(output_dir),
-      save_overlays=save_overlays,
-      save_intermediate=save_intermediate,
-    )
-    parsed.artifact_paths = manifest
-
-  return parsed
-
-
@@ -6,17 +6,18 @@ Responsibilities:
 - Handle I/O paths, page selection, and artifact directories.
 - Configure logging verbosity and optional MLflow tracing.
 
-Note: This is a no-op CLI scaffold to expose `layoutscribe --help`.
+Startup: only Typer and lightweight modules are imported at module level
+so `--help`/`--version` never load the pipeline; commands import what they
+need when they run (see `tests/test_import_time.py`).
 """
 
 from pathlib import Path
 from typing import List, Optional
 
 import sys
-import asyncio
 import typer
-from .api import parse as api_parse
-from .utils.io import default_output_dir, ensure_dir, export_outputs
+from . import __version__
+from .utils.io import ArtifactSink, TEMP_RETENTION_POLICIES, default_output_dir, ensure_dir
 from .exceptions import (
   ProviderAuthError,
   ProviderRateLimitError,
@@ -24,7 +25,7 @@ from .exceptions import (
   RenderingError,
   BudgetExceededError,
 )
-from .tracing.mlflow_logger import start_run, log_params, log_artifact, end_run
+from .tracing.mlflow_logger import RunLogger
 
 app = typer.Typer(
   help="LLM-only document layout parsing (MVP scaffold)",
@@ -32,6 +33,12 @@ app = typer.Typer(
 )
 
 
+def _print_version(value: Optional[bool]) -> None:
+  if value:
+    typer.echo(__version__)
+    raise typer.Exit()
+
+
 @app.callback()
 def root(
   version: Optional[bool] = typer.Option(
@@ -39,6 +46,8 @@ def root(
     "--version",
     help="Show version and exit",
     is_flag=True,
+    is_eager=True,
+    callback=_print_version,
   ),
   verbose: bool = typer.Option(False, "--verbose", help="Enable verbose logging"),
   quiet: bool = typer.Option(False, "--quiet", help="Reduce output verbosity"),
@@ -64,7 +73,9 @@ def parse(
   ),
   pages: Optional[str] = typer.Option(None, "--pages", help="Page selection, e.g., 1-3,7"),
   dpi: int = typer.Option(180, "--dpi", help="Render DPI"),
-  parallel_pages: int = typer.Option(6, "--parallel-pages", help="Async concurrency cap"),
+  parallel_pages: int = typer.Option(
+    6, "--parallel-pages", help="Pages processed at once (0 = no cap)"
+  ),
   provider_concurrency: Optional[int] = typer.Option(
     None,
     "--provider-concurrency",
@@ -81,7 +92,7 @@ def parse(
   cost_per_page_usd: float = typer.Option(
     0.02,
     "--cost-per-page-usd",
-    help="Estimated cost per page (USD) for budget guard",
+    help="Cost (USD) of calls to unpriced models; budget estimate until a model has answered",
   ),
   preview_chars: int = typer.Option(
     500,
@@ -91,13 +102,141 @@ def parse(
   format: Optional[str] = typer.Option(
     None,
     "--format",
-    help="Alias for outputs: all|markdown|text|layout_json",
+    help="Alias for outputs: all|markdown|text|layout_json|jsonl|index",
+  ),
+  temp_retention: str = typer.Option(
+    "delete",
+    "--temp-retention",
+    help="Temp dir policy after the run: delete|keep|on_error",
+  ),
+  blocks_dataset: Optional[Path] = typer.Option(
+    None,
+    "--blocks-dataset",
+    help="Append blocks to this partitioned Parquet dataset (requires pyarrow)",
+  ),
+  doc_id: Optional[str] = typer.Option(
+    None,
+    "--doc-id",
+    help="Document id for --blocks-dataset (default: input file name stem)",
+  ),
+  hedge_percentile: Optional[float] = typer.Option(
+    None,
+    "--hedge-percentile",
+    help="Duplicate vision calls slower than this latency percentile, e.g. 0.95",
+  ),
+  hedge_model: Optional[str] = typer.Option(
+    None,
+    "--hedge-model",
+    help="Model for hedged requests (default: --llm)",
+  ),
+  hedge_max_fraction: float = typer.Option(
+    0.1,
+    "--hedge-max-fraction",
+    help="Cap on hedged requests as a fraction of vision calls",
+  ),
+  escalate_to: List[str] = typer.Option(
+    [],
+    "--escalate-to",
+    help="Stronger model(s) for pages that fail review, as model or model=cost_usd",
+  ),
+  escalate_min_conf: Optional[float] = typer.Option(
+    None,
+    "--escalate-min-conf",
+    help="Also escalate pages whose mean block confidence is below this",
+  ),
+  endpoints: List[str] = typer.Option(
+    [],
+    "--endpoint",
+    help="Endpoint equivalent to --llm for load balancing/failover, e.g. "
+    "'azure/gpt-4o,weight=2,concurrency=8,api_base=https://...' (repeatable)",
+  ),
+  endpoint_cooldown: float = typer.Option(
+    30.0,
+    "--endpoint-cooldown",
+    help="Seconds an unhealthy endpoint is drained before it is probed again",
+  ),
+  stream: bool = typer.Option(
+    False,
+    "--stream",
+    help="Stream model responses, parse blocks as they arrive, abort malformed output early",
+  ),
+  structured_output: str = typer.Option(
+    "json_object",
+    "--structured-output",
+    help="Response contract: json_object|json_schema|auto (schema where supported)",
+  ),
+  wire_format: str = typer.Option(
+    "full",
+    "--wire-format",
+    help="Model answer encoding: full|compact (short keys, 0-1000 integer bboxes)",
+  ),
+  prompt_cache: bool = typer.Option(
+    True,
+    "--prompt-cache/--no-prompt-cache",
+    help="Mark the shared instruction prefix for provider prompt caching",
+  ),
+  prices: Optional[List[str]] = typer.Option(
+    None,
+    "--price",
+    help="Token price override MODEL=PROMPT,COMPLETION[,CACHED] in USD per 1M (repeatable)",
+  ),
+  deadline_s: Optional[float] = typer.Option(
+    None,
+    "--deadline",
+    help="Document deadline in seconds; unfinished pages fall back to their text layer",
+  ),
+  page_timeout_s: Optional[float] = typer.Option(
+    None,
+    "--page-timeout",
+    help="Per-page timeout in seconds, counted from the page's first vision call",
+  ),
+  page_retries: int = typer.Option(
+    1,
+    "--page-retries",
+    help="Extra passes over pages that failed (0 disables the retry queue)",
+  ),
+  page_retry_backoff_s: float = typer.Option(
+    10.0,
+    "--page-retry-backoff",
+    help="Seconds before the first retry pass (doubles per pass)",
+  ),
+  schedule: str = typer.Option(
+    "lpt",
+    "--schedule",
+    help="Page dispatch order: lpt (slowest first)|first_pages (early output)|page_order",
+  ),
+  trim_margins: bool = typer.Option(
+    True,
+    "--trim-margins/--no-trim-margins",
+    help="Crop pages to their content box before upload",
+  ),
+  render_cache: Optional[Path] = typer.Option(
+    None,
+    "--render-cache",
+    envvar="LAYOUTSCRIBE_RENDER_CACHE",
+    help="Directory caching rendered PDF pages across runs",
+  ),
+  render_cache_max_mb: int = typer.Option(
+    2048,
+    "--render-cache-max-mb",
+    help="Evict least recently used pages past this size",
+  ),
+  profile: bool = typer.Option(
+    False,
+    "--profile",
+    help="Write a span trace, CPU profile and per-stage memory peaks to <output-dir>/profile",
   ),
 ) -> None:
   """Parse a document into Markdown, text, and layout JSON (skeleton only)."""
+  import asyncio
+  import json
+
+  from .api import parse as api_parse
+  from .tracing.profile import STAGES_FILENAME, TRACE_FILENAME
+
   out_dir = output_dir or default_output_dir(input_path)
   ensure_dir(out_dir)
-  allowed_outputs = {"markdown", "text", "layout_json"}
+  allowed_outputs = {"markdown", "text", "layout_json", "layout_jsonl", "layout_index"}
 
   if format:
     fmt = format.lower()
@@ -108,6 +247,10 @@ def parse(
       "plain": ["text"],
       "layout_json": ["layout_json"],
       "json": ["layout_json"],
+      "layout_jsonl": ["layout_jsonl"],
+      "jsonl": ["layout_jsonl"],
+      "layout_index": ["layout_index"],
+      "index": ["layout_index"],
       "all": ["markdown", "text", "layout_json"],
     }
     selected: List[str] = []
@@ -115,7 +258,7 @@ def parse(
       mapped = alias_map.get(token)
       if not mapped:
         raise typer.BadParameter(
-          f"Unknown format '{token}'. Choose from all|markdown|text|layout_json.",
+          f"Unknown format '{token}'. Choose from all|markdown|text|layout_json|jsonl|index.",
           param_hint="--format",
         )
       selected.extend(mapped)
@@ -136,11 +279,57 @@ def parse(
   if invalid:
     raise typer.BadParameter(f"Invalid outputs: {', '.join(invalid)}.", param_hint="--outputs")
 
-  run_started = False
+  escalate_to = [t.strip() for value in escalate_to for t in value.split(",") if t.strip()]
+  if endpoints:
+    from .llm.pool import parse_endpoint
+
+    for spec in endpoints:
+      try:
+        parse_endpoint(spec)
+      except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--endpoint") from exc
+  if prices:
+    from .utils.cost import parse_price
+
+    for spec in prices:
+      try:
+        parse_price(spec)
+      except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--price") from exc
+
+  if structured_output not in ("json_object", "json_schema", "auto"):
+    raise typer.BadParameter(
+      f"Unknown mode '{structured_output}'. Choose from json_object|json_schema|auto.",
+      param_hint="--structured-output",
+    )
+
+  if wire_format not in ("full", "compact"):
+    raise typer.BadParameter(
+      f"Unknown wire format '{wire_format}'. Choose from full|compact.",
+      param_hint="--wire-format",
+    )
+
+  if schedule not in ("lpt", "first_pages", "page_order"):
+    raise typer.BadParameter(
+      f"Unknown schedule '{schedule}'. Choose from lpt|first_pages|page_order.",
+      param_hint="--schedule",
+    )
+
+  if temp_retention not in TEMP_RETENTION_POLICIES:
+    raise typer.BadParameter(
+      f"Unknown policy '{temp_retention}'. Choose from {'|'.join(TEMP_RETENTION_POLICIES)}.",
+      param_hint="--temp-retention",
+    )
+  # The CLI owns the sink so temp overlays outlive `api_parse` for MLflow logging.
+  sink = ArtifactSink(out_dir, retention=temp_retention)  # type: ignore[arg-type]
+
+  tracer: Optional[RunLogger] = None
+  failed = True
   try:
     if trace_mlflow:
-      run_started = start_run(run_name="layoutscribe-parse")
-      log_params(
+      tracer = RunLogger.start(run_name="layoutscribe-parse")
+    if tracer is not None:
+      tracer.log_params(
         {
           "llm": llm,
           "dpi": dpi,
@@ -153,6 +342,23 @@ def parse(
           "outputs": ",".join(outputs),
           "preview_chars": preview_chars,
           "cost_per_page_usd": cost_per_page_usd,
+          "hedge_percentile": hedge_percentile,
+          "hedge_model": hedge_model,
+          "escalate_to": ",".join(escalate_to),
+          "escalate_min_conf": escalate_min_conf,
+          "endpoints": len(endpoints),
+          "stream": stream,
+          "structured_output": structured_output,
+          "wire_format": wire_format,
+          "prompt_cache": prompt_cache,
+          "prices": ";".join(prices or []),
+          "deadline_s": deadline_s,
+          "page_timeout_s": page_timeout_s,
+          "page_retries": page_retries,
+          "schedule": schedule,
+          "trim_margins": trim_margins,
+          "render_cache": render_cache.as_posix() if render_cache else None,
+          "profile": profile,
         }
       )
 
@@ -170,36 +376,120 @@ def parse(
         save_overlays=save_overlays,
         save_intermediate=save_intermediate,
         cost_per_page_usd=cost_per_page_usd,
+        sink=sink,
+        blocks_dataset=blocks_dataset,
+        doc_id=doc_id,
+        hedge_percentile=hedge_percentile,
+        hedge_model=hedge_model,
+        hedge_max_fraction=hedge_max_fraction,
+        escalate_to=escalate_to,
+        escalate_min_conf=escalate_min_conf,
+        endpoints=endpoints,
+        endpoint_cooldown_s=endpoint_cooldown,
+        stream=stream,
+        structured_output=structured_output,  # type: ignore[arg-type]
+        wire_format=wire_format,  # type: ignore[arg-type]
+        prompt_cache=prompt_cache,
+        prices=prices,
+        deadline_s=deadline_s,
+        page_timeout_s=page_timeout_s,
+        page_retries=page_retries,
+        page_retry_backoff_s=page_retry_backoff_s,
+        schedule=schedule,  # type: ignore[arg-type]
+        trim_margins=trim_margins,
+        render_cache=render_cache,
+        render_cache_max_mb=render_cache_max_mb,
+        profile=out_dir / "profile" if profile else None,
+        on_page=tracer.log_page if tracer is not None else None,
       )
     )
-    manifest = export_outputs(
-      doc,
-      outputs=outputs,
-      target_dir=out_dir,
-      save_overlays=save_overlays,
-      save_intermediate=save_intermediate,
-    )
-    doc.artifact_paths = manifest
+    manifest = doc.artifact_paths or {}
 
     primary_paths = [Path(p) for p in manifest.get("primary", [])]
     overlay_paths = [Path(p) for p in manifest.get("overlays", [])]
     intermediate_paths = [Path(p) for p in manifest.get("intermediate", [])]
+    profile_paths = [Path(p) for p in manifest.get("profile", [])]
 
-    if run_started:
-      for path in primary_paths:
-        log_artifact(path)
-      for path in overlay_paths:
-        log_artifact(path, artifact_path="overlays")
-      for path in intermediate_paths:
-        log_artifact(path, artifact_path="intermediate")
+    if tracer is not None:
+      tracer.log_files(primary_paths)
+      tracer.log_files(overlay_paths, artifact_path="overlays")
+      tracer.log_files(intermediate_paths, artifact_path="intermediate")
+      tracer.log_files(profile_paths, artifact_path="profile")
+      if doc.metadata:
+        cost = doc.metadata.cost
+        tracer.log_metrics(
+          {
+            "pages": doc.metadata.page_count,
+            "blocks_total": doc.metadata.blocks_total,
+            "table_total": doc.metadata.table_total,
+            "cost_usd": cost.cost_usd if cost else None,
+            "calls": cost.calls if cost else None,
+            "prompt_tokens": cost.prompt_tokens if cost else None,
+            "completion_tokens": cost.completion_tokens if cost else None,
+          }
+        )
 
     typer.echo(f"Artifacts written to {out_dir}")
+    for profile_path in profile_paths:
+      if profile_path.name == STAGES_FILENAME:
+        typer.echo(f"Profile → {profile_path.parent} (open {TRACE_FILENAME} in ui.perfetto.dev)")
+        stages = json.loads(profile_path.read_text(encoding="utf-8"))
+        for stage, s in sorted(stages.items(), key=lambda item: -item[1]["busy_s"]):
+          peak = s["mem_peak_bytes"]
+          typer.echo(
+            f"  {stage}: {s['count']} spans, busy {s['busy_s']:.2f}s over {s['wall_s']:.2f}s, "
+            f"concurrency max {s['max_concurrency']} / mean {s['mean_concurrency']:.1f}"
+            + (f", mem peak {peak / 1024**2:.1f} MB" if peak else "")
+          )
 
     if doc.metadata:
       meta = doc.metadata
       typer.echo(
         f"Summary → pages: {meta.page_count}, blocks: {meta.blocks_total}, tables: {meta.table_total}"
       )
+      if meta.hedging:
+        typer.echo(
+          f"Hedging → issued: {meta.hedging.issued}, won: {meta.hedging.won}, "
+          f"cancelled: {meta.hedging.cancelled}"
+        )
+      for tier in meta.tiers or []:
+        typer.echo(
+          f"Tier {tier.model} → pages: {tier.pages}, calls: {tier.calls}, "
+          f"cost: ${tier.cost_usd:.4f}"
+        )
+      for provider in meta.reasks or []:
+        typer.echo(
+          f"Re-asks {provider.provider} → {provider.reasks}/{provider.answers} "
+          f"({provider.reask_rate:.0%})"
+        )
+      for number, status in (meta.page_status or {}).items():
+        if status.status in ("failed", "recovered"):
+          typer.echo(
+            f"Page {number} {status.status} after {status.attempts} attempt(s): {status.error}"
+          )
+      if meta.timed_out_pages:
+        pages_list = ", ".join(str(n) for n in meta.timed_out_pages)
+        typer.echo(f"Timed out → pages {pages_list} (text-layer fallback)")
+      skipped = [n for n, s in (meta.page_status or {}).items() if s.status == "skipped_budget"]
+      if skipped:
+        pages_list = ", ".join(str(n) for n in skipped)
+        typer.echo(f"Budget exhausted → pages {pages_list} (text-layer fallback)")
+      cost = meta.cost
+      if cost:
+        budget = f" of ${cost.budget_usd:.2f}" if cost.budget_usd is not None else ""
+        unpriced = f", unpriced calls: {cost.unpriced_calls}" if cost.unpriced_calls else ""
+        typer.echo(f"Cost → ${cost.cost_usd:.4f}{budget} over {cost.calls} calls{unpriced}")
+      for model_usage in meta.usage or []:
+        typer.echo(
+          f"Tokens {model_usage.model} → prompt: {model_usage.prompt_tokens} "
+          f"(cached {model_usage.cached_prompt_tokens}, {model_usage.cache_hit_rate:.0%}), "
+          f"completion: {model_usage.completion_tokens}"
+        )
+      for ep in meta.endpoints or []:
+        typer.echo(
+          f"Endpoint {ep.model}{f' @ {ep.api_base}' if ep.api_base else ''} → "
+          f"calls: {ep.calls}, failures: {ep.failures}, drains: {ep.drains}"
+        )
       for page in meta.pages:
         preview = page.text_preview.strip()
         if preview_chars and len(preview) > preview_chars:
@@ -220,34 +510,329 @@ def parse(
         if len(snippet) > preview_chars:
           snippet = snippet[:preview_chars] + "…"
         typer.echo("\n[text preview]\n" + snippet)
+    failed = False
   except SchemaValidationError as exc:
     typer.echo(f"Validation error: {exc}", err=True)
-    if run_started:
-      end_run(status="FAILED")
+    if tracer is not None:
+      tracer.close(status="FAILED")
     sys.exit(2)
   except (ProviderAuthError, ProviderRateLimitError) as exc:
     typer.echo(f"Provider error: {exc}", err=True)
-    if run_started:
-      end_run(status="FAILED")
+    if tracer is not None:
+      tracer.close(status="FAILED")
     sys.exit(3)
   except BudgetExceededError as exc:
     typer.echo(f"Budget exceeded: {exc}", err=True)
-    if run_started:
-      end_run(status="FAILED")
+    if tracer is not None:
+      tracer.close(status="FAILED")
     sys.exit(4)
   except RenderingError as exc:
     typer.echo(f"Rendering error: {exc}", err=True)
-    if run_started:
-      end_run(status="FAILED")
+    if tracer is not None:
+      tracer.close(status="FAILED")
     sys.exit(5)
   except Exception as exc:
     typer.echo(f"Unexpected error: {exc}", err=True)
-    if run_started:
-      end_run(status="FAILED")
+    if tracer is not None:
+      tracer.close(status="FAILED")
     raise
   finally:
-    if run_started:
-      end_run(status="FINISHED")
+    if tracer is not None:
+      tracer.close(status="FINISHED")
+      if tracer.dropped or tracer.errors:
+        typer.echo(
+          f"MLflow → dropped metrics: {tracer.dropped}, failed requests: {tracer.errors}"
+          f"{f' ({tracer.last_error})' if tracer.last_error else ''}",
+          err=True,
+        )
+    if tracer is not None and tracer.unflushed:
+      # The sender thread may still be reading these files; leave them in place.
+      typer.echo(f"MLflow uploads still running; keeping {sink.temp_dir}", err=True)
+    else:
+      sink.close(failed=failed)
+
+
+@app.command("export-blocks")
+def export_blocks(
+  inputs: List[Path] = typer.Argument(
+    ..., help="layout.json/layout.jsonl files or artifact directories to scan"
+  ),
+  dataset: Path = typer.Option(..., "--dataset", help="Parquet dataset directory to append to"),
+  batch_rows: int = typer.Option(
+    250_000,
+    "--batch-rows",
+    help="Blocks per Parquet file written",
+  ),
+) -> None:
+  """Append blocks from existing layout artifacts to a columnar dataset."""
+  from .layout.store import BlockStore
+  from .utils.columnar import BlockDatasetWriter, find_layout_artifacts, load_layout_pages
+
+  artifacts = find_layout_artifacts(inputs)
+  if not artifacts:
+    typer.echo("No layout.json/layout.jsonl artifacts found", err=True)
+    sys.exit(1)
+  try:
+    writer = BlockDatasetWriter(dataset, batch_rows=batch_rows)
+    for doc_id, layout_path in artifacts:
+      writer.append(BlockStore.from_pages(load_layout_pages(layout_path)), doc_id)
+    files = writer.close()
+  except RuntimeError as exc:
+    typer.echo(f"Export error: {exc}", err=True)
+    sys.exit(1)
+  typer.echo(f"Exported {len(artifacts)} documents to {len(files)} file(s) under {dataset}")
+
+
+@app.command()
+def serve(
+  llm: str = typer.Option(..., "--llm", help="Default LiteLLM model id for jobs"),
+  host: str = typer.Option("127.0.0.1", "--host", help="Bind address"),
+  port: int = typer.Option(8765, "--port", help="Bind port"),
+  workers: int = typer.Option(2, "--workers", help="Documents processed concurrently"),
+  provider_concurrency: int = typer.Option(
+    6,
+    "--provider-concurrency",
+    help="Provider calls in flight across all jobs",
+  ),
+  path_roots: List[Path] = typer.Option(
+    [],
+    "--path-root",
+    help="Directory whose files may be submitted by path (repeatable)",
+  ),
+  output_root: Optional[Path] = typer.Option(
+    None,
+    "--output-root",
+    help="Write each job's artifacts to <output-root>/<job id>",
+  ),
+  render_cache: Optional[Path] = typer.Option(
+    None,
+    "--render-cache",
+    envvar="LAYOUTSCRIBE_RENDER_CACHE",
+    help="Directory caching rendered PDF pages across jobs",
+  ),
+  render_cache_max_mb: int = typer.Option(
+    2048,
+    "--render-cache-max-mb",
+    help="Evict least recently used pages past this size",
+  ),
+) -> None:
+  """Run an HTTP server that parses documents on a warm worker pool."""
+  from .server.http import make_server
+  from .server.jobs import JobManager
+
+  manager = JobManager(
+    llm=llm,
+    workers=workers,
+    provider_concurrency=provider_concurrency,
+    output_root=output_root,
+    defaults=(
+      {"render_cache": render_cache, "render_cache_max_mb": render_cache_max_mb}
+      if render_cache
+      else None
+    ),
+  )
+  manager.start()
+  server = make_server(manager, host=host, port=port, path_roots=path_roots)
+  typer.echo(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}")
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+    manager.stop()
+
+
+queue_app = typer.Typer(help="Distributed mode: shared page work queue (SQLite)")
+app.add_typer(queue_app, name="queue")
+
+
+@queue_app.command("submit")
+def queue_submit(
+  input_path: Path = typer.Argument(..., help="Path to input PDF"),
+  db: Path = typer.Option(..., "--db", help="Queue database shared by all workers"),
+  llm: str = typer.Option(..., "--llm", help="LiteLLM model id (e.g., openai/gpt-4o)"),
+  pages: Optional[str] = typer.Option(None, "--pages", help="Page selection, e.g., 1-3,7"),
+  dpi: int = typer.Option(180, "--dpi", help="Render DPI"),
+  doc_id: Optional[str] = typer.Option(None, "--doc-id", help="Document id (default: random)"),
+) -> None:
+  """Split a document into page tasks and enqueue them; prints the document id."""
+  from .distributed.coordinator import submit_document
+
+  try:
+    typer.echo(submit_document(db, input_path, llm, dpi=dpi, pages_spec=pages, doc_id=doc_id))
+  except RenderingError as exc:
+    typer.echo(f"Rendering error: {exc}", err=True)
+    sys.exit(1)
+
+
+@queue_app.command("work")
+def queue_work(
+  db: Path = typer.Option(..., "--db", help="Queue database shared by all workers"),
+  concurrency: int = typer.Option(4, "--concurrency", help="Pages processed concurrently"),
+  lease_timeout: float = typer.Option(
+    300.0,
+    "--lease-timeout",
+    help="Seconds before a silent worker's page is handed to another worker",
+  ),
+  idle_exit: Optional[float] = typer.Option(
+    None,
+    "--idle-exit",
+    help="Exit after this many idle seconds (default: run until interrupted)",
+  ),
+  render_cache: Optional[Path] = typer.Option(
+    None,
+    "--render-cache",
+    envvar="LAYOUTSCRIBE_RENDER_CACHE",
+    help="Directory caching rendered PDF pages across runs and workers",
+  ),
+  render_cache_max_mb: int = typer.Option(
+    2048,
+    "--render-cache-max-mb",
+    help="Evict least recently used pages past this size",
+  ),
+) -> None:
+  """Run a worker that leases and processes pages from the queue."""
+  import asyncio
+
+  from .distributed.worker import run_worker
+  from .utils.render_cache import RenderCache
+
+  cache = RenderCache(render_cache, render_cache_max_mb * 1024**2) if render_cache else None
+  try:
+    done = asyncio.run(
+      run_worker(
+        db,
+        concurrency=concurrency,
+        lease_timeout_s=lease_timeout,
+        idle_exit_s=idle_exit,
+        render_cache=cache,
+      )
+    )
+  except KeyboardInterrupt:
+    return
+  typer.echo(f"Worker finished {done} page(s)")
+
+
+@queue_app.command("status")
+def queue_status(
+  doc_id: str = typer.Argument(..., help="Document id returned by `queue submit`"),
+  db: Path = typer.Option(..., "--db", help="Queue database shared by all workers"),
+) -> None:
+  """Show per-state page counts for a document."""
+  from .distributed.coordinator import document_progress
+
+  progress = document_progress(db, doc_id)
+  typer.echo(" ".join(f"{state}={count}" for state, count in progress.items()))
+
+
+@queue_app.command("collect")
+def queue_collect(
+  doc_id: str = typer.Argument(..., help="Document id returned by `queue submit`"),
+  db: Path = typer.Option(..., "--db", help="Queue database shared by all workers"),
+  output_dir: Path = typer.Option(..., "--output-dir", help="Directory to write artifacts"),
+  outputs: List[str] = typer.Option(
+    ["markdown", "text", "layout_json"],
+    "--outputs",
+    help="Outputs to produce",
+  ),
+  timeout: Optional[float] = typer.Option(
+    None,
+    "--timeout",
+    help="Give up after this many seconds (default: wait for every page)",
+  ),
+) -> None:
+  """Wait for a document's pages and compose its artifacts."""
+  from .distributed.coordinator import collect_document
+
+  try:
+    doc = collect_document(
+      db, doc_id, outputs, output_dir=ensure_dir(output_dir), timeout_s=timeout
+    )
+  except (KeyError, TimeoutError) as exc:
+    typer.echo(f"Collect error: {exc}", err=True)
+    sys.exit(1)
+  status = doc.metadata.page_status if doc.metadata else None
+  failed = [str(n) for n, s in (status or {}).items() if s.status == "failed"]
+  if failed:
+    typer.echo(f"Pages failed after retries: {', '.join(failed)}", err=True)
+  typer.echo(f"Wrote artifacts to {output_dir}")
+
+
+index_app = typer.Typer(help="Queryable block index over layout artifacts")
+app.add_typer(index_app, name="index")
+
+
+@index_app.command("build")
+def index_build(
+  inputs: List[Path] = typer.Argument(
+    ..., help="layout.json/layout.jsonl files or artifact directories to scan"
+  ),
+  out: Path = typer.Option(..., "--out", help="Corpus index file to write (.npz)"),
+) -> None:
+  """Merge per-document indexes (or build them from layouts) into one file."""
+  from .layout.index import INDEX_FILENAME, LayoutIndex
+  from .utils.columnar import find_layout_artifacts, load_layout_pages
+
+  artifacts = find_layout_artifacts(inputs)
+  if not artifacts:
+    typer.echo("No layout.json/layout.jsonl artifacts found", err=True)
+    sys.exit(1)
+  indexes = []
+  for doc_id, layout_path in artifacts:
+    saved = layout_path.parent / INDEX_FILENAME
+    if saved.exists():
+      indexes.append(LayoutIndex.load(saved))
+    else:
+      indexes.append(LayoutIndex.from_pages(load_layout_pages(layout_path), doc_id))
+  index = LayoutIndex.merge(indexes)
+  index.save(out)
+  typer.echo(f"Indexed {len(index)} blocks from {len(artifacts)} documents into {out}")
+
+
+@index_app.command("query")
+def index_query(
+  index_path: Path = typer.Argument(..., help="Index file (layout.index.npz or from `build`)"),
+  doc_id: Optional[List[str]] = typer.Option(None, "--doc", help="Document id (repeatable)"),
+  pages: Optional[str] = typer.Option(None, "--pages", help="Page selection, e.g., 10-20"),
+  types: Optional[List[str]] = typer.Option(None, "--type", help="Block type (repeatable)"),
+  region: Optional[str] = typer.Option(
+    None, "--region", help="Normalized x0,y0,x1,y1 the block must intersect"
+  ),
+  text: Optional[str] = typer.Option(None, "--text", help="Words the block text must contain"),
+  limit: int = typer.Option(50, "--limit", help="Maximum blocks to print (0 = all)"),
+) -> None:
+  """Print matching blocks as JSON lines."""
+  import json
+
+  from .layout.index import LayoutIndex
+
+  box = None
+  if region:
+    try:
+      x0, y0, x1, y1 = (float(v) for v in region.split(","))
+    except ValueError:
+      raise typer.BadParameter("Expected four numbers: x0,y0,x1,y1", param_hint="--region")
+    box = (x0, y0, x1, y1)
+  index = LayoutIndex.load(index_path)
+  refs = index.query(
+    doc_id=doc_id or None,
+    pages=pages,
+    types=types or None,
+    region=box,
+    text=text,
+    limit=limit or None,
+  )
+  for ref in refs:
+    row = {
+      "doc_id": ref.doc_id,
+      "page": ref.page,
+      "id": ref.block_id,
+      "type": ref.type,
+      "bbox": list(ref.bbox),
+      "text": index.text(ref),
+    }
+    typer.echo(json.dumps(row, ensure_ascii=False))
 
 
 def main() -> None:
@@ -0,0 +1,7 @@
+"""Distributed mode: a shared page work queue for multi-process/multi-node runs.
+
+Responsibilities:
+- `queue`: durable SQLite queue of page tasks with leases and retries.
+- `worker`: lease pages, run vision + review, store the finished page.
+- `coordinator`: split documents into tasks and compose finished results.
+"""
@@ -0,0 +1,153 @@
+"""Coordinator for distributed mode.
+
+Responsibilities:
+- Split a document into `PageTask`s via the planner and enqueue them.
+- Report progress and, once every page has landed, compose the document
+  exactly as the in-process pipeline would.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..agents.planner import plan
+from ..exceptions import RenderingError
+from ..types import ParsedDocument
+from ..utils.images import RenderedPage, pdf_num_pages, pdf_text_layer
+from ..utils.io import ArtifactSink, parse_pages_spec
+from .queue import TASK_DONE, TASK_LEASED, TASK_PENDING, PageQueue, TaskResult
+
+
+def submit_document(
+  queue_path: Path,
+  input_path: Path,
+  llm: str,
+  dpi: int = 180,
+  pages_spec: Optional[str] = None,
+  temperature: float = 0.0,
+  doc_id: Optional[str] = None,
+  trim_margins: bool = True,
+) -> str:
+  """Enqueue one task per selected page and return the document id."""
+  input_path = input_path.resolve()
+  if input_path.suffix.lower() != ".pdf":
+    raise RenderingError("Distributed mode currently supports PDF inputs only")
+  pages = parse_pages_spec(pages_spec, pdf_num_pages(input_path)) if pages_spec else None
+  tasks = plan(input_path, dpi, pages)
+  doc_id = doc_id or uuid.uuid4().hex
+  queue = PageQueue(queue_path)
+  try:
+    config = {"llm": llm, "temperature": temperature, "trim_margins": trim_margins}
+    queue.enqueue_document(doc_id, tasks, config)
+  finally:
+    queue.close()
+  return doc_id
+
+
+def document_progress(queue_path: Path, doc_id: str) -> Dict[str, int]:
+  queue = PageQueue(queue_path)
+  try:
+    return queue.progress(doc_id)
+  finally:
+    queue.close()
+
+
+def collect_document(
+  queue_path: Path,
+  doc_id: str,
+  outputs: List[str],
+  output_dir: Optional[Path] = None,
+  timeout_s: Optional[float] = None,
+  poll_s: float = 2.0,
+) -> ParsedDocument:
+  """Wait for all pages of `doc_id`, then compose and export the document.
+
+  Pages that exhausted their retries fall back to their text layer (read
+  from the source PDF, if this host can open it) and are flagged `failed`
+  in `metadata.page_status`, as in a single-process run.
+  """
+  from ..agents.graph import assemble_document
+  from ..api import document_from_artifacts
+
+  queue = PageQueue(queue_path)
+  try:
+    if queue.document_config(doc_id) is None:
+      raise KeyError(f"unknown document {doc_id}")
+    deadline = time.monotonic() + timeout_s if timeout_s is not None else None
+    while True:
+      progress = queue.progress(doc_id)
+      if progress[TASK_PENDING] == 0 and progress[TASK_LEASED] == 0:
+        break
+      if deadline is not None and time.monotonic() >= deadline:
+        raise TimeoutError(f"document {doc_id} still has unfinished pages: {progress}")
+      time.sleep(poll_s)
+    results = queue.results(doc_id)
+  finally:
+    queue.close()
+
+  fallbacks = _fallback_pages([r for r in results if r.state != TASK_DONE or not r.page])
+  pages: List[Dict[str, Any]] = [
+    r.page if r.state == TASK_DONE and r.page else fallbacks[r.index0] for r in results
+  ]
+  assembled = assemble_document(pages)
+  assembled["metadata"]["page_status"] = {r.index0 + 1: _page_status(r) for r in results}
+  parsed = document_from_artifacts(assembled, outputs)
+  sink = ArtifactSink(output_dir)
+  try:
+    if output_dir is not None and "layout_jsonl" in outputs:
+      from ..utils.jsonl import LayoutJsonlWriter
+
+      with LayoutJsonlWriter(sink.primary_path("layout.jsonl")) as writer:
+        for page in pages:
+          writer.write_page(page)
+      sink.record("primary", writer.path)
+    if output_dir is not None and "layout_index" in outputs:
+      from ..layout.index import INDEX_FILENAME, LayoutIndex
+
+      index = LayoutIndex.from_pages(pages, doc_id)
+      sink.record("primary", index.save(sink.primary_path(INDEX_FILENAME)))
+    manifest = sink.export(parsed, outputs)
+  finally:
+    sink.close()
+  if any(manifest.values()):
+    parsed.artifact_paths = manifest
+  return parsed
+
+
+def _fallback_pages(failed: List[TaskResult]) -> Dict[int, Dict[str, Any]]:
+  """Text-layer pages for failed tasks, built like `run_pipeline` does."""
+  from ..agents.graph import finalize_page
+
+  layers: Dict[int, RenderedPage] = {}
+  by_source: Dict[Tuple[Path, int], List[int]] = {}
+  for r in failed:
+    if r.source_path is not None:
+      by_source.setdefault((r.source_path, r.dpi), []).append(r.index0)
+  for (source, dpi), index0s in by_source.items():
+    try:
+      layers.update((rp.index0, rp) for rp in pdf_text_layer(source, dpi, index0s))
+    except RenderingError:
+      pass  # source not readable here: the page stays empty
+  pages: Dict[int, Dict[str, Any]] = {}
+  for r in failed:
+    rp = layers.get(r.index0) or RenderedPage(r.index0, Path(), 0, 0)
+    page: Dict[str, Any] = {"width_px": rp.width_px, "height_px": rp.height_px, "blocks": []}
+    finalize_page(rp, page)
+    pages[r.index0] = page
+  return pages
+
+
+def _page_status(result: TaskResult) -> Dict[str, Any]:
+  """`metadata.page_status` entry for a finished or failed task."""
+  if result.state == TASK_DONE:
+    return {"status": "ok" if result.attempts <= 1 else "recovered", "attempts": result.attempts}
+  error, _, message = (result.error or "").partition(": ")
+  return {
+    "status": "failed",
+    "attempts": result.attempts,
+    "error": error or None,
+    "message": message[:500] or None,
+  }
@@ -0,0 +1,234 @@
+"""Durable page work queue backed by SQLite.
+
+Responsibilities:
+- Persist documents and their `PageTask`s so work survives process crashes.
+- Hand out time-limited leases; expired leases (crashed or stalled workers)
+  become leasable again, and failing tasks are retried up to a limit. A
+  task whose last allowed lease expires is marked failed, so a page that
+  keeps killing its worker cannot stall the document.
+- Store finished page results for the coordinator to compose.
+
+The database runs in WAL mode so many worker processes on one host can
+share it. Nodes on other hosts need a filesystem with working POSIX locks;
+network filesystems such as NFS generally do not qualify.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..agents.planner import PageTask
+
+TASK_PENDING = "pending"
+TASK_LEASED = "leased"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+  doc_id TEXT PRIMARY KEY,
+  config TEXT NOT NULL,
+  created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+  doc_id TEXT NOT NULL REFERENCES documents(doc_id),
+  index0 INTEGER NOT NULL,
+  source_path TEXT NOT NULL,
+  dpi INTEGER NOT NULL,
+  state TEXT NOT NULL,
+  lease_owner TEXT,
+  lease_expires REAL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  result TEXT,
+  error TEXT,
+  PRIMARY KEY (doc_id, index0)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_state ON tasks(state, lease_expires);
+"""
+
+
+@dataclass(frozen=True)
+class Lease:
+  doc_id: str
+  task: PageTask
+  owner: str
+  attempts: int
+  config: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class TaskResult:
+  index0: int
+  state: str
+  page: Optional[Dict[str, Any]]
+  error: Optional[str]
+  attempts: int = 0
+  source_path: Optional[Path] = None
+  dpi: int = 0
+
+
+class PageQueue:
+  """SQLite-backed queue of page tasks with lease timeouts."""
+
+  def __init__(self, path: Path, lease_timeout_s: float = 300.0, max_attempts: int = 3) -> None:
+    self.path = path
+    self.lease_timeout_s = lease_timeout_s
+    self.max_attempts = max_attempts
+    self._lock = threading.Lock()
+    self._conn = sqlite3.connect(
+      path.as_posix(), timeout=30, isolation_level=None, check_same_thread=False
+    )
+    self._conn.execute("PRAGMA journal_mode=WAL")
+    self._conn.executescript(_SCHEMA)
+
+  def close(self) -> None:
+    with self._lock:
+      self._conn.close()
+
+  def enqueue_document(self, doc_id: str, tasks: List[PageTask], config: Dict[str, Any]) -> None:
+    with self._lock:
+      self._conn.execute("BEGIN IMMEDIATE")
+      try:
+        self._conn.execute(
+          "INSERT INTO documents (doc_id, config, created_at) VALUES (?, ?, ?)",
+          (doc_id, json.dumps(config), time.time()),
+        )
+        self._conn.executemany(
+          "INSERT INTO tasks (doc_id, index0, source_path, dpi, state) VALUES (?, ?, ?, ?, ?)",
+          [(doc_id, t.index0, t.source_path.as_posix(), t.dpi, TASK_PENDING) for t in tasks],
+        )
+        self._conn.execute("COMMIT")
+      except BaseException:
+        self._conn.execute("ROLLBACK")
+        raise
+
+  def lease(self, owner: str) -> Optional[Lease]:
+    """Lease the oldest pending (or lease-expired) task, if any.
+
+    Expired leases that already used `max_attempts` are marked failed first.
+    """
+    now = time.time()
+    with self._lock:
+      self._conn.execute("BEGIN IMMEDIATE")
+      try:
+        self._conn.execute(
+          """
+          UPDATE tasks SET state = ?, lease_owner = NULL, lease_expires = NULL,
+            error = COALESCE(error, 'WorkerLost: lease expired ' || attempts || ' time(s)')
+          WHERE state = ? AND lease_expires < ? AND attempts >= ?
+          """,
+          (TASK_FAILED, TASK_LEASED, now, self.max_attempts),
+        )
+        row = self._conn.execute(
+          """
+          SELECT t.doc_id, t.index0, t.source_path, t.dpi, t.attempts, d.config
+          FROM tasks t JOIN documents d ON d.doc_id = t.doc_id
+          WHERE t.state = ? OR (t.state = ? AND t.lease_expires < ?)
+          ORDER BY d.created_at, t.index0
+          LIMIT 1
+          """,
+          (TASK_PENDING, TASK_LEASED, now),
+        ).fetchone()
+        if row is None:
+          self._conn.execute("COMMIT")
+          return None
+        doc_id, index0, source_path, dpi, attempts, config = row
+        self._conn.execute(
+          """
+          UPDATE tasks SET state = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+          WHERE doc_id = ? AND index0 = ?
+          """,
+          (TASK_LEASED, owner, now + self.lease_timeout_s, doc_id, index0),
+        )
+        self._conn.execute("COMMIT")
+      except BaseException:
+        self._conn.execute("ROLLBACK")
+        raise
+    return Lease(
+      doc_id=doc_id,
+      task=PageTask(index0=index0, source_path=Path(source_path), dpi=dpi),
+      owner=owner,
+      attempts=attempts + 1,
+      config=json.loads(config),
+    )
+
+  def extend(self, lease: Lease) -> bool:
+    """Push the lease deadline forward; False if the lease was lost."""
+    expires = time.time() + self.lease_timeout_s
+    with self._lock:
+      cur = self._conn.execute(
+        """
+        UPDATE tasks SET lease_expires = ?
+        WHERE doc_id = ? AND index0 = ? AND state = ? AND lease_owner = ?
+        """,
+        (expires, lease.doc_id, lease.task.index0, TASK_LEASED, lease.owner),
+      )
+      return cur.rowcount == 1
+
+  def complete(self, lease: Lease, page: Dict[str, Any]) -> bool:
+    """Store a page result. The first completion wins, even after a re-lease."""
+    with self._lock:
+      cur = self._conn.execute(
+        """
+        UPDATE tasks SET state = ?, result = ?, error = NULL, lease_owner = NULL
+        WHERE doc_id = ? AND index0 = ? AND state != ?
+        """,
+        (TASK_DONE, json.dumps(page), lease.doc_id, lease.task.index0, TASK_DONE),
+      )
+      return cur.rowcount == 1
+
+  def fail(self, lease: Lease, error: str) -> None:
+    """Release a failed lease for retry, or mark the task failed at the limit."""
+    state = TASK_FAILED if lease.attempts >= self.max_attempts else TASK_PENDING
+    with self._lock:
+      self._conn.execute(
+        """
+        UPDATE tasks SET state = ?, error = ?, lease_owner = NULL, lease_expires = NULL
+        WHERE doc_id = ? AND index0 = ? AND state = ? AND lease_owner = ?
+        """,
+        (state, error, lease.doc_id, lease.task.index0, TASK_LEASED, lease.owner),
+      )
+
+  def progress(self, doc_id: str) -> Dict[str, int]:
+    counts = {TASK_PENDING: 0, TASK_LEASED: 0, TASK_DONE: 0, TASK_FAILED: 0}
+    with self._lock:
+      rows = self._conn.execute(
+        "SELECT state, COUNT(*) FROM tasks WHERE doc_id = ? GROUP BY state", (doc_id,)
+      ).fetchall()
+    counts.update({state: n for state, n in rows})
+    return counts
+
+  def document_config(self, doc_id: str) -> Optional[Dict[str, Any]]:
+    with self._lock:
+      row = self._conn.execute(
+        "SELECT config FROM documents WHERE doc_id = ?", (doc_id,)
+      ).fetchone()
+    return json.loads(row[0]) if row else None
+
+  def results(self, doc_id: str) -> List[TaskResult]:
+    with self._lock:
+      rows = self._conn.execute(
+        """
+        SELECT index0, state, result, error, attempts, source_path, dpi FROM tasks
+        WHERE doc_id = ? ORDER BY index0
+        """,
+        (doc_id,),
+      ).fetchall()
+    return [
+      TaskResult(
+        index0=i,
+        state=state,
+        page=json.loads(result) if result else None,
+        error=error,
+        attempts=attempts,
+        source_path=Path(source_path),
+        dpi=dpi,
+      )
+      for i, state, result, error, attempts, source_path, dpi in rows
+    ]
@@ -0,0 +1,115 @@
+"""Page worker for distributed mode.
+
+Responsibilities:
+- Lease page tasks from the shared queue, render the single page, run
+  vision + review, and write the finished page back.
+- Heartbeat long-running leases so only crashed workers lose their tasks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from ..agents.graph import analyze_page, finalize_page
+from ..layout.store import canonical_page
+from ..layout.validate import build_default_validator
+from ..utils.crop import trim_margins
+from ..utils.images import render_pdf_to_images
+from ..utils.io import create_temp_dir
+from ..utils.render_cache import RenderCache
+from .queue import Lease, PageQueue
+
+
+def default_worker_id() -> str:
+  return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+async def run_worker(
+  queue_path: Path,
+  concurrency: int = 4,
+  worker_id: Optional[str] = None,
+  lease_timeout_s: float = 300.0,
+  idle_exit_s: Optional[float] = None,
+  poll_s: float = 1.0,
+  render_cache: Optional[RenderCache] = None,
+) -> int:
+  """Process tasks until idle for `idle_exit_s` (forever if None).
+
+  With `render_cache`, pages already rendered by any worker sharing the
+  cache directory are reused.
+
+  Returns the number of pages this worker completed.
+  """
+  queue = PageQueue(queue_path, lease_timeout_s=lease_timeout_s)
+  owner = worker_id or default_worker_id()
+  validator = build_default_validator()
+  semaphore = asyncio.Semaphore(concurrency)
+  completed = 0
+
+  async def _heartbeat(lease: Lease) -> None:
+    while True:
+      await asyncio.sleep(lease_timeout_s / 3)
+      if not await asyncio.to_thread(queue.extend, lease):
+        return
+
+  async def _run(lease: Lease) -> None:
+    nonlocal completed
+    tmp = create_temp_dir()
+    heartbeat = asyncio.create_task(_heartbeat(lease))
+    try:
+      task = lease.task
+      # Rendering runs off the event loop so other slots and the lease
+      # heartbeats keep running while a page rasterizes.
+      rendered = await asyncio.to_thread(
+        render_pdf_to_images,
+        task.source_path,
+        task.dpi,
+        tmp,
+        [task.index0 + 1],
+        cache=render_cache,
+      )
+      if not rendered:
+        raise IndexError(f"page {task.index0 + 1} not found in {task.source_path}")
+      rp = rendered[0]
+      if lease.config.get("trim_margins", True):
+        rp = await asyncio.to_thread(trim_margins, rp)
+      page = await analyze_page(
+        rp,
+        lease.config["llm"],
+        float(lease.config.get("temperature", 0.0)),
+        validator,
+        semaphore,
+      )
+      finalize_page(rp, page)
+      if await asyncio.to_thread(queue.complete, lease, canonical_page(page)):
+        completed += 1
+    except Exception as exc:
+      await asyncio.to_thread(queue.fail, lease, f"{type(exc).__name__}: {exc}")
+    finally:
+      heartbeat.cancel()
+      shutil.rmtree(tmp, ignore_errors=True)
+
+  async def _slot() -> None:
+    idle_since = time.monotonic()
+    while True:
+      lease = await asyncio.to_thread(queue.lease, owner)
+      if lease is None:
+        if idle_exit_s is not None and time.monotonic() - idle_since >= idle_exit_s:
+          return
+        await asyncio.sleep(poll_s)
+        continue
+      await _run(lease)
+      idle_since = time.monotonic()
+
+  try:
+    await asyncio.gather(*(_slot() for _ in range(concurrency)))
+  finally:
+    queue.close()
+  return completed
@@ -29,6 +29,10 @@ class BudgetExceededError(LayoutScribeError):
   """Run aborted due to exceeding configured budget."""
 
 
+class DeadlineExceededError(LayoutScribeError):
+  """Page work was cancelled at its per-page timeout or the document deadline."""
+
+
 __all__ = [
   "LayoutScribeError",
   "ProviderRateLimitError",
@@ -36,6 +40,7 @@ __all__ = [
   "SchemaValidationError",
   "RenderingError",
   "BudgetExceededError",
+  "DeadlineExceededError",
 ]
 
 
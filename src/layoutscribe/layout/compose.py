@@ -3,26 +3,30 @@
 Responsibilities:
 - Convert validated layout JSON into Markdown and plain text.
 - Provide formatting rules for headings, lists, tables, and captions.
+- Accept either page dicts or a compact `BlockStore`.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+if TYPE_CHECKING:
+  from .store import BlockStore
 
-def compose_markdown(pages: List[Dict[str, Any]]) -> str:
+# (type, stripped text, heading level, table rows) for one block.
+BlockView = Tuple[str, str, int, List[List[str]]]
+Pages = Union[List[Dict[str, Any]], "BlockStore"]
+
+
+def compose_markdown(pages: Pages) -> str:
   """Compose Markdown from page blocks."""
   lines: List[str] = []
-  for page in pages:
-    blocks = page.get("blocks", []) or []
-    sorted_blocks = sorted(blocks, key=lambda b: (b["bbox"][1], b["bbox"][0]))
-    for block in sorted_blocks:
-      btype = block.get("type", "paragraph")
-      text = (block.get("text") or "").strip()
+  for blocks in _pages_in_reading_order(pages):
+    for btype, text, level, table_rows in blocks:
       if btype == "title":
         lines.append(f"# {text}")
       elif btype == "heading":
-        level = max(1, min(6, block.get("level", 1)))
+        level = max(1, min(6, level))
         lines.append(f"{'#' * level} {text}")
       elif btype == "paragraph":
         if text:
@@ -30,7 +34,6 @@ def compose_markdown(pages: List[Dict[str, Any]]) -> str:
       elif btype == "list_item":
         lines.append(f"- {text}")
       elif btype == "table":
-        table_rows = block.get("table", {}).get("rows", []) or []
         lines.extend(_table_to_markdown(table_rows))
       elif btype == "caption":
         lines.append(f"*{text}*")
@@ -44,26 +47,53 @@ def compose_markdown(pages: List[Dict[str, Any]]) -> str:
   return "\n".join(_squash_blank(lines))
 
 
-def compose_text(pages: List[Dict[str, Any]]) -> str:
+def compose_text(pages: Pages) -> str:
   """Compose plain text from page blocks."""
   lines: List[str] = []
-  for page in pages:
-    blocks = page.get("blocks", []) or []
-    sorted_blocks = sorted(blocks, key=lambda b: (b["bbox"][1], b["bbox"][0]))
-    for block in sorted_blocks:
-      btype = block.get("type", "paragraph")
+  for blocks in _pages_in_reading_order(pages):
+    for btype, text, _level, rows in blocks:
       if btype == "table":
-        rows = block.get("table", {}).get("rows", []) or []
         for row in rows:
           lines.append(" | ".join(cell.strip() for cell in row))
       else:
-        text = (block.get("text") or "").strip()
         if text:
           lines.append(text)
     lines.append("---")
   return "\n".join(_squash_blank(lines))
 
 
+def _pages_in_reading_order(pages: Pages) -> Iterator[Iterator[BlockView]]:
+  if isinstance(pages, list):
+    for page in pages:
+      blocks = page.get("blocks", []) or []
+      sorted_blocks = sorted(blocks, key=lambda b: (b["bbox"][1], b["bbox"][0]))
+      yield (_dict_view(block) for block in sorted_blocks)
+  else:
+    for rows in pages.iter_page_rows():
+      yield (_store_view(pages, int(row)) for row in rows)
+
+
+def _dict_view(block: Dict[str, Any]) -> BlockView:
+  table = block.get("table") or {}
+  return (
+    block.get("type", "paragraph"),
+    (block.get("text") or "").strip(),
+    block.get("level") or 1,
+    table.get("rows", []) or [],
+  )
+
+
+def _store_view(store: "BlockStore", row: int) -> BlockView:
+  level = int(store.levels[row])
+  text: Optional[str] = store.text(row)
+  return (
+    store.type_name(row),
+    (text or "").strip(),
+    level or 1,
+    store.tables.get(row) or [],
+  )
+
+
 def _table_to_markdown(rows: List[List[str]]) -> List[str]:
   if not rows:
     return []
@@ -97,5 +127,3 @@ def _squash_blank(lines: Iterable[str]) -> List[str]:
   while squashed and not squashed[-1]:
     squashed.pop()
   return squashed
-
-
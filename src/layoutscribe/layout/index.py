@@ -0,0 +1,441 @@
+"""Queryable block index over parsed layouts.
+
+Responsibilities:
+- Collect a document's pages as they finish (in any order) and freeze them
+  into a `BlockStore` plus posting lists keyed by block type, page number,
+  cell of a uniform grid over normalized bboxes, and lowercased word.
+- Persist an index as one `.npz` file (`layout.index.npz` next to the
+  other artifacts) and merge per-document indexes into a corpus index.
+- Answer conjunctive queries (documents, pages, types, region, words) by
+  intersecting sorted posting arrays, smallest first, then testing bboxes
+  exactly; results are `BlockRef`s that materialize to `Block` on demand.
+
+File format: NumPy arrays for the store columns (string arenas as UTF-8
+bytes, tables as JSON), `doc_ids` plus a doc code per page, and postings
+in CSR form: NUL-joined `posting_keys`, `posting_offsets` and ascending
+`posting_rows` per key.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..utils.io import ensure_dir, parse_pages_spec
+from .store import BLOCK_TYPES, BlockStore
+
+if TYPE_CHECKING:
+  from ..types import Block
+
+INDEX_FILENAME = "layout.index.npz"
+INDEX_VERSION = 1
+GRID = 8  # spatial cells per axis; a block is posted under every cell it touches
+
+Region = Tuple[float, float, float, float]
+
+_WORD = re.compile(r"\w+")
+_KEY_SEP = "\x00"
+
+
+def words(text: str) -> List[str]:
+  """Distinct lowercased words of `text`, as indexed and as matched by queries."""
+  return list(dict.fromkeys(_WORD.findall(text.lower())))
+
+
+def _cell_range(lo: float, hi: float) -> range:
+  lo, hi = sorted((min(max(lo, 0.0), 1.0), min(max(hi, 0.0), 1.0)))
+  return range(min(int(lo * GRID), GRID - 1), min(int(hi * GRID), GRID - 1) + 1)
+
+
+def _cells(box: Sequence[float]) -> List[int]:
+  x0, y0, x1, y1 = (float(v) for v in box)
+  return [cy * GRID + cx for cy in _cell_range(y0, y1) for cx in _cell_range(x0, x1)]
+
+
+@dataclass(frozen=True)
+class BlockRef:
+  """A block found by a query; `row` addresses it in `LayoutIndex.store`."""
+
+  doc_id: str
+  page: int
+  block_id: str
+  type: str
+  bbox: Tuple[float, float, float, float]
+  row: int
+
+
+class LayoutIndex:
+  """Blocks of one or more documents with type, page, grid and word postings.
+
+  Documents occupy contiguous page ranges of `store`; `page_docs` holds the
+  (non-decreasing) index into `doc_ids` of each page.
+  """
+
+  def __init__(
+    self,
+    store: BlockStore,
+    doc_ids: List[str],
+    page_docs: np.ndarray,
+    keys: List[str],
+    offsets: np.ndarray,
+    rows: np.ndarray,
+  ) -> None:
+    self.store = store
+    self.doc_ids = doc_ids
+    self.page_docs = page_docs
+    self._keys = keys
+    self._key_index = {key: i for i, key in enumerate(keys)}
+    self._offsets = offsets
+    self._rows = rows
+    rows_per_page = np.diff(store.page_offsets)
+    self._row_docs = np.repeat(page_docs, rows_per_page)
+    self._row_pages = np.repeat(store.page_numbers, rows_per_page)
+    self._doc_codes: Dict[str, List[int]] = {}
+    for code, doc_id in enumerate(doc_ids):
+      self._doc_codes.setdefault(doc_id, []).append(code)
+
+  @classmethod
+  def from_store(
+    cls, store: BlockStore, doc_id: str, block_words: Optional[List[List[str]]] = None
+  ) -> "LayoutIndex":
+    """Index one document's store; `block_words` skips re-tokenizing texts."""
+    key_index: Dict[str, int] = {}
+    key_ids: List[int] = []
+    rows: List[int] = []
+    row_pages = np.repeat(store.page_numbers, np.diff(store.page_offsets))
+    for row in range(store.block_count):
+      tokens = block_words[row] if block_words is not None else words(store.text(row) or "")
+      keys = [f"t:{store.type_name(row)}", f"p:{int(row_pages[row])}"]
+      keys.extend(f"c:{cell}" for cell in _cells(store.bboxes[row]))
+      keys.extend(f"w:{token}" for token in tokens)
+      for key in keys:
+        key_ids.append(key_index.setdefault(key, len(key_index)))
+        rows.append(row)
+    page_docs = np.zeros(store.page_count, dtype=np.int32)
+    return cls(store, [doc_id], page_docs, *_csr(list(key_index), key_ids, rows))
+
+  @classmethod
+  def from_pages(cls, pages: List[Dict[str, Any]], doc_id: str) -> "LayoutIndex":
+    builder = LayoutIndexBuilder(doc_id)
+    for page in pages:
+      builder.add_page(page)
+    return builder.build()
+
+  @classmethod
+  def merge(cls, indexes: Sequence["LayoutIndex"]) -> "LayoutIndex":
+    """One index over all documents of `indexes`, in order."""
+    if not indexes:
+      raise ValueError("No indexes to merge")
+    if len(indexes) == 1:
+      return indexes[0]
+    key_index: Dict[str, int] = {}
+    key_ids: List[np.ndarray] = []
+    rows: List[np.ndarray] = []
+    page_docs: List[np.ndarray] = []
+    doc_ids: List[str] = []
+    row_base = 0
+    for index in indexes:
+      mapping = np.asarray(
+        [key_index.setdefault(key, len(key_index)) for key in index._keys], dtype=np.int64
+      )
+      key_ids.append(np.repeat(mapping, np.diff(index._offsets)))
+      rows.append(index._rows.astype(np.int64) + row_base)
+      page_docs.append(index.page_docs + len(doc_ids))
+      doc_ids.extend(index.doc_ids)
+      row_base += index.store.block_count
+    return cls(
+      _concat_stores([index.store for index in indexes]),
+      doc_ids,
+      np.concatenate(page_docs).astype(np.int32),
+      *_csr(list(key_index), np.concatenate(key_ids), np.concatenate(rows)),
+    )
+
+  def __len__(self) -> int:
+    return self.store.block_count
+
+  def save(self, path: Path) -> Path:
+    """Write the index to `path` atomically."""
+    store = self.store
+    arrays = {
+      "version": np.asarray(INDEX_VERSION),
+      "page_numbers": store.page_numbers,
+      "page_widths": store.page_widths,
+      "page_heights": store.page_heights,
+      "page_offsets": store.page_offsets,
+      "bboxes": store.bboxes,
+      "type_codes": store.type_codes,
+      "levels": store.levels,
+      "confs": store.confs,
+      "has_text": store.has_text,
+      "text_offsets": store.text_offsets,
+      "text_arena": _utf8(store.text_arena),
+      "id_offsets": store.id_offsets,
+      "id_arena": _utf8(store.id_arena),
+      "type_names": _utf8(_KEY_SEP.join(store.type_names)),
+      "tables": _utf8(json.dumps({str(row): rows for row, rows in store.tables.items()})),
+      "doc_ids": _utf8(_KEY_SEP.join(self.doc_ids)),
+      "page_docs": self.page_docs,
+      "posting_keys": _utf8(_KEY_SEP.join(self._keys)),
+      "posting_offsets": self._offsets,
+      "posting_rows": self._rows,
+    }
+    ensure_dir(path.parent)
+    tmp = path.with_name(f".{path.name}.part")
+    try:
+      with tmp.open("wb") as f:
+        np.savez(f, **arrays)
+      os.replace(tmp, path)
+    finally:
+      tmp.unlink(missing_ok=True)
+    return path
+
+  @classmethod
+  def load(cls, path: Path) -> "LayoutIndex":
+    with np.load(path, allow_pickle=False) as data:
+      version = int(data["version"])
+      if version != INDEX_VERSION:
+        raise ValueError(f"{path}: index version {version}, expected {INDEX_VERSION}")
+      store = BlockStore(
+        page_numbers=data["page_numbers"],
+        page_widths=data["page_widths"],
+        page_heights=data["page_heights"],
+        page_offsets=data["page_offsets"],
+        bboxes=data["bboxes"],
+        type_codes=data["type_codes"],
+        levels=data["levels"],
+        confs=data["confs"],
+        has_text=data["has_text"],
+        text_offsets=data["text_offsets"],
+        text_arena=_text(data["text_arena"]),
+        id_offsets=data["id_offsets"],
+        id_arena=_text(data["id_arena"]),
+        type_names=_text(data["type_names"]).split(_KEY_SEP),
+        tables={int(row): rows for row, rows in json.loads(_text(data["tables"])).items()},
+      )
+      return cls(
+        store,
+        _split(_text(data["doc_ids"])),
+        data["page_docs"],
+        _split(_text(data["posting_keys"])),
+        data["posting_offsets"],
+        data["posting_rows"],
+      )
+
+  def _posting(self, key: str) -> np.ndarray:
+    i = self._key_index.get(key)
+    if i is None:
+      return self._rows[:0]
+    return self._rows[self._offsets[i] : self._offsets[i + 1]]
+
+  def _any(self, keys: Iterable[str]) -> np.ndarray:
+    postings = [self._posting(key) for key in keys]
+    if len(postings) == 1:
+      return postings[0]
+    # A row mask unions many lists in O(blocks) without sorting.
+    hit = np.zeros(self.store.block_count, dtype=bool)
+    for posting in postings:
+      hit[posting] = True
+    return np.flatnonzero(hit)
+
+  def query_rows(
+    self,
+    doc_id: Union[str, Iterable[str], None] = None,
+    pages: Union[str, int, Iterable[int], None] = None,
+    types: Union[str, Iterable[str], None] = None,
+    region: Optional[Region] = None,
+    text: Optional[str] = None,
+  ) -> np.ndarray:
+    """Ascending store rows matching every given filter (see `query`)."""
+    candidates: List[np.ndarray] = []
+    if doc_id is not None:
+      names = [doc_id] if isinstance(doc_id, str) else list(doc_id)
+      spans = [
+        np.arange(
+          np.searchsorted(self._row_docs, code, "left"),
+          np.searchsorted(self._row_docs, code, "right"),
+        )
+        for name in names
+        for code in self._doc_codes.get(name, [])
+      ]
+      candidates.append(np.concatenate(spans) if spans else self._rows[:0])
+    if pages is not None:
+      if isinstance(pages, str):
+        pages = parse_pages_spec(pages)
+      elif isinstance(pages, int):
+        pages = [pages]
+      candidates.append(self._any(f"p:{int(page)}" for page in pages))
+    if types is not None:
+      names = [types] if isinstance(types, str) else list(types)
+      candidates.append(self._any(f"t:{name}" for name in names))
+    if region is not None:
+      candidates.append(self._any(f"c:{cell}" for cell in _cells(region)))
+    if text:
+      candidates.extend(self._posting(f"w:{token}") for token in words(text))
+
+    if not candidates:
+      rows = np.arange(self.store.block_count)
+    else:
+      candidates.sort(key=len)
+      rows = candidates[0]
+      for other in candidates[1:]:
+        if not len(rows):
+          break
+        rows = np.intersect1d(rows, other, assume_unique=True)
+    if region is not None and len(rows):
+      x0, x1 = sorted((float(region[0]), float(region[2])))
+      y0, y1 = sorted((float(region[1]), float(region[3])))
+      boxes = self.store.bboxes[rows]
+      hit = (boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) & (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0)
+      rows = rows[hit]
+    return rows
+
+  def query(
+    self,
+    doc_id: Union[str, Iterable[str], None] = None,
+    pages: Union[str, int, Iterable[int], None] = None,
+    types: Union[str, Iterable[str], None] = None,
+    region: Optional[Region] = None,
+    text: Optional[str] = None,
+    limit: Optional[int] = None,
+  ) -> List[BlockRef]:
+    """Blocks matching every given filter, in document and page order.
+
+    `pages` takes page numbers or a spec such as `"10-20"`; `types` and
+    `doc_id` match any of their values; `region` is a normalized
+    `[x0, y0, x1, y1]` box the block must intersect (touching counts);
+    `text` matches blocks containing all of its words, case-insensitively.
+    """
+    rows = self.query_rows(doc_id, pages, types, region, text)
+    return [self.ref(int(row)) for row in rows[:limit]]
+
+  def ref(self, row: int) -> BlockRef:
+    x0, y0, x1, y1 = (round(float(v), 6) for v in self.store.bboxes[row])
+    return BlockRef(
+      doc_id=self.doc_ids[self._row_docs[row]],
+      page=int(self._row_pages[row]),
+      block_id=self.store.block_id(row),
+      type=self.store.type_name(row),
+      bbox=(x0, y0, x1, y1),
+      row=row,
+    )
+
+  def text(self, ref: BlockRef) -> Optional[str]:
+    return self.store.text(ref.row)
+
+  def block(self, ref: BlockRef) -> "Block":
+    from ..types import Block
+
+    return Block.model_validate(self.store.block_dict(ref.row))
+
+
+class LayoutIndexBuilder:
+  """Collect one document's pages as they finish, in any order.
+
+  Texts are tokenized on `add_page`, so `build` only packs columns and
+  postings once the last page is in.
+  """
+
+  def __init__(self, doc_id: str) -> None:
+    self.doc_id = doc_id
+    self._pages: Dict[int, Tuple[Dict[str, Any], List[List[str]]]] = {}
+
+  def add_page(self, page: Dict[str, Any]) -> None:
+    block_words = [
+      words(str(block["text"])) if block.get("text") is not None else []
+      for block in page.get("blocks", []) or []
+    ]
+    self._pages[int(page["page_number"])] = (page, block_words)
+
+  def build(self) -> LayoutIndex:
+    numbers = sorted(self._pages)
+    store = BlockStore.from_pages([self._pages[n][0] for n in numbers])
+    block_words = [tokens for n in numbers for tokens in self._pages[n][1]]
+    return LayoutIndex.from_store(store, self.doc_id, block_words)
+
+
+def _csr(
+  keys: List[str], key_ids: Union[List[int], np.ndarray], rows: Union[List[int], np.ndarray]
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+  # Rows arrive ascending per key, so a stable sort keeps each list sorted.
+  ids = np.asarray(key_ids, dtype=np.int64)
+  order = np.argsort(ids, kind="stable")
+  counts = np.bincount(ids, minlength=len(keys))
+  offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+  return keys, offsets, np.asarray(rows, dtype=np.int32)[order]
+
+
+def _concat_stores(stores: Sequence[BlockStore]) -> BlockStore:
+  type_names = list(BLOCK_TYPES)
+  type_index = {name: i for i, name in enumerate(type_names)}
+  type_codes: List[np.ndarray] = []
+  page_offsets: List[np.ndarray] = []
+  text_offsets: List[np.ndarray] = []
+  id_offsets: List[np.ndarray] = []
+  tables: Dict[int, List[List[str]]] = {}
+  row_base = text_base = id_base = 0
+  for store in stores:
+    mapping = []
+    for name in store.type_names:
+      if name not in type_index:
+        type_index[name] = len(type_names)
+        type_names.append(name)
+      mapping.append(type_index[name])
+    type_codes.append(np.asarray(mapping, dtype=np.int64)[store.type_codes])
+    page_offsets.append(store.page_offsets[:-1] + row_base)
+    text_offsets.append(store.text_offsets[:-1] + text_base)
+    id_offsets.append(store.id_offsets[:-1] + id_base)
+    tables.update({row + row_base: rows for row, rows in store.tables.items()})
+    row_base += store.block_count
+    text_base += len(store.text_arena)
+    id_base += len(store.id_arena)
+  type_dtype = np.uint8 if len(type_names) <= 256 else np.uint16
+  return BlockStore(
+    page_numbers=np.concatenate([s.page_numbers for s in stores]),
+    page_widths=np.concatenate([s.page_widths for s in stores]),
+    page_heights=np.concatenate([s.page_heights for s in stores]),
+    page_offsets=np.concatenate(page_offsets + [np.asarray([row_base])]).astype(np.int64),
+    bboxes=np.concatenate([s.bboxes for s in stores]).reshape(-1, 4),
+    type_codes=np.concatenate(type_codes).astype(type_dtype),
+    levels=np.concatenate([s.levels for s in stores]),
+    confs=np.concatenate([s.confs for s in stores]),
+    has_text=np.concatenate([s.has_text for s in stores]),
+    text_offsets=np.concatenate(text_offsets + [np.asarray([text_base])]).astype(np.int64),
+    text_arena="".join(s.text_arena for s in stores),
+    id_offsets=np.concatenate(id_offsets + [np.asarray([id_base])]).astype(np.int64),
+    id_arena="".join(s.id_arena for s in stores),
+    type_names=type_names,
+    tables=tables,
+  )
+
+
+def _utf8(text: str) -> np.ndarray:
+  return np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+
+
+def _text(raw: np.ndarray) -> str:
+  return raw.tobytes().decode("utf-8")
+
+
+def _split(joined: str) -> List[str]:
+  return joined.split(_KEY_SEP) if joined else []
+
+
+def load_indexes(paths: Iterable[Path]) -> LayoutIndex:
+  """Load and merge saved indexes into one corpus index."""
+  return LayoutIndex.merge([LayoutIndex.load(Path(path)) for path in paths])
+
+
+__all__ = [
+  "INDEX_FILENAME",
+  "BlockRef",
+  "LayoutIndex",
+  "LayoutIndexBuilder",
+  "load_indexes",
+  "words",
+]
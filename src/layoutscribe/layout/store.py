@@ -0,0 +1,218 @@
+"""Compact columnar block store.
+
+Responsibilities:
+- Hold every block of a document as struct-of-arrays columns (NumPy
+  bboxes, interned type codes, a shared text arena) instead of nested
+  dicts or Pydantic objects.
+- Provide reading-order iteration and vectorized geometry for the
+  composer and validator.
+- Materialize page dicts or `DocumentLayout` models only on demand.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, get_args
+
+import numpy as np
+
+from ..types import BlockType
+
+if TYPE_CHECKING:
+  from ..types import DocumentLayout
+
+
+BLOCK_TYPES: Tuple[str, ...] = get_args(BlockType)
+
+# Column value standing in for a missing heading level (conf uses NaN).
+NO_LEVEL = 0
+
+
+@dataclass
+class BlockStore:
+  """Columnar storage for all blocks of a document.
+
+  Blocks of page `p` occupy rows `page_offsets[p]:page_offsets[p + 1]`.
+  Strings (`text`, `id`) live in one arena each and are addressed by
+  `[start, end)` offsets; `has_text` distinguishes a missing text from "".
+  Type codes index into `type_names`, which starts with the canonical
+  block types and interns any other value the model returned.
+  """
+
+  page_numbers: np.ndarray
+  page_widths: np.ndarray
+  page_heights: np.ndarray
+  page_offsets: np.ndarray
+  bboxes: np.ndarray
+  type_codes: np.ndarray
+  levels: np.ndarray
+  confs: np.ndarray
+  has_text: np.ndarray
+  text_offsets: np.ndarray
+  text_arena: str
+  id_offsets: np.ndarray
+  id_arena: str
+  type_names: List[str] = field(default_factory=lambda: list(BLOCK_TYPES))
+  tables: Dict[int, List[List[str]]] = field(default_factory=dict)
+
+  @classmethod
+  def from_pages(cls, pages: List[Dict[str, Any]]) -> "BlockStore":
+    """Pack page dicts (as produced by the pipeline) into columns."""
+    type_names = list(BLOCK_TYPES)
+    type_index = {name: i for i, name in enumerate(type_names)}
+    page_numbers: List[int] = []
+    page_widths: List[int] = []
+    page_heights: List[int] = []
+    page_offsets: List[int] = [0]
+    bboxes: List[Tuple[float, float, float, float]] = []
+    type_codes: List[int] = []
+    levels: List[int] = []
+    confs: List[float] = []
+    has_text: List[bool] = []
+    text_parts: List[str] = []
+    text_ends: List[int] = []
+    id_parts: List[str] = []
+    id_ends: List[int] = []
+    tables: Dict[int, List[List[str]]] = {}
+    text_len = 0
+    id_len = 0
+
+    for page_pos, page in enumerate(pages):
+      page_numbers.append(int(page.get("page_number") or page_pos + 1))
+      page_widths.append(int(page.get("width_px") or 0))
+      page_heights.append(int(page.get("height_px") or 0))
+      for block in page.get("blocks", []) or []:
+        row = len(type_codes)
+        btype = str(block.get("type", "paragraph"))
+        code = type_index.get(btype)
+        if code is None:
+          code = type_index[btype] = len(type_names)
+          type_names.append(btype)
+        type_codes.append(code)
+        bboxes.append(_coerce_bbox(block.get("bbox")))
+        level = block.get("level")
+        levels.append(int(level) if isinstance(level, (int, float)) else NO_LEVEL)
+        conf = block.get("conf")
+        confs.append(float(conf) if isinstance(conf, (int, float)) else np.nan)
+        text = block.get("text")
+        has_text.append(text is not None)
+        text = "" if text is None else str(text)
+        text_parts.append(text)
+        text_len += len(text)
+        text_ends.append(text_len)
+        block_id = str(block.get("id", f"b{row + 1}"))
+        id_parts.append(block_id)
+        id_len += len(block_id)
+        id_ends.append(id_len)
+        table = block.get("table")
+        if isinstance(table, dict) and table.get("rows") is not None:
+          tables[row] = table["rows"]
+      page_offsets.append(len(type_codes))
+
+    type_dtype = np.uint8 if len(type_names) <= 256 else np.uint16
+    return cls(
+      page_numbers=np.asarray(page_numbers, dtype=np.int32),
+      page_widths=np.asarray(page_widths, dtype=np.int32),
+      page_heights=np.asarray(page_heights, dtype=np.int32),
+      page_offsets=np.asarray(page_offsets, dtype=np.int64),
+      bboxes=np.asarray(bboxes, dtype=np.float32).reshape(-1, 4),
+      type_codes=np.asarray(type_codes, dtype=type_dtype),
+      levels=np.asarray(levels, dtype=np.int8),
+      confs=np.asarray(confs, dtype=np.float32),
+      has_text=np.asarray(has_text, dtype=bool),
+      text_offsets=np.asarray([0] + text_ends, dtype=np.int64),
+      text_arena="".join(text_parts),
+      id_offsets=np.asarray([0] + id_ends, dtype=np.int64),
+      id_arena="".join(id_parts),
+      type_names=type_names,
+      tables=tables,
+    )
+
+  @property
+  def page_count(self) -> int:
+    return int(self.page_numbers.shape[0])
+
+  @property
+  def block_count(self) -> int:
+    return int(self.type_codes.shape[0])
+
+  def page_slice(self, page_pos: int) -> slice:
+    return slice(int(self.page_offsets[page_pos]), int(self.page_offsets[page_pos + 1]))
+
+  def text(self, row: int) -> Optional[str]:
+    if not self.has_text[row]:
+      return None
+    return self.text_arena[self.text_offsets[row] : self.text_offsets[row + 1]]
+
+  def block_id(self, row: int) -> str:
+    return self.id_arena[self.id_offsets[row] : self.id_offsets[row + 1]]
+
+  def type_name(self, row: int) -> str:
+    return self.type_names[self.type_codes[row]]
+
+  def type_code(self, name: str) -> Optional[int]:
+    try:
+      return self.type_names.index(name)
+    except ValueError:
+      return None
+
+  def reading_order(self, page_pos: int) -> np.ndarray:
+    """Global row indices of a page sorted top-to-bottom, left-to-right."""
+    rows = self.page_slice(page_pos)
+    boxes = self.bboxes[rows]
+    order = np.lexsort((boxes[:, 0], boxes[:, 1]))
+    return order + rows.start
+
+  def iter_page_rows(self) -> Iterator[np.ndarray]:
+    for page_pos in range(self.page_count):
+      yield self.reading_order(page_pos)
+
+  def block_dict(self, row: int) -> Dict[str, Any]:
+    """Materialize one block as a dict shaped like `Block.model_dump()`."""
+    level = int(self.levels[row])
+    conf = self.confs[row]
+    rows = self.tables.get(row)
+    return {
+      "id": self.block_id(row),
+      "type": self.type_name(row),
+      "bbox": self.bboxes[row].astype(np.float64).round(6).tolist(),
+      "text": self.text(row),
+      "level": level if level != NO_LEVEL else None,
+      "table": {"rows": rows} if rows is not None else None,
+      "conf": None if np.isnan(conf) else round(float(conf), 6),
+    }
+
+  def page_dict(self, page_pos: int) -> Dict[str, Any]:
+    rows = self.page_slice(page_pos)
+    return {
+      "page_number": int(self.page_numbers[page_pos]),
+      "width_px": int(self.page_widths[page_pos]),
+      "height_px": int(self.page_heights[page_pos]),
+      "blocks": [self.block_dict(row) for row in range(rows.start, rows.stop)],
+    }
+
+  def to_pages(self) -> List[Dict[str, Any]]:
+    return [self.page_dict(page_pos) for page_pos in range(self.page_count)]
+
+  def to_document_layout(self) -> "DocumentLayout":
+    from ..types import DocumentLayout
+
+    return DocumentLayout.model_validate({"pages": self.to_pages()})
+
+
+def canonical_page(page: Dict[str, Any]) -> Dict[str, Any]:
+  """Normalize one raw page dict to the `layout.json` page shape."""
+  return BlockStore.from_pages([page]).page_dict(0)
+
+
+def _coerce_bbox(value: Any) -> Tuple[float, float, float, float]:
+  if isinstance(value, (list, tuple)) and len(value) == 4:
+    try:
+      x0, y0, x1, y1 = (float(v) for v in value)
+      return (x0, y0, x1, y1)
+    except (TypeError, ValueError):
+      pass
+  return (0.0, 0.0, 0.0, 0.0)
+
+
+__all__ = ["BLOCK_TYPES", "BlockStore", "canonical_page"]
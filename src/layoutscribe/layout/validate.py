@@ -3,19 +3,26 @@
 Responsibilities:
 - Validate page/block structures against the canonical JSON Schema.
 - Perform geometry checks: bbox ranges, overlap thresholds, coverage heuristics.
+  Checks are vectorized over an `(n, 4)` bbox array.
 """
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 
-from jsonschema import Draft202012Validator
+import numpy as np
 import json
 from importlib import resources
 
+if TYPE_CHECKING:
+  from jsonschema import Draft202012Validator
+
 
 def load_schema(schema_path: Path) -> Dict[str, Any]:
+  from jsonschema import Draft202012Validator
+
   with schema_path.open("r", encoding="utf-8") as f:
     return Draft202012Validator.check_schema(__import__("json").load(f)) or __import__(
       "json"
@@ -30,51 +37,73 @@ def validate_page(page: Dict[str, Any], validator: Draft202012Validator) -> List
 
 
 def build_validator(schema_path: Path) -> Draft202012Validator:
+  from jsonschema import Draft202012Validator
+
   with schema_path.open("r", encoding="utf-8") as f:
     schema = json.load(f)
   Draft202012Validator.check_schema(schema)
   return Draft202012Validator(schema)
 
 
-def build_default_validator() -> Draft202012Validator:
-  """Load the packaged default schema via importlib.resources."""
+@lru_cache(maxsize=1)
+def load_default_schema() -> Dict[str, Any]:
+  """The packaged page schema (cached per process; do not mutate)."""
   schema_file = resources.files("layoutscribe.schema").joinpath("layout_page.schema.json")
   with schema_file.open("r", encoding="utf-8") as f:
-    schema = json.load(f)
-  Draft202012Validator.check_schema(schema)
-  return Draft202012Validator(schema)
+    return json.load(f)
 
 
-def iou(b1: List[float], b2: List[float]) -> float:
-  x0 = max(b1[0], b2[0])
-  y0 = max(b1[1], b2[1])
-  x1 = min(b1[2], b2[2])
-  y1 = min(b1[3], b2[3])
-  inter_w = max(0.0, x1 - x0)
-  inter_h = max(0.0, y1 - y0)
-  inter = inter_w * inter_h
-  if inter == 0:
-    return 0.0
-  area1 = max(0.0, b1[2] - b1[0]) * max(0.0, b1[3] - b1[1])
-  area2 = max(0.0, b2[2] - b2[0]) * max(0.0, b2[3] - b2[1])
-  union = area1 + area2 - inter
-  if union <= 0:
-    return 0.0
-  return inter / union
+@lru_cache(maxsize=1)
+def build_default_validator() -> Draft202012Validator:
+  """Load the packaged default schema via importlib.resources (cached per process)."""
+  from jsonschema import Draft202012Validator
+
+  schema = load_default_schema()
+  Draft202012Validator.check_schema(schema)
+  return Draft202012Validator(schema)
 
 
 def geometry_checks(blocks: List[Dict[str, Any]], overlap_iou_threshold: float = 0.3) -> List[str]:
+  boxes = np.zeros((len(blocks), 4), dtype=np.float64)
+  malformed = np.zeros(len(blocks), dtype=bool)
+  for i, b in enumerate(blocks):
+    try:
+      boxes[i] = b.get("bbox", [0, 0, 0, 0])
+    except (TypeError, ValueError):
+      malformed[i] = True
+  ids = [b.get("id") for b in blocks]
+  return bbox_array_checks(boxes, ids, overlap_iou_threshold, malformed)
+
+
+def pairwise_iou(boxes: np.ndarray) -> np.ndarray:
+  """IoU matrix for an `(n, 4)` array of `[x0, y0, x1, y1]` boxes."""
+  x0 = np.maximum(boxes[:, None, 0], boxes[None, :, 0])
+  y0 = np.maximum(boxes[:, None, 1], boxes[None, :, 1])
+  x1 = np.minimum(boxes[:, None, 2], boxes[None, :, 2])
+  y1 = np.minimum(boxes[:, None, 3], boxes[None, :, 3])
+  inter = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+  area = np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+  union = area[:, None] + area[None, :] - inter
+  with np.errstate(divide="ignore", invalid="ignore"):
+    return np.where((inter > 0) & (union > 0), inter / union, 0.0)
+
+
+def bbox_array_checks(
+  boxes: np.ndarray,
+  ids: Sequence[Any],
+  overlap_iou_threshold: float = 0.3,
+  malformed: Optional[np.ndarray] = None,
+) -> List[str]:
   errs: List[str] = []
-  for b in blocks:
-    x0, y0, x1, y1 = b.get("bbox", [0, 0, 0, 0])
-    if not (0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1):
-      errs.append(f"invalid bbox range for block {b.get('id')}")
-  for i in range(len(blocks)):
-    for j in range(i + 1, len(blocks)):
-      if iou(blocks[i]["bbox"], blocks[j]["bbox"]) > overlap_iou_threshold:
-        errs.append(
-          f"overlap above threshold between {blocks[i].get('id')} and {blocks[j].get('id')}"
-        )
+  x0, y0, x1, y1 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+  invalid = ~((0 <= x0) & (x0 < x1) & (x1 <= 1) & (0 <= y0) & (y0 < y1) & (y1 <= 1))
+  if malformed is not None:
+    invalid |= malformed
+  for i in np.flatnonzero(invalid):
+    errs.append(f"invalid bbox range for block {ids[i]}")
+  if len(boxes) < 2:
+    return errs
+  over = np.triu(pairwise_iou(boxes) > overlap_iou_threshold, k=1)
+  for i, j in zip(*np.nonzero(over)):
+    errs.append(f"overlap above threshold between {ids[i]} and {ids[j]}")
   return errs
-
-
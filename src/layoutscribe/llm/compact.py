@@ -0,0 +1,133 @@
+"""Compact wire encoding for page layouts.
+
+Responsibilities:
+- Define a token-lean response shape: short keys, short block-type codes,
+  integer bboxes on a 0–1000 grid, integer confidence percentages and
+  tables as delimited strings; block ids and page fields are filled locally.
+- Expand compact answers into the canonical page dict before review, and
+  encode canonical pages (for prompts, tests and size comparisons).
+
+Wire shape: `{"b": [{"t": "p", "b": [x0, y0, x1, y1], "x": "text", "l": 2,
+"c": 95, "r": "H1|H2\\nv1|v2"}]}`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Literal, Optional
+
+WireFormat = Literal["full", "compact"]
+WIRE_FORMATS = ("full", "compact")
+GRID = 1000
+
+TYPE_CODES: Dict[str, str] = {
+  "title": "ti",
+  "heading": "h",
+  "paragraph": "p",
+  "list_item": "li",
+  "table": "tab",
+  "figure": "fig",
+  "equation": "eq",
+  "caption": "cap",
+  "footer": "ft",
+  "header": "hd",
+}
+CODE_TYPES = {code: name for name, code in TYPE_CODES.items()}
+
+
+def _encode_cell(cell: str) -> str:
+  return cell.replace("\\", "\\\\").replace("|", "\\|").replace("\n", " ")
+
+
+def _decode_row(line: str) -> List[str]:
+  cells: List[str] = []
+  current: List[str] = []
+  chars = iter(line)
+  for ch in chars:
+    if ch == "\\":
+      current.append(next(chars, ""))
+    elif ch == "|":
+      cells.append("".join(current))
+      current = []
+    else:
+      current.append(ch)
+  cells.append("".join(current))
+  return cells
+
+
+def encode_table(rows: List[List[str]]) -> str:
+  return "\n".join("|".join(_encode_cell(str(c)) for c in row) for row in rows)
+
+
+def decode_table(value: str) -> List[List[str]]:
+  return [_decode_row(line) for line in value.split("\n") if line.strip()]
+
+
+def _grid_bbox(bbox: Any) -> List[int]:
+  return [int(round(float(v) * GRID)) for v in bbox]
+
+
+def _unit_bbox(bbox: Any) -> Any:
+  if not isinstance(bbox, list):
+    return bbox
+  try:
+    return [round(float(v) / GRID, 6) for v in bbox]
+  except (TypeError, ValueError):
+    return bbox
+
+
+def expand_block(block: Dict[str, Any], index: int) -> Dict[str, Any]:
+  """Canonical block from a compact one (canonical blocks pass through)."""
+  if "type" in block or "t" not in block:
+    return block
+  code = str(block.get("t"))
+  out: Dict[str, Any] = {
+    "id": f"b{index}",
+    "type": CODE_TYPES.get(code, code),
+    "bbox": _unit_bbox(block.get("b")),
+  }
+  if block.get("x") is not None:
+    out["text"] = block["x"]
+  if block.get("l") is not None:
+    out["level"] = block["l"]
+  if isinstance(block.get("r"), str):
+    out["table"] = {"rows": decode_table(block["r"])}
+  if isinstance(block.get("c"), (int, float)):
+    out["conf"] = round(float(block["c"]) / 100, 4)
+  return out
+
+
+def expand_page(page: Dict[str, Any], width_px: int, height_px: int) -> Dict[str, Any]:
+  """Canonical page dict from a compact answer."""
+  raw_blocks = page.get("b", page.get("blocks")) or []
+  blocks = [
+    expand_block(block, i) if isinstance(block, dict) else block
+    for i, block in enumerate(raw_blocks, start=1)
+  ]
+  return {
+    "page_number": page.get("page_number", 1),
+    "width_px": page.get("width_px") or width_px,
+    "height_px": page.get("height_px") or height_px,
+    "blocks": blocks,
+  }
+
+
+def compact_block(block: Dict[str, Any]) -> Dict[str, Any]:
+  out: Dict[str, Any] = {
+    "t": TYPE_CODES.get(block["type"], block["type"]),
+    "b": _grid_bbox(block["bbox"]),
+  }
+  if block.get("text") is not None:
+    out["x"] = block["text"]
+  if block.get("level") is not None:
+    out["l"] = block["level"]
+  table: Optional[Dict[str, Any]] = block.get("table")
+  if table and table.get("rows") is not None:
+    out["r"] = encode_table(table["rows"])
+  if block.get("conf") is not None:
+    out["c"] = int(round(float(block["conf"]) * 100))
+  return out
+
+
+def compact_page(page: Dict[str, Any]) -> Dict[str, Any]:
+  """Compact wire form of a canonical page (ids and page fields are dropped)."""
+  return {"b": [compact_block(block) for block in page.get("blocks") or []]}
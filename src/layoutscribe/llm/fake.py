@@ -0,0 +1,51 @@
+"""Deterministic offline provider.
+
+Model ids of the form `fake/<name>` are answered locally without LiteLLM
+or network access, for tests and local server smoke runs.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, Tuple
+
+FAKE_PREFIX = "fake/"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def is_fake_model(model_id: str) -> bool:
+  return model_id.startswith(FAKE_PREFIX)
+
+
+def _png_size(image_bytes: bytes) -> Tuple[int, int]:
+  if image_bytes[:8] == _PNG_SIGNATURE and len(image_bytes) >= 24:
+    return struct.unpack(">II", image_bytes[16:24])
+  return (1, 1)
+
+
+def fake_page(image_bytes: bytes) -> Dict[str, Any]:
+  """Return a schema-valid single-paragraph page for the given image."""
+  width_px, height_px = _png_size(image_bytes)
+  return {
+    "page_number": 1,
+    "width_px": width_px,
+    "height_px": height_px,
+    "blocks": [
+      {
+        "id": "b1",
+        "type": "paragraph",
+        "bbox": [0.05, 0.05, 0.95, 0.95],
+        "text": f"fake page {width_px}x{height_px}",
+        "conf": 1.0,
+      }
+    ],
+  }
+
+
+def fake_usage(prompt_text: str, page: Dict[str, Any]) -> Dict[str, int]:
+  """Token usage as a provider would report it (~4 chars/token, 85 for the image)."""
+  return {
+    "prompt_tokens": len(prompt_text) // 4 + 85,
+    "completion_tokens": len(json.dumps(page)) // 4,
+  }
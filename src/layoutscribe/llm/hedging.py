@@ -0,0 +1,160 @@
+"""Request hedging for vision calls.
+
+Responsibilities:
+- Track the run's own provider-call latencies.
+- When a call outlives the configured latency percentile, issue a duplicate
+  (to the same or a secondary model); the first acceptable answer wins and
+  the other call is cancelled.
+- Cap hedges by a fraction of calls, a spend callback and free provider
+  slots, and count what happened for run metadata.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+  percentile: float = 0.95
+  hedge_model: Optional[str] = None
+  # Hedges may not exceed this fraction of primary calls started so far.
+  max_fraction: float = 0.1
+  min_samples: int = 5
+  min_delay_s: float = 1.0
+  window: int = 200
+
+
+class LatencyTracker:
+  """Rolling window of successful call latencies (seconds)."""
+
+  def __init__(self, window: int = 200) -> None:
+    self._samples: Deque[float] = deque(maxlen=window)
+
+  def __len__(self) -> int:
+    return len(self._samples)
+
+  def observe(self, seconds: float) -> None:
+    self._samples.append(seconds)
+
+  def percentile(self, q: float) -> Optional[float]:
+    if not self._samples:
+      return None
+    ordered = sorted(self._samples)
+    rank = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class Hedger:
+  """Run calls with an optional hedge once they exceed the latency percentile.
+
+  `accept` decides whether an answer is good enough to win (a rejected
+  answer only wins if nothing better arrives); `may_spend` is consulted
+  before each hedge and may charge the run budget.
+  """
+
+  def __init__(
+    self,
+    policy: HedgePolicy,
+    accept: Optional[Callable[[Any], bool]] = None,
+    may_spend: Optional[Callable[[], bool]] = None,
+  ) -> None:
+    self.policy = policy
+    self.accept = accept or (lambda _result: True)
+    self.may_spend = may_spend
+    self.latency = LatencyTracker(policy.window)
+    self.calls = 0
+    self.issued = 0
+    self.won = 0
+    self.cancelled = 0
+
+  def stats(self) -> Dict[str, int]:
+    return {"issued": self.issued, "won": self.won, "cancelled": self.cancelled}
+
+  def hedge_delay(self) -> Optional[float]:
+    if len(self.latency) < self.policy.min_samples:
+      return None
+    threshold = self.latency.percentile(self.policy.percentile)
+    return max(self.policy.min_delay_s, threshold or 0.0)
+
+  def _may_hedge(self, semaphore: Optional[asyncio.Semaphore]) -> bool:
+    if self.issued + 1 > self.policy.max_fraction * self.calls:
+      return False
+    # Hedges only use spare provider capacity, never queue for a slot.
+    if semaphore is not None and semaphore.locked():
+      return False
+    return self.may_spend is None or self.may_spend()
+
+  async def run(
+    self,
+    call: Callable[[str], Awaitable[T]],
+    model_id: str,
+    semaphore: Optional[asyncio.Semaphore] = None,
+  ) -> T:
+    """Run `call(model_id)`, hedging with `call(hedge_model)` when it is slow.
+
+    The caller holds one `semaphore` slot for the primary call; a hedge
+    takes a second slot only if one is free right now.
+    """
+    loop = asyncio.get_running_loop()
+    self.calls += 1
+    started = {"primary": loop.time()}
+    primary = asyncio.ensure_future(call(model_id))
+    delay = self.hedge_delay()
+    if delay is None:
+      result = await primary
+      self.latency.observe(loop.time() - started["primary"])
+      return result
+
+    hedge: Optional["asyncio.Future[T]"] = None
+    holds_slot = False
+    try:
+      done, _ = await asyncio.wait({primary}, timeout=delay)
+      if done or not self._may_hedge(semaphore):
+        result = await primary
+        self.latency.observe(loop.time() - started["primary"])
+        return result
+      if semaphore is not None:
+        await semaphore.acquire()
+        holds_slot = True
+      self.issued += 1
+      started["hedge"] = loop.time()
+      hedge = asyncio.ensure_future(call(self.policy.hedge_model or model_id))
+      names = {primary: "primary", hedge: "hedge"}
+      pending = set(names)
+      fallback: Optional[T] = None
+      has_fallback = False
+      error: Optional[BaseException] = None
+      while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          if task.exception() is not None:
+            error = task.exception()
+            continue
+          result = task.result()
+          if not self.accept(result):
+            if not has_fallback:
+              fallback, has_fallback = result, True
+            continue
+          name = names[task]
+          self.latency.observe(loop.time() - started[name])
+          if name == "hedge":
+            self.won += 1
+          return result
+      if has_fallback:
+        return fallback  # type: ignore[return-value]
+      assert error is not None
+      raise error
+    finally:
+      for task in (primary, hedge):
+        if task is not None and not task.done():
+          task.cancel()
+          self.cancelled += 1
+      if holds_slot and semaphore is not None:
+        semaphore.release()
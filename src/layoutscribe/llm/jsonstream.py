@@ -0,0 +1,159 @@
+"""Incremental parsing of page-layout JSON from (streamed) model output.
+
+Responsibilities:
+- Consume response text chunk by chunk and emit each block of the
+  top-level `blocks` array as soon as its object closes.
+- Detect clearly malformed output early (prose instead of JSON, unbalanced
+  brackets, undecodable blocks) so a stream can be abandoned.
+- Salvage complete blocks from output cut off mid-stream (e.g. by the
+  max-tokens limit) instead of discarding the whole page.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_MAX_DEPTH = 32
+# `b` is the blocks key of the compact wire format (see `llm.compact`).
+_BLOCKS_KEY = re.compile(r'"(?:blocks|b)"\s*:\s*$')
+_PAGE_FIELDS = ("page_number", "width_px", "height_px")
+_CLOSERS = {"}": "{", "]": "["}
+
+
+class MalformedOutput(ValueError):
+  """The model output cannot be (or become) a page-layout JSON object."""
+
+
+class IncrementalPageParser:
+  """Scan JSON text as it arrives, tracking strings and bracket nesting."""
+
+  def __init__(self) -> None:
+    self.text = ""
+    self.blocks: List[Dict[str, Any]] = []
+    self.truncated = True  # until the top-level object closes
+    self._pos = 0
+    self._started = False
+    self._stack: List[str] = []
+    self._in_string = False
+    self._escape = False
+    self._blocks_depth: Optional[int] = None
+    self._block_start: Optional[int] = None
+    self._prefix_end: Optional[int] = None
+
+  def feed(self, chunk: str) -> List[Dict[str, Any]]:
+    """Add text; return blocks completed by it. Raises `MalformedOutput`."""
+    self.text += chunk
+    if not self._started and not self._skip_preamble():
+      return []
+    completed: List[Dict[str, Any]] = []
+    text = self.text
+    i = self._pos
+    while i < len(text):
+      ch = text[i]
+      if self._in_string:
+        if self._escape:
+          self._escape = False
+        elif ch == "\\":
+          self._escape = True
+        elif ch == '"':
+          self._in_string = False
+      elif not self._stack and not self.truncated:
+        pass  # trailing text after the object (e.g. a closing code fence)
+      elif ch == '"':
+        self._in_string = True
+      elif ch in "{[":
+        if len(self._stack) >= _MAX_DEPTH:
+          raise MalformedOutput("nesting too deep")
+        if ch == "[" and self._stack == ["{"] and _BLOCKS_KEY.search(text[:i]):
+          self._blocks_depth = 2
+          if self._prefix_end is None:
+            self._prefix_end = i
+        if ch == "{" and self._blocks_depth is not None and len(self._stack) == 2:
+          self._block_start = i
+        self._stack.append(ch)
+      elif ch in "}]":
+        if not self._stack or self._stack[-1] != _CLOSERS[ch]:
+          raise MalformedOutput(f"unbalanced '{ch}' at offset {i}")
+        self._stack.pop()
+        if ch == "}" and self._block_start is not None and len(self._stack) == 2:
+          completed.append(self._decode_block(text[self._block_start : i + 1]))
+          self._block_start = None
+        elif ch == "]" and len(self._stack) == 1:
+          self._blocks_depth = None
+        elif not self._stack:
+          self.truncated = False
+      i += 1
+    self._pos = i
+    self.blocks.extend(completed)
+    return completed
+
+  def _skip_preamble(self) -> bool:
+    stripped = self.text.lstrip()
+    if len(stripped) < 3 and "```".startswith(stripped):
+      return False
+    if stripped.startswith("```"):
+      newline = stripped.find("\n")
+      if newline < 0:
+        return False
+      stripped = stripped[newline + 1 :].lstrip()
+    if not stripped:
+      return False
+    if stripped[0] != "{":
+      raise MalformedOutput("output does not start with a JSON object")
+    self._pos = len(self.text) - len(stripped)
+    self._started = True
+    return True
+
+  def _decode_block(self, raw: str) -> Dict[str, Any]:
+    try:
+      block = json.loads(raw)
+    except json.JSONDecodeError as exc:
+      raise MalformedOutput(f"undecodable block: {exc.msg}") from exc
+    if not isinstance(block, dict):
+      raise MalformedOutput("block is not an object")
+    return block
+
+  def result(self) -> Dict[str, Any]:
+    """The page: fully decoded when complete, otherwise salvaged blocks."""
+    if not self.truncated:
+      start = self.text.find("{")
+      try:
+        page = json.loads(self.text[start : self._pos])
+        if isinstance(page, dict):
+          return page
+      except json.JSONDecodeError:
+        pass
+    return self.salvage()
+
+  def salvage(self) -> Dict[str, Any]:
+    prefix = self.text[: self._prefix_end] if self._prefix_end is not None else self.text
+    page: Dict[str, Any] = {"page_number": 1, "width_px": 0, "height_px": 0}
+    for key in _PAGE_FIELDS:
+      match = re.search(rf'"{key}"\s*:\s*(\d+)', prefix)
+      if match:
+        page[key] = int(match.group(1))
+    page["blocks"] = list(self.blocks)
+    return page
+
+
+def parse_page_json(content: Optional[str]) -> Dict[str, Any]:
+  """Decode a complete response, salvaging whole blocks if it is cut off or broken.
+
+  Well-formed output takes the `json.loads` fast path; only output it
+  rejects (fenced, truncated, broken) goes through the incremental scanner.
+  """
+  try:
+    page = json.loads(content or "")
+  except json.JSONDecodeError:
+    pass
+  else:
+    if isinstance(page, dict):
+      return page
+  parser = IncrementalPageParser()
+  try:
+    parser.feed(content or "")
+  except MalformedOutput:
+    return parser.salvage()
+  return parser.result()
@@ -0,0 +1,182 @@
+"""Load balancing and failover across equivalent model endpoints.
+
+Responsibilities:
+- Describe a pool of interchangeable endpoints (e.g. OpenAI, Azure OpenAI,
+  a second region), each with a weight, a concurrency limit and optional
+  LiteLLM connection parameters.
+- Route each call to the endpoint with the best live score (weight over
+  latency × load, discounted by recent errors).
+- Drain endpoints that throttle us or keep failing, probe them again after
+  a cooldown, and fail a call over to the next endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from ..exceptions import ProviderAuthError, ProviderRateLimitError
+
+T = TypeVar("T")
+
+_EWMA_ALPHA = 0.2
+_PASSTHROUGH_KEYS = ("api_base", "api_version")
+
+
+@dataclass(frozen=True)
+class EndpointSpec:
+  model: str
+  weight: float = 1.0
+  max_concurrency: Optional[int] = None
+  api_base: Optional[str] = None
+  api_version: Optional[str] = None
+  api_key_env: Optional[str] = None
+
+  def completion_kwargs(self) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {k: getattr(self, k) for k in _PASSTHROUGH_KEYS if getattr(self, k)}
+    if self.api_key_env:
+      kwargs["api_key"] = os.environ.get(self.api_key_env)
+    return kwargs
+
+
+def parse_endpoint(spec: str) -> EndpointSpec:
+  """Parse `model[,weight=W][,concurrency=N][,api_base=URL][,api_version=V][,api_key_env=VAR]`."""
+  model, *options = [part.strip() for part in spec.split(",")]
+  if not model:
+    raise ValueError(f"Endpoint spec '{spec}' has no model")
+  fields: Dict[str, Any] = {}
+  for option in options:
+    key, sep, value = option.partition("=")
+    if not sep:
+      raise ValueError(f"Endpoint option '{option}' must be key=value")
+    if key == "weight":
+      fields["weight"] = float(value)
+    elif key == "concurrency":
+      fields["max_concurrency"] = int(value)
+    elif key in (*_PASSTHROUGH_KEYS, "api_key_env"):
+      fields[key] = value
+    else:
+      raise ValueError(f"Unknown endpoint option '{key}'")
+  return EndpointSpec(model=model, **fields)
+
+
+@dataclass
+class Endpoint:
+  spec: EndpointSpec
+  in_flight: int = 0
+  latency_s: Optional[float] = None  # EWMA of successful calls
+  error_rate: float = 0.0  # EWMA of failures
+  consecutive_failures: int = 0
+  drained_until: float = 0.0
+  calls: int = 0
+  failures: int = 0
+  drains: int = 0
+  slots: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+
+  def available(self, now: float) -> bool:
+    if self.drained_until > now:
+      return False
+    return self.spec.max_concurrency is None or self.in_flight < self.spec.max_concurrency
+
+
+class EndpointPool:
+  """Spread calls over equivalent endpoints and fail over between them."""
+
+  def __init__(
+    self,
+    specs: Sequence[EndpointSpec],
+    cooldown_s: float = 30.0,
+    failure_threshold: int = 3,
+  ) -> None:
+    if not specs:
+      raise ValueError("an endpoint pool needs at least one endpoint")
+    self.endpoints = [Endpoint(spec=s) for s in specs]
+    self.cooldown_s = cooldown_s
+    self.failure_threshold = failure_threshold
+
+  @property
+  def primary_model(self) -> str:
+    return self.endpoints[0].spec.model
+
+  def _score(self, ep: Endpoint, default_latency: float) -> float:
+    latency = ep.latency_s if ep.latency_s is not None else default_latency
+    return ep.spec.weight * (1.0 - ep.error_rate) / (max(latency, 1e-3) * (1 + ep.in_flight))
+
+  def pick(self, exclude: Sequence[Endpoint] = ()) -> Endpoint:
+    """Best-scoring available endpoint; if all are drained, the one back soonest."""
+    now = time.monotonic()
+    candidates = [ep for ep in self.endpoints if ep not in exclude] or list(self.endpoints)
+    known = [ep.latency_s for ep in self.endpoints if ep.latency_s is not None]
+    default_latency = sum(known) / len(known) if known else 1.0
+    ready = [ep for ep in candidates if ep.available(now)]
+    if not ready:
+      return min(candidates, key=lambda ep: (ep.drained_until, ep.in_flight))
+    return max(ready, key=lambda ep: self._score(ep, default_latency))
+
+  def _record_success(self, ep: Endpoint, latency_s: float) -> None:
+    ep.latency_s = (
+      latency_s
+      if ep.latency_s is None
+      else (1 - _EWMA_ALPHA) * ep.latency_s + _EWMA_ALPHA * latency_s
+    )
+    ep.error_rate *= 1 - _EWMA_ALPHA
+    ep.consecutive_failures = 0
+
+  def _record_failure(self, ep: Endpoint, exc: Exception) -> None:
+    ep.failures += 1
+    ep.error_rate = (1 - _EWMA_ALPHA) * ep.error_rate + _EWMA_ALPHA
+    ep.consecutive_failures += 1
+    throttled = isinstance(exc, (ProviderRateLimitError, ProviderAuthError))
+    if throttled or ep.consecutive_failures >= self.failure_threshold:
+      ep.drained_until = time.monotonic() + self.cooldown_s
+      ep.drains += 1
+
+  async def call(self, fn: Callable[[EndpointSpec], Awaitable[T]]) -> T:
+    """Run `fn` on the best endpoint, failing over until every endpoint was tried twice."""
+    tried: List[Endpoint] = []
+    last_error: Optional[Exception] = None
+    for _attempt in range(2 * len(self.endpoints)):
+      ep = self.pick(exclude=tried)
+      wait_s = ep.drained_until - time.monotonic()
+      if wait_s > 0:
+        await asyncio.sleep(min(wait_s, 1.0 + len(tried)))
+      if ep.spec.max_concurrency is not None and ep.slots is None:
+        ep.slots = asyncio.Semaphore(ep.spec.max_concurrency)
+      if ep.slots is not None:
+        await ep.slots.acquire()
+      ep.in_flight += 1
+      ep.calls += 1
+      started = time.monotonic()
+      try:
+        result = await fn(ep.spec)
+      except Exception as exc:
+        self._record_failure(ep, exc)
+        last_error = exc
+        tried = [*tried, ep] if ep not in tried else tried
+        if len(tried) == len(self.endpoints):
+          tried = []
+        continue
+      finally:
+        ep.in_flight -= 1
+        if ep.slots is not None:
+          ep.slots.release()
+      self._record_success(ep, time.monotonic() - started)
+      return result
+    assert last_error is not None
+    raise last_error
+
+  def stats(self) -> List[Dict[str, Any]]:
+    return [
+      {
+        "model": ep.spec.model,
+        "api_base": ep.spec.api_base,
+        "calls": ep.calls,
+        "failures": ep.failures,
+        "drains": ep.drains,
+        "latency_s": round(ep.latency_s, 3) if ep.latency_s is not None else None,
+      }
+      for ep in self.endpoints
+    ]
@@ -4,34 +4,49 @@ Responsibilities:
 - Define system and user prompts for PageVision and Reviewer.
 - Include concise instructions enforcing the JSON schema contract.
 - Provide re-ask templates referencing specific overlap/coverage issues.
+- Keep system instructions free of per-page values so they form a static
+  prefix shared (and cached by providers) across every call in a run;
+  page size and re-ask hints go in the per-page prompt after the image.
+- Lay out vision messages in that order (`build_messages`), marking the
+  static prefix with an explicit cache-control hint for providers that
+  only cache on request (Anthropic Claude, also via Bedrock/Vertex);
+  OpenAI-compatible providers cache a stable prefix automatically.
+
+Providers cache only prefixes of at least 1024 tokens (OpenAI, most Claude
+models; 2048 for Claude Haiku). The built-in instructions are roughly 370
+(full) and 280 (compact) tokens, so on their own they stay below that
+minimum and the cache hint is a no-op; it takes effect for longer prefixes.
 """
 
 from __future__ import annotations
 
+from typing import Any, Dict, List, Optional
+
 
-def page_vision_instruction(width_px: int, height_px: int) -> str:
-  return f"""You are a precise document layout and text extraction assistant.
+def page_vision_instruction() -> str:
+  """Static system instruction; identical for every page of every run."""
+  return """You are a precise document layout and text extraction assistant.
 
 Analyze the provided page image and extract ALL visible text with its structure.
 
 Return a JSON object with this exact schema:
 
-{{
+{
   "page_number": 1,
-  "width_px": {width_px},
-  "height_px": {height_px},
+  "width_px": <page width in pixels, given with the image>,
+  "height_px": <page height in pixels, given with the image>,
   "blocks": [
-    {{
+    {
       "id": "b1",
       "type": "<one of: title, heading, paragraph, list_item, table, figure, equation, caption, footer, header>",
       "bbox": [x0, y0, x1, y1],
       "text": "extracted text here",
       "level": 1,
-      "table": {{"rows": [["H1","H2"],["v1","v2"]]}},
+      "table": {"rows": [["H1","H2"],["v1","v2"]]},
       "conf": 0.95
-    }}
+    }
   ]
-}}
+}
 
 CRITICAL RULES:
 1. Extract ALL visible text from the image - do not skip any text regions
@@ -48,6 +63,12 @@ CRITICAL RULES:
 Return the complete JSON now."""
 
 
+def page_prompt(width_px: int, height_px: int, reask_hint: str = "") -> str:
+  """Per-page tail sent after the image (page size, optional re-ask hint)."""
+  text = f"Page image size: width_px={width_px}, height_px={height_px}."
+  return text + "\n" + reask_hint.strip() if reask_hint else text
+
+
 def reviewer_reask_hint() -> str:
   return """
 VALIDATION FAILED. Please fix:
@@ -61,3 +82,69 @@ VALIDATION FAILED. Please fix:
 Return the corrected JSON."""
 
 
+def page_vision_instruction_compact() -> str:
+  """Instruction for the compact wire format (see `llm.compact`)."""
+  return """You are a precise document layout and text extraction assistant.
+
+Analyze the provided page image and extract ALL visible text with its structure.
+
+Return a JSON object in this compact form:
+
+{"b": [{"t": "h", "b": [x0, y0, x1, y1], "x": "text", "l": 1, "c": 95}]}
+
+Keys per block:
+- "t": type code: ti=title, h=heading, p=paragraph, li=list_item, tab=table,
+  fig=figure, eq=equation, cap=caption, ft=footer, hd=header
+- "b": integer bbox on a 0-1000 grid of the page, 0 ≤ x0 < x1 ≤ 1000, 0 ≤ y0 < y1 ≤ 1000
+- "x": extracted text (omit for figures without text)
+- "l": heading level 1-6 (headings only)
+- "r": table rows as one string, rows separated by \\n and cells by |
+  (write a literal | inside a cell as \\\\|), e.g. "H1|H2\\nv1|v2" (tables only)
+- "c": confidence 0-100
+
+CRITICAL RULES:
+1. Extract ALL visible text - do not skip any text regions
+2. Preserve reading order (top-to-bottom, left-to-right)
+3. Omit keys that do not apply; no ids, no page fields
+4. Return ONLY valid JSON - no markdown, no prose
+5. Do not invent text - only include what you can see
+
+Return the JSON now."""
+
+
+def compact_reask_hint() -> str:
+  return """
+VALIDATION FAILED. Please fix:
+- Ensure all "b" values are integers on the 0-1000 grid with x0 < x1 and y0 < y1
+- Reduce block overlaps (IoU should be ≤0.3 except caption+figure pairs)
+- Cover ALL visible text regions - do not miss any text
+- Headings need "l"; tables need "r"
+
+Return the corrected JSON."""
+
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+_EXPLICIT_CACHE_PROVIDERS = ("anthropic",)
+
+
+def uses_cache_control(model_id: str) -> bool:
+  """True when the provider only caches prefixes marked with `cache_control`."""
+  provider = model_id.split("/", 1)[0] if "/" in model_id else ""
+  return provider in _EXPLICIT_CACHE_PROVIDERS or "claude" in model_id.lower()
+
+
+def build_messages(
+  model_id: str,
+  instruction: str,
+  image_url: str,
+  page_prompt: Optional[str] = None,
+  prompt_cache: bool = True,
+) -> List[Dict[str, Any]]:
+  """System prefix first (cache-marked where needed), per-page content last."""
+  system: Dict[str, Any] = {"type": "text", "text": instruction}
+  if prompt_cache and uses_cache_control(model_id):
+    system["cache_control"] = _CACHE_CONTROL
+  user: List[Dict[str, Any]] = [{"type": "image_url", "image_url": {"url": image_url}}]
+  if page_prompt:
+    user.append({"type": "text", "text": page_prompt})
+  return [{"role": "system", "content": [system]}, {"role": "user", "content": user}]
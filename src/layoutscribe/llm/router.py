@@ -8,56 +8,144 @@ Responsibilities:
 from __future__ import annotations
 
 import base64
-import json
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 from ..exceptions import ProviderAuthError, ProviderRateLimitError
+from ..tracing.profile import span
 from ..utils.backoff import DEFAULT_RETRY
+from .fake import fake_page, fake_usage, is_fake_model
+from .jsonstream import IncrementalPageParser, MalformedOutput, parse_page_json
+from .prompts import build_messages
+from .structured import JSON_OBJECT_FORMAT, drop_nulls
+
+if TYPE_CHECKING:
+  from .usage import TokenUsage
 
 
 @DEFAULT_RETRY
 async def vision_json_call(
-  model_id: str, image_bytes: bytes, instruction: str, temperature: float = 0.0
+  model_id: str,
+  image_bytes: bytes,
+  instruction: str,
+  temperature: float = 0.0,
+  stream: bool = False,
+  response_format: Optional[Dict[str, Any]] = None,
+  page_prompt: Optional[str] = None,
+  prompt_cache: bool = True,
+  usage: Optional["TokenUsage"] = None,
+  **completion_kwargs: Any,
 ) -> Dict[str, Any]:
-  """Call a vision model via LiteLLM and return parsed JSON."""
+  """Call a vision model via LiteLLM and return parsed JSON, with retries."""
+  return await request_vision_json(
+    model_id,
+    image_bytes,
+    instruction,
+    temperature,
+    stream=stream,
+    response_format=response_format,
+    page_prompt=page_prompt,
+    prompt_cache=prompt_cache,
+    usage=usage,
+    **completion_kwargs,
+  )
+
+
+async def request_vision_json(
+  model_id: str,
+  image_bytes: bytes,
+  instruction: str,
+  temperature: float = 0.0,
+  stream: bool = False,
+  response_format: Optional[Dict[str, Any]] = None,
+  page_prompt: Optional[str] = None,
+  prompt_cache: bool = True,
+  usage: Optional["TokenUsage"] = None,
+  **completion_kwargs: Any,
+) -> Dict[str, Any]:
+  """Single vision call attempt (no retries); endpoint pools fail over instead.
+
+  `completion_kwargs` (e.g. `api_base`, `api_key`) are passed to LiteLLM.
+  With `stream`, blocks are parsed as tokens arrive and the stream is
+  abandoned as soon as the output is clearly malformed. Output that is cut
+  off or broken keeps every complete block rather than being discarded.
+  `response_format` defaults to `json_object`; with a strict JSON schema,
+  the nulls it forces for absent optional fields are dropped.
+
+  `instruction` is sent as the static system prefix and `page_prompt` after
+  the image, so prefix caching survives page-to-page changes; `prompt_cache`
+  adds explicit cache hints where the provider needs them. Token usage of
+  every answered attempt (retries and re-asks included) is recorded in
+  `usage`; calls that fail or are cancelled only release their hold.
+  """
+  if is_fake_model(model_id):
+    with span("llm call", "llm", model=model_id):
+      page = fake_page(image_bytes)
+    if usage is not None:
+      usage.record(model_id, fake_usage(instruction + (page_prompt or ""), page))
+    return page
   try:
     import litellm  # type: ignore
   except ImportError as exc:
     raise RuntimeError("litellm is required for LLM calls") from exc
 
-  image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-  image_url = f"data:image/png;base64,{image_b64}"
-
-  messages = [
-    {
-      "role": "user",
-      "content": [
-        {"type": "text", "text": instruction},
-        {"type": "image_url", "image_url": {"url": image_url}},
-      ],
-    }
-  ]
+  with span("encode request", "encode", image_bytes=len(image_bytes)):
+    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
+    image_url = f"data:image/png;base64,{image_b64}"
+    messages = build_messages(model_id, instruction, image_url, page_prompt, prompt_cache)
+  if stream:
+    completion_kwargs.setdefault("stream_options", {"include_usage": True})
 
+  hold = usage.begin(model_id) if usage is not None else 0.0
   try:
-    response = await litellm.acompletion(
-      model=model_id,
-      messages=messages,
-      temperature=temperature,
-      response_format={"type": "json_object"},
-    )
-  except Exception as exc:
+    with span("llm call", "llm", model=model_id, stream=stream):
+      response = await litellm.acompletion(
+        model=model_id,
+        messages=messages,
+        temperature=temperature,
+        response_format=response_format or JSON_OBJECT_FORMAT,
+        stream=stream,
+        **completion_kwargs,
+      )
+      if stream:
+        page, reported = await _consume_stream(response)
+    if not stream:
+      with span("parse response", "decode"):
+        page = parse_page_json(response.choices[0].message.content)
+      reported = getattr(response, "usage", None)
+  except BaseException as exc:
+    if usage is not None:
+      usage.release(hold)
+    if not isinstance(exc, Exception):
+      raise
     err_str = str(exc).lower()
     if "rate" in err_str or "429" in err_str:
       raise ProviderRateLimitError(f"Rate limit: {exc}") from exc
     if "auth" in err_str or "401" in err_str or "403" in err_str:
       raise ProviderAuthError(f"Auth error: {exc}") from exc
     raise
+  if usage is not None:
+    usage.record(model_id, reported, hold)
 
-  content = response.choices[0].message.content
-  try:
-    return json.loads(content)
-  except json.JSONDecodeError as exc:
-    # Fallback: return empty layout if JSON parse fails
-    return {"page_number": 1, "width_px": 0, "height_px": 0, "blocks": []}
+  if response_format and response_format.get("type") == "json_schema":
+    drop_nulls(page)
+  return page
 
 
+async def _consume_stream(response: Any) -> Tuple[Dict[str, Any], Any]:
+  """Parse a streamed response; returns the page and the reported usage."""
+  parser = IncrementalPageParser()
+  last_usage: Any = None
+  try:
+    async for chunk in response:
+      last_usage = getattr(chunk, "usage", None) or last_usage
+      if not chunk.choices:
+        continue
+      parser.feed(chunk.choices[0].delta.content or "")
+  except MalformedOutput:
+    close = getattr(response, "aclose", None)
+    if close is not None:
+      await close()
+    page = parser.salvage()
+  else:
+    page = parser.result()
+  return page, last_usage
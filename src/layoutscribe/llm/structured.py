@@ -0,0 +1,104 @@
+"""Structured-output contracts for vision calls.
+
+Responsibilities:
+- Derive a provider-friendly strict JSON schema from the packaged
+  `layout_page.schema.json` (refs inlined, every property required with
+  optional ones nullable, no keywords strict modes reject).
+- Choose the `response_format` per model: the schema where LiteLLM reports
+  support (LiteLLM maps it to tool calls for providers that need it), plain
+  `json_object` elsewhere.
+- Drop the nulls strict schemas force for absent optional fields.
+"""
+
+from __future__ import annotations
+
+import copy
+from functools import lru_cache
+from typing import Any, Dict, Literal
+
+from .fake import is_fake_model
+
+StructuredMode = Literal["json_object", "json_schema", "auto"]
+STRUCTURED_MODES = ("json_object", "json_schema", "auto")
+JSON_OBJECT_FORMAT: Dict[str, Any] = {"type": "json_object"}
+
+# Keywords that strict structured-output modes reject or ignore; the local
+# validator still enforces them after the call.
+_DROPPED_KEYWORDS = (
+  "$schema",
+  "$id",
+  "title",
+  "allOf",
+  "minimum",
+  "maximum",
+  "minLength",
+  "minItems",
+  "maxItems",
+)
+
+
+def _strictify(node: Any, defs: Dict[str, Any]) -> Any:
+  if isinstance(node, list):
+    return [_strictify(item, defs) for item in node]
+  if not isinstance(node, dict):
+    return node
+  ref = node.get("$ref")
+  if isinstance(ref, str) and ref.startswith("#/$defs/"):
+    return _strictify(defs[ref.rsplit("/", 1)[1]], defs)
+  out = {
+    key: _strictify(value, defs)
+    for key, value in node.items()
+    if key not in _DROPPED_KEYWORDS and key != "$defs"
+  }
+  if out.get("type") == "object" and "properties" in out:
+    required = set(node.get("required", []))
+    for name, prop in out["properties"].items():
+      if name in required:
+        continue
+      if isinstance(prop.get("type"), str) and prop["type"] != "object":
+        prop["type"] = [prop["type"], "null"]
+      else:
+        out["properties"][name] = {"anyOf": [prop, {"type": "null"}]}
+    out["required"] = list(out["properties"])
+    out["additionalProperties"] = False
+  return out
+
+
+@lru_cache(maxsize=1)
+def strict_page_schema() -> Dict[str, Any]:
+  """Strict-mode variant of the packaged page schema (do not mutate)."""
+  from ..layout.validate import load_default_schema
+
+  schema = copy.deepcopy(load_default_schema())
+  return _strictify(schema, schema.get("$defs", {}))
+
+
+@lru_cache(maxsize=None)
+def supports_json_schema(model_id: str) -> bool:
+  if is_fake_model(model_id):
+    return True
+  try:
+    import litellm  # type: ignore
+
+    return bool(litellm.supports_response_schema(model=model_id))
+  except Exception:
+    return False
+
+
+def response_format_for(model_id: str, mode: StructuredMode = "json_object") -> Dict[str, Any]:
+  """`response_format` for `model_id`; `auto` uses the schema only where supported."""
+  if mode == "json_object" or (mode == "auto" and not supports_json_schema(model_id)):
+    return JSON_OBJECT_FORMAT
+  return {
+    "type": "json_schema",
+    "json_schema": {"name": "layout_page", "schema": strict_page_schema(), "strict": True},
+  }
+
+
+def drop_nulls(page: Dict[str, Any]) -> Dict[str, Any]:
+  """Remove null optional fields from blocks (strict schemas emit them)."""
+  for block in page.get("blocks") or []:
+    if isinstance(block, dict):
+      for key in [k for k, v in block.items() if v is None]:
+        del block[key]
+  return page
@@ -0,0 +1,81 @@
+"""Token usage accounting.
+
+Responsibilities:
+- Read prompt, cached, cache-write and completion tokens from LiteLLM
+  response usage and total them per model for run metadata.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+
+def _get(obj: Any, key: str) -> Any:
+  if obj is None:
+    return None
+  if isinstance(obj, dict):
+    return obj.get(key)
+  return getattr(obj, key, None)
+
+
+def usage_counts(usage: Any) -> Dict[str, int]:
+  """Token counts from a LiteLLM `usage` object (or dict); missing fields are 0."""
+  cached = _get(_get(usage, "prompt_tokens_details"), "cached_tokens")
+  if not cached:
+    cached = _get(usage, "cache_read_input_tokens")
+  return {
+    "prompt_tokens": int(_get(usage, "prompt_tokens") or 0),
+    "cached_prompt_tokens": int(cached or 0),
+    "cache_write_tokens": int(_get(usage, "cache_creation_input_tokens") or 0),
+    "completion_tokens": int(_get(usage, "completion_tokens") or 0),
+  }
+
+
+class TokenUsage:
+  """Per-model totals of calls and prompt/cached/completion tokens.
+
+  The router calls `begin` before a request and then either `record` (with
+  the value `begin` returned) or `release`; subclasses use this to count
+  calls in flight.
+  """
+
+  def __init__(self) -> None:
+    self._totals: Dict[str, Dict[str, int]] = {}
+
+  def begin(self, model_id: str) -> float:
+    return 0.0
+
+  def release(self, hold: float) -> None:
+    pass
+
+  def record(self, model_id: str, usage: Any, hold: float = 0.0) -> Dict[str, int]:
+    counts = usage_counts(usage)
+    totals = self._totals.setdefault(
+      model_id,
+      {
+        "calls": 0,
+        "prompt_tokens": 0,
+        "cached_prompt_tokens": 0,
+        "cache_write_tokens": 0,
+        "completion_tokens": 0,
+      },
+    )
+    totals["calls"] += 1
+    for key, value in counts.items():
+      totals[key] += value
+    return counts
+
+  def stats(self) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for model, totals in sorted(self._totals.items()):
+      prompt = totals["prompt_tokens"]
+      cached = totals["cached_prompt_tokens"]
+      out.append(
+        {
+          "model": model,
+          **totals,
+          "uncached_prompt_tokens": max(prompt - cached, 0),
+          "cache_hit_rate": round(cached / prompt, 4) if prompt else 0.0,
+        }
+      )
+    return out
@@ -1,6 +1,6 @@
 """Loaders for non-PDF formats.
 
-Currently supports PPTX via python-pptx. DOCX is pending a native renderer.
+PPTX via python-pptx and DOCX via python-docx, both rasterized with Pillow.
 """
 
 
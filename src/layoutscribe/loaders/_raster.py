@@ -0,0 +1,266 @@
+"""Shared rasterization for the Office loaders.
+
+Responsibilities:
+- Describe page content as plain display lists (filled shapes, lines,
+  pictures, text frames and positioned text lines) so format parsing stays
+  sequential and pixel work can run on a thread pool.
+- Load scalable fonts once per size and weight (system TrueType fonts,
+  then Pillow's bundled font) and wrap text to a width.
+- Rasterize display lists with Pillow and save pages as PNG.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from PIL import Image, ImageDraw, ImageFont
+
+Color = Tuple[int, int, int]
+Box = Tuple[float, float, float, float]
+WHITE: Color = (255, 255, 255)
+BLACK: Color = (0, 0, 0)
+PLACEHOLDER_GRAY: Color = (200, 200, 200)
+
+_REGULAR_FONTS = ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf", "FreeSans.ttf")
+_BOLD_FONTS = ("DejaVuSans-Bold.ttf", "Arial Bold.ttf", "LiberationSans-Bold.ttf")
+_LINE_SPACING = 1.2
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class TextStyle:
+  size_px: float
+  bold: bool = False
+  color: Color = BLACK
+
+
+@dataclass(frozen=True)
+class TextPara:
+  text: str
+  style: TextStyle
+  align: str = "left"  # left | center | right
+  indent_px: float = 0.0
+  bullet: str = ""
+  space_after_px: float = 0.0
+
+
+@dataclass(frozen=True)
+class Rect:
+  box: Box
+  fill: Optional[Color] = None
+  outline: Optional[Color] = None
+  width: int = 1
+  geometry: str = "rect"  # rect | ellipse | rounded
+
+
+@dataclass(frozen=True)
+class Line:
+  points: Tuple[Tuple[float, float], ...]
+  color: Color = BLACK
+  width: int = 1
+
+
+@dataclass(frozen=True)
+class Picture:
+  box: Box
+  blob: bytes
+  crop: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)  # left, top, right, bottom
+
+
+@dataclass(frozen=True)
+class TextFrame:
+  """Paragraphs wrapped inside `box` (insets already applied) at raster time."""
+
+  box: Box
+  paras: Tuple[TextPara, ...]
+  anchor: str = "top"  # top | middle | bottom
+  wrap: bool = True
+
+
+@dataclass(frozen=True)
+class TextLine:
+  """One already laid-out line (paginated formats lay out before rastering)."""
+
+  x: float
+  y: float
+  text: str
+  style: TextStyle
+
+
+Op = Union[Rect, Line, Picture, TextFrame, TextLine]
+
+
+@lru_cache(maxsize=None)
+def font(size_px: int, bold: bool = False) -> Any:
+  size_px = max(int(size_px), 4)
+  for name in (_BOLD_FONTS if bold else ()) + _REGULAR_FONTS:
+    try:
+      return ImageFont.truetype(name, size_px)
+    except OSError:
+      continue
+  try:
+    return ImageFont.load_default(size_px)
+  except TypeError:  # Pillow < 10.1 has no scalable default font
+    return ImageFont.load_default()
+
+
+def font_for(style: TextStyle) -> Any:
+  return font(int(round(style.size_px)), style.bold)
+
+
+def line_height(style: TextStyle) -> float:
+  return style.size_px * _LINE_SPACING
+
+
+def text_width(text: str, fnt: Any) -> float:
+  return float(fnt.getlength(text))
+
+
+def wrap_text(text: str, fnt: Any, max_width: float) -> List[str]:
+  """Greedy word wrap; words wider than `max_width` are split by character."""
+  lines: List[str] = []
+  for raw in text.replace("\v", "\n").split("\n"):
+    current = ""
+    for word in raw.split(" "):
+      candidate = f"{current} {word}" if current else word
+      if text_width(candidate, fnt) <= max_width:
+        current = candidate
+        continue
+      if current:
+        lines.append(current)
+      current = ""
+      for ch in word:
+        if current and text_width(current + ch, fnt) > max_width:
+          lines.append(current)
+          current = ""
+        current += ch
+    lines.append(current)
+  return lines
+
+
+def para_lines(para: TextPara, width: float, wrap: bool = True) -> List[str]:
+  prefix = f"{para.bullet} " if para.bullet else ""
+  available = max(width - para.indent_px, 1.0)
+  text = prefix + para.text
+  if not wrap:
+    return text.replace("\v", "\n").split("\n")
+  return wrap_text(text, font_for(para.style), available)
+
+
+def para_height(para: TextPara, width: float, wrap: bool = True) -> float:
+  return len(para_lines(para, width, wrap)) * line_height(para.style) + para.space_after_px
+
+
+def line_x(para: TextPara, line: str, x0: float, width: float) -> float:
+  if para.align == "left":
+    return x0 + para.indent_px
+  slack = width - para.indent_px - text_width(line, font_for(para.style))
+  return x0 + para.indent_px + (slack / 2 if para.align == "center" else slack)
+
+
+def _draw_text_frame(draw: ImageDraw.ImageDraw, op: TextFrame) -> None:
+  x0, y0, x1, y1 = op.box
+  width = x1 - x0
+  laid_out = [(para, para_lines(para, width, op.wrap)) for para in op.paras]
+  total = sum(len(lines) * line_height(p.style) + p.space_after_px for p, lines in laid_out)
+  y = y0
+  if op.anchor == "middle":
+    y = y0 + (y1 - y0 - total) / 2
+  elif op.anchor == "bottom":
+    y = y1 - total
+  for para, lines in laid_out:
+    fnt = font_for(para.style)
+    for line in lines:
+      if line:
+        draw.text((line_x(para, line, x0, width), y), line, fill=para.style.color, font=fnt)
+      y += line_height(para.style)
+    y += para.space_after_px
+
+
+def _paste_picture(img: Image.Image, op: Picture) -> bool:
+  x0, y0, x1, y1 = (int(round(v)) for v in op.box)
+  if x1 <= x0 or y1 <= y0:
+    return True
+  try:
+    pic = Image.open(io.BytesIO(op.blob))
+    pic.load()
+  except Exception:
+    return False  # e.g. EMF/WMF/SVG, which Pillow cannot decode
+  left, top, right, bottom = op.crop
+  if any(op.crop):
+    w, h = pic.size
+    box = (int(w * left), int(h * top), int(w * (1 - right)), int(h * (1 - bottom)))
+    if box[2] > box[0] and box[3] > box[1]:
+      pic = pic.crop(box)
+  pic = pic.convert("RGBA").resize((x1 - x0, y1 - y0), Image.Resampling.BILINEAR)
+  img.paste(pic, (x0, y0), pic)
+  return True
+
+
+def draw_ops(img: Image.Image, ops: Iterable[Op]) -> Image.Image:
+  draw = ImageDraw.Draw(img)
+  for op in ops:
+    if isinstance(op, Rect):
+      box = [tuple(op.box[:2]), tuple(op.box[2:])]
+      if op.box[2] <= op.box[0] or op.box[3] <= op.box[1]:
+        continue
+      if op.geometry == "ellipse":
+        draw.ellipse(box, fill=op.fill, outline=op.outline, width=op.width)
+      elif op.geometry == "rounded":
+        radius = min(op.box[2] - op.box[0], op.box[3] - op.box[1]) / 6
+        draw.rounded_rectangle(box, radius, fill=op.fill, outline=op.outline, width=op.width)
+      else:
+        draw.rectangle(box, fill=op.fill, outline=op.outline, width=op.width)
+    elif isinstance(op, Line):
+      draw.line(list(op.points), fill=op.color, width=op.width)
+    elif isinstance(op, Picture):
+      if not _paste_picture(img, op):
+        draw.rectangle(
+          [tuple(op.box[:2]), tuple(op.box[2:])], fill=PLACEHOLDER_GRAY, outline=BLACK
+        )
+    elif isinstance(op, TextFrame):
+      _draw_text_frame(draw, op)
+    elif isinstance(op, TextLine):
+      if op.text:
+        draw.text((op.x, op.y), op.text, fill=op.style.color, font=font_for(op.style))
+  return img
+
+
+def rasterize(
+  size: Tuple[int, int],
+  ops: Sequence[Op],
+  background: Union[Color, Image.Image] = WHITE,
+) -> Image.Image:
+  """Draw `ops` over a fill color or a copy of a pre-rendered base image."""
+  if isinstance(background, Image.Image):
+    img = background.copy()
+  else:
+    img = Image.new("RGB", size, color=background)
+  return draw_ops(img, ops)
+
+
+def save_png(img: Image.Image, out_path: Path) -> None:
+  img.convert("RGB").save(out_path.as_posix(), format="PNG")
+
+
+def default_workers(n_items: int) -> int:
+  return max(1, min(n_items, os.cpu_count() or 1, 8))
+
+
+def render_parallel(
+  work: Callable[[T], R], items: Sequence[T], workers: Optional[int] = None
+) -> List[R]:
+  """`work` over `items` on a thread pool; Pillow releases the GIL to resize and encode."""
+  size = workers if workers and workers > 0 else default_workers(len(items))
+  if size <= 1 or len(items) <= 1:
+    return [work(item) for item in items]
+  with ThreadPoolExecutor(max_workers=size, thread_name_prefix="layoutscribe-render") as ex:
+    return list(ex.map(work, items))
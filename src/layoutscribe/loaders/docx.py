@@ -1,17 +1,61 @@
-"""DOCX page rendering via python-docx and Pillow (approximate).
+"""DOCX page rendering via python-docx and Pillow.
 
-For MVP, we approximate page rendering by laying out paragraphs onto a
-blank canvas using a default font. This is a placeholder and will be
-iterated for fidelity.
+Responsibilities:
+- Paginate the document body onto fixed-size pages taken from its sections
+  (size and margins): paragraphs with style-derived size, weight,
+  alignment, indents, spacing and list markers; tables on their column
+  grid, with horizontal and vertical cell merges; inline pictures;
+  explicit page and section breaks.
+- Draw each section's header and footer text on its pages.
+- Yield pages one at a time as they are laid out, rasterizing only the
+  pages selected and stopping after the last one, so large documents
+  stream into the vision stage without being laid out in full.
+
+Floating (anchored) objects are placed inline, table rows taller than a
+page are clipped, the content of a vertically merged cell sizes its first
+row only, and fields show their cached text.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from ._raster import (
+  BLACK,
+  Line,
+  Op,
+  Picture,
+  Rect,
+  TextLine,
+  TextPara,
+  TextStyle,
+  line_height,
+  line_x,
+  para_lines,
+  rasterize,
+  save_png,
+)
 
-from PIL import Image
+_NS = {
+  "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+  "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+  "wp": "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing",
+  "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+_W = "{%s}" % _NS["w"]
+EMU_PER_INCH = 914400
+EMU_PER_PT = 12700
+TWIPS_PER_PT = 20
+_LETTER = (int(8.5 * EMU_PER_INCH), 11 * EMU_PER_INCH)
+_DEFAULT_MARGIN = EMU_PER_INCH
+_DEFAULT_PT = 11.0
+_LIST_INDENT_PT = 18.0
+_CELL_PAD_PT = 4.0
+_GRID_COLOR = (128, 128, 128)
+# Used when a heading style does not set its own size.
+_HEADING_PT = {"Title": 26.0, "Subtitle": 15.0, "Heading 1": 16.0, "Heading 2": 13.0}
 
 
 @dataclass(frozen=True)
@@ -21,33 +65,570 @@ class RenderedDocxPage:
   width_px: int
   height_px: int
   text: str = ""
+  drawings: int = 0
+  images: int = 0
+
+
+@dataclass
+class _Geometry:
+  """Section page box in pixels."""
+
+  width: int
+  height: int
+  left: float
+  right: float
+  top: float
+  bottom: float
+  header_y: float
+  footer_y: float
+  section: Any = None
+
+  @property
+  def content_width(self) -> float:
+    return self.right - self.left
+
+
+@dataclass
+class _Page:
+  index0: int
+  geometry: _Geometry
+  ops: List[Op] = field(default_factory=list)
+  text: List[str] = field(default_factory=list)
+  drawings: int = 0
+  images: int = 0
+
+
+def _xpath(element: Any, path: str) -> List[Any]:
+  from lxml import etree
+
+  return etree._Element.xpath(element, path, namespaces=_NS)
+
+
+def _style_chain(style: Any) -> Iterator[Any]:
+  seen = 0
+  while style is not None and seen < 16:
+    yield style
+    style = style.base_style
+    seen += 1
+
+
+def _from_styles(style: Any, getter: Any) -> Any:
+  for s in _style_chain(style):
+    try:
+      value = getter(s)
+    except Exception:
+      value = None
+    if value is not None:
+      return value
+  return None
+
+
+class _DocStyles:
+  """Document defaults, list formats and per-paragraph style resolution."""
+
+  def __init__(self, document: Any) -> None:
+    self.document = document
+    self.default_pt = _DEFAULT_PT
+    self.default_after_pt = 0.0
+    self._formats: Dict[Tuple[str, str], str] = {}
+    styles = document.styles.element
+    sz = _xpath(styles, "./w:docDefaults/w:rPrDefault/w:rPr/w:sz/@w:val")
+    if sz:
+      self.default_pt = int(sz[0]) / 2
+    after = _xpath(styles, "./w:docDefaults/w:pPrDefault/w:pPr/w:spacing/@w:after")
+    if after:
+      self.default_after_pt = int(after[0]) / TWIPS_PER_PT
+    try:
+      self._numbering = document.part.numbering_part.element
+    except Exception:
+      self._numbering = None
+
+  def list_format(self, num_id: str, level: str) -> str:
+    """`bullet`, `decimal`, ... for a list level; `bullet` when unknown."""
+    key = (num_id, level)
+    if key not in self._formats:
+      fmt = "bullet"
+      if self._numbering is not None:
+        abstract = _xpath(self._numbering, f"./w:num[@w:numId='{num_id}']/w:abstractNumId/@w:val")
+        if abstract:
+          found = _xpath(
+            self._numbering,
+            f"./w:abstractNum[@w:abstractNumId='{abstract[0]}']"
+            f"/w:lvl[@w:ilvl='{level}']/w:numFmt/@w:val",
+          )
+          fmt = found[0] if found else fmt
+      self._formats[key] = fmt
+    return self._formats[key]
+
+
+def _num_props(paragraph: Any) -> Optional[Tuple[str, str]]:
+  """(numId, ilvl) from the paragraph or its style chain; None if not a list item."""
+  candidates = [paragraph._p] + [s.element for s in _style_chain(paragraph.style)]
+  num_id: Optional[str] = None
+  level: Optional[str] = None
+  for element in candidates:
+    if num_id is None:
+      found = _xpath(element, "./w:pPr/w:numPr/w:numId/@w:val")
+      num_id = found[0] if found else None
+    if level is None:
+      found = _xpath(element, "./w:pPr/w:numPr/w:ilvl/@w:val")
+      level = found[0] if found else None
+  if num_id is None or num_id == "0":
+    return None
+  return num_id, level or "0"
+
+
+def _run_color(run: Any) -> Optional[Tuple[int, int, int]]:
+  try:
+    rgb = run.font.color.rgb
+  except Exception:
+    return None
+  return tuple(rgb) if rgb is not None else None  # type: ignore[return-value]
+
+
+class _Paginator:
+  """Lays out body content page by page; finished pages collect in `ready`."""
+
+  def __init__(
+    self,
+    document: Any,
+    dpi: int,
+    temp_dir: Path,
+    selected: Optional[List[int]],
+  ) -> None:
+    self.document = document
+    self.dpi = dpi
+    self.px_per_pt = dpi / 72.0
+    self.temp_dir = temp_dir
+    self.selected = set(selected) if selected else None
+    self.last_page = max(selected) if selected else None
+    self.styles = _DocStyles(document)
+    self.sections = list(document.sections)
+    self.section_index = 0
+    self.ready: List[RenderedDocxPage] = []
+    self.page = _Page(0, self._geometry(0))
+    self.y = self.page.geometry.top
+    self._counters: Dict[Tuple[str, int], int] = {}
+
+  # -- geometry -----------------------------------------------------------
+
+  def _px(self, emu: Any) -> float:
+    return float(emu or 0) * self.dpi / EMU_PER_INCH
+
+  def _geometry(self, index: int) -> _Geometry:
+    section = self.sections[min(index, len(self.sections) - 1)] if self.sections else None
+
+    def _get(name: str, default: int) -> int:
+      value = getattr(section, name, None) if section is not None else None
+      return default if value is None else int(value)
+
+    width = self._px(_get("page_width", _LETTER[0]))
+    height = self._px(_get("page_height", _LETTER[1]))
+    top = self._px(_get("top_margin", _DEFAULT_MARGIN))
+    bottom = height - self._px(_get("bottom_margin", _DEFAULT_MARGIN))
+    return _Geometry(
+      width=int(width),
+      height=int(height),
+      left=self._px(_get("left_margin", _DEFAULT_MARGIN)),
+      right=width - self._px(_get("right_margin", _DEFAULT_MARGIN)),
+      top=top,
+      bottom=max(bottom, top + 1),
+      header_y=self._px(_get("header_distance", EMU_PER_INCH // 2)),
+      footer_y=height - self._px(_get("footer_distance", EMU_PER_INCH // 2)),
+      section=section,
+    )
+
+  @property
+  def done(self) -> bool:
+    return self.last_page is not None and self.page.index0 + 1 > self.last_page
+
+  def _wanted(self, index0: int) -> bool:
+    return self.selected is None or index0 + 1 in self.selected
+
+  def new_page(self) -> None:
+    self._finish(self.page)
+    self.page = _Page(self.page.index0 + 1, self._geometry(self.section_index))
+    self.y = self.page.geometry.top
 
+  def new_section(self) -> None:
+    self.section_index += 1
+    self.new_page()
 
-def render_docx_to_images(path: Path, dpi: int, temp_dir: Path) -> List[RenderedDocxPage]:
+  def close(self) -> None:
+    if self.page.ops or self.page.index0 == 0:
+      self._finish(self.page)
+
+  def _finish(self, page: _Page) -> None:
+    if not self._wanted(page.index0):
+      return
+    geometry = page.geometry
+    ops = self._header_footer_ops(geometry) + page.ops
+    out_path = self.temp_dir / f"page-{page.index0 + 1:04d}.png"
+    save_png(rasterize((geometry.width, geometry.height), ops), out_path)
+    self.ready.append(
+      RenderedDocxPage(
+        index0=page.index0,
+        image_path=out_path,
+        width_px=geometry.width,
+        height_px=geometry.height,
+        text="\n".join(t for t in page.text if t.strip()).strip(),
+        drawings=page.drawings,
+        images=page.images,
+      )
+    )
+
+  def _fits(self, height: float) -> bool:
+    return self.y + height <= self.page.geometry.bottom
+
+  def _ensure(self, height: float) -> None:
+    """Start a new page unless `height` fits (an empty page always accepts)."""
+    if not self._fits(height) and self.y > self.page.geometry.top:
+      self.new_page()
+
+  # -- paragraphs ---------------------------------------------------------
+
+  def _para_style(self, paragraph: Any) -> Tuple[TextStyle, str, float, float, float]:
+    """Style, alignment, left indent, space before and after (px)."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    runs = [r for r in paragraph.runs if r.text.strip()]
+    first = runs[0] if runs else None
+    style = paragraph.style
+    name = getattr(style, "name", "") or ""
+    size = (first.font.size if first is not None else None) or _from_styles(
+      style, lambda s: s.font.size
+    )
+    pt = size.pt if size is not None else _HEADING_PT.get(name, self.styles.default_pt)
+    bold = first.bold if first is not None else None
+    if bold is None:
+      bold = _from_styles(style, lambda s: s.font.bold)
+    if bold is None:
+      bold = name.startswith("Heading") or name == "Title"
+    color = (_run_color(first) if first is not None else None) or _from_styles(
+      style, lambda s: s.font.color.rgb
+    )
+    fmt = paragraph.paragraph_format
+    align = fmt.alignment
+    if align is None:
+      align = _from_styles(style, lambda s: s.paragraph_format.alignment)
+    align_name = {WD_ALIGN_PARAGRAPH.CENTER: "center", WD_ALIGN_PARAGRAPH.RIGHT: "right"}.get(
+      align, "left"
+    )
+    indent = fmt.left_indent
+    if indent is None:
+      indent = _from_styles(style, lambda s: s.paragraph_format.left_indent)
+    before = fmt.space_before
+    if before is None:
+      before = _from_styles(style, lambda s: s.paragraph_format.space_before)
+    after = fmt.space_after
+    if after is None:
+      after = _from_styles(style, lambda s: s.paragraph_format.space_after)
+    if after is not None:
+      after_px = self._px(after)
+    else:
+      after_px = self.styles.default_after_pt * self.px_per_pt
+    text_style = TextStyle(
+      size_px=pt * self.px_per_pt,
+      bold=bool(bold),
+      color=tuple(color) if color is not None else BLACK,  # type: ignore[arg-type]
+    )
+    return text_style, align_name, self._px(indent), self._px(before), after_px
+
+  def _marker(self, paragraph: Any) -> Tuple[str, float]:
+    props = _num_props(paragraph)
+    if props is None:
+      return "", 0.0
+    num_id, level_s = props
+    level = int(level_s) if level_s.isdigit() else 0
+    fmt = self.styles.list_format(num_id, level_s)
+    indent = (level + 1) * _LIST_INDENT_PT * self.px_per_pt
+    if fmt == "bullet":
+      return "•", indent
+    key = (num_id, level)
+    self._counters[key] = self._counters.get(key, 0) + 1
+    for deeper in [k for k in self._counters if k[0] == num_id and k[1] > level]:
+      del self._counters[deeper]
+    n = self._counters[key]
+    if fmt in ("lowerLetter", "upperLetter"):
+      letter = chr(ord("a") + (n - 1) % 26)
+      return f"{letter.upper() if fmt == 'upperLetter' else letter}.", indent
+    return f"{n}.", indent
+
+  def _segments(self, paragraph: Any) -> Tuple[List[str], List[Tuple[int, Any, int, int]]]:
+    """Text split at page breaks, and pictures as (segment, rId, cx, cy)."""
+    segments = [""]
+    pictures: List[Tuple[int, Any, int, int]] = []
+    for run in _xpath(paragraph._p, ".//w:r"):
+      for child in run:
+        tag = child.tag
+        if tag == _W + "t":
+          segments[-1] += child.text or ""
+        elif tag == _W + "tab":
+          segments[-1] += " "
+        elif tag in (_W + "br", _W + "cr"):
+          if child.get(_W + "type") == "page":
+            segments.append("")
+          else:
+            segments[-1] += "\n"
+        elif tag == _W + "drawing":
+          blip = _xpath(child, ".//a:blip/@r:embed")
+          extent = _xpath(child, "./*/wp:extent")
+          if blip and extent:
+            cx, cy = int(extent[0].get("cx", 0)), int(extent[0].get("cy", 0))
+            pictures.append((len(segments) - 1, blip[0], cx, cy))
+    return segments, pictures
+
+  def paragraph(self, paragraph: Any, box: Optional[Tuple[float, float]] = None) -> float:
+    """Lay out a body paragraph (or, with `box=(x0, width)`, a cell paragraph).
+
+    Body paragraphs break across pages; cell paragraphs return their height
+    and append ops without paging (the caller places the row).
+    """
+    style, align, indent, before, after = self._para_style(paragraph)
+    bullet, list_indent = self._marker(paragraph)
+    segments, pictures = self._segments(paragraph)
+    in_cell = box is not None
+    geometry = self.page.geometry
+    x0, width = box if box is not None else (geometry.left, geometry.content_width)
+    para = TextPara(
+      text="",
+      style=style,
+      align=align,
+      indent_px=indent + list_indent,
+      bullet=bullet,
+    )
+    if not in_cell and _breaks_before(paragraph):
+      self.new_page()
+    start_y = self.y
+    if before and not in_cell and self.y > self.page.geometry.top:
+      self.y += before
+    lh = line_height(style)
+    for number, segment in enumerate(segments):
+      if number > 0 and not in_cell:
+        self.new_page()
+      text = segment.strip("\n") if segment.strip() else ""
+      lines: List[str] = []
+      if text:
+        lines = para_lines(TextPara(text, style, align, para.indent_px, bullet), width)
+      for line in lines:
+        if not in_cell:
+          self._ensure(lh)
+          self.page.text.append(line)
+        x = line_x(para, line, x0, width)
+        self.page.ops.append(TextLine(x, self.y, line, style))
+        self.y += lh
+        bullet = ""  # only the first line carries the marker
+      for seg, rid, cx, cy in pictures:
+        if seg == number:
+          self._picture(rid, cx, cy, x0, width, align, in_cell)
+    if not pictures and not any(s.strip() for s in segments):
+      self.y += lh  # empty paragraphs still take a line
+    self.y += after
+    return self.y - start_y
+
+  def _picture(
+    self, rid: str, cx: int, cy: int, x0: float, width: float, align: str, in_cell: bool
+  ) -> None:
+    try:
+      blob = self.document.part.related_parts[rid].blob
+    except Exception:
+      return
+    w, h = self._px(cx), self._px(cy)
+    geometry = self.page.geometry
+    limit_h = geometry.bottom - geometry.top
+    scale = min(1.0, width / w if w else 1.0, limit_h / h if h else 1.0)
+    w, h = w * scale, h * scale
+    if not in_cell:
+      self._ensure(h)
+    x = x0 + (width - w) / 2 if align == "center" else x0
+    self.page.ops.append(Picture((x, self.y, x + w, self.y + h), blob))
+    self.page.images += 1
+    self.y += h
+
+  # -- tables -------------------------------------------------------------
+
+  def table(self, table: Any) -> None:
+    from docx.table import _Cell
+
+    geometry = self.page.geometry
+    grid = [int(w) for w in _xpath(table._tbl, "./w:tblGrid/w:gridCol/@w:w")]
+    if grid and sum(grid):
+      widths = [g * self.dpi / (72 * TWIPS_PER_PT) for g in grid]
+      if sum(widths) > geometry.content_width:
+        widths = [w * geometry.content_width / sum(widths) for w in widths]
+    else:
+      n = max(len(table.columns), 1)
+      widths = [geometry.content_width / n] * n
+    xs = [geometry.left]
+    for w in widths:
+      xs.append(xs[-1] + w)
+    pad = _CELL_PAD_PT * self.px_per_pt
+
+    # (cell, first column, span, continues a vertical merge) per row.
+    rows: List[List[Tuple[Any, int, int, bool]]] = []
+    row_heights: List[float] = []
+    for row in table.rows:
+      cells: List[Tuple[Any, int, int, bool]] = []
+      start = 0
+      for tc in _xpath(row._tr, "./w:tc"):
+        if start >= len(widths):
+          break
+        span = _xpath(tc, "./w:tcPr/w:gridSpan/@w:val")
+        merge = _xpath(tc, "./w:tcPr/w:vMerge")
+        continued = bool(merge) and merge[0].get(f"{{{_NS['w']}}}val") in (None, "continue")
+        cells.append((_Cell(tc, table), start, int(span[0]) if span else 1, continued))
+        start += cells[-1][2]
+      # Measure on a scratch page; a continuation cell has no content of its own.
+      heights = []
+      for cell, start, span, continued in cells:
+        if not continued:
+          cell_x0 = xs[start] + pad
+          cell_w = xs[min(start + span, len(xs) - 1)] - xs[start] - 2 * pad
+          heights.append(self._measure_cell(cell, cell_x0, max(cell_w, 1.0)))
+      rows.append(cells)
+      row_heights.append(max(heights + [0.0]) + 2 * pad)
+
+    page_before: Optional[_Page] = None
+    for r, (cells, row_h) in enumerate(zip(rows, row_heights)):
+      self._ensure(row_h)
+      top = self.y
+      # Borders between the parts of a merged cell are left out, unless a
+      # page break separates them.
+      joined_above = self.page is page_before
+      bottom_y = self.page.geometry.bottom
+      merged_below: Set[int] = set()
+      if r + 1 < len(rows) and top + row_h + row_heights[r + 1] <= bottom_y:
+        merged_below = {start for _, start, _, continued in rows[r + 1] if continued}
+      row_text: List[str] = []
+      for cell, start, span, continued in cells:
+        x0 = xs[start]
+        x1 = xs[min(start + span, len(xs) - 1)]
+        self._cell_frame(
+          (x0, top, x1, top + row_h),
+          top=not (continued and joined_above),
+          bottom=start not in merged_below,
+        )
+        if continued:
+          row_text.append("")
+          continue
+        self.y = top + pad
+        for paragraph in cell.paragraphs:
+          self.paragraph(paragraph, box=(x0 + pad, max(x1 - x0 - 2 * pad, 1.0)))
+        row_text.append(cell.text)
+      self.page.text.append("\t".join(row_text))
+      self.y = top + row_h
+      page_before = self.page
+    self.y += _CELL_PAD_PT * self.px_per_pt
+
+  def _cell_frame(self, box: Tuple[float, float, float, float], top: bool, bottom: bool) -> None:
+    x0, y0, x1, y1 = box
+    if top and bottom:
+      self.page.ops.append(Rect(box, outline=_GRID_COLOR))
+    else:
+      sides = [((x0, y0), (x0, y1)), ((x1, y0), (x1, y1))]
+      if top:
+        sides.append(((x0, y0), (x1, y0)))
+      if bottom:
+        sides.append(((x0, y1), (x1, y1)))
+      self.page.ops.extend(Line(points, _GRID_COLOR) for points in sides)
+    self.page.drawings += 1
+
+  def _measure_cell(self, cell: Any, x0: float, width: float) -> float:
+    saved_ops, saved_y, saved_images = self.page.ops, self.y, self.page.images
+    saved_counters = dict(self._counters)
+    self.page.ops, self.y = [], 0.0
+    try:
+      for paragraph in cell.paragraphs:
+        self.paragraph(paragraph, box=(x0, width))
+      return self.y
+    finally:
+      self.page.ops, self.y, self.page.images = saved_ops, saved_y, saved_images
+      self._counters = saved_counters
+
+  # -- header / footer ----------------------------------------------------
+
+  def _header_footer_ops(self, geometry: _Geometry) -> List[Op]:
+    section = geometry.section
+    if section is None:
+      return []
+    ops: List[Op] = []
+    for part, at_top in ((section.header, True), (section.footer, False)):
+      try:
+        paragraphs = [p for p in part.paragraphs if p.text.strip()]
+      except Exception:
+        continue
+      if not paragraphs:
+        continue
+      placed: List[Tuple[TextPara, List[str]]] = []
+      for p in paragraphs:
+        style, align, indent, _, _ = self._para_style(p)
+        tp = TextPara(p.text, style, align, indent)
+        placed.append((tp, para_lines(tp, geometry.content_width)))
+      total = sum(len(lines) * line_height(tp.style) for tp, lines in placed)
+      y = geometry.header_y if at_top else geometry.footer_y - total
+      for tp, lines in placed:
+        for line in lines:
+          x = line_x(tp, line, geometry.left, geometry.content_width)
+          ops.append(TextLine(x, y, line, tp.style))
+          y += line_height(tp.style)
+    return ops
+
+
+def _breaks_before(paragraph: Any) -> bool:
+  try:
+    return bool(paragraph.paragraph_format.page_break_before)
+  except Exception:
+    return False
+
+
+def _body_items(document: Any) -> Iterator[Any]:
+  """Paragraphs and tables in body order (content controls unwrapped)."""
+  from docx.table import Table
+  from docx.text.paragraph import Paragraph
+
+  def _walk(element: Any) -> Iterator[Any]:
+    for child in element.iterchildren():
+      if child.tag == _W + "p":
+        yield Paragraph(child, document._body)
+      elif child.tag == _W + "tbl":
+        yield Table(child, document._body)
+      elif child.tag == _W + "sdt":
+        for content in _xpath(child, "./w:sdtContent"):
+          yield from _walk(content)
+
+  yield from _walk(document.element.body)
+
+
+def render_docx_pages(
+  path: Path, dpi: int, temp_dir: Path, selected_pages: Optional[List[int]] = None
+) -> Iterator[RenderedDocxPage]:
+  """Lay out a DOCX onto pages and yield each rendered page as it is finished.
+
+  selected_pages: 1-based pages to rasterize; layout stops after the last one.
+  """
   try:
     import docx  # python-docx
   except Exception as exc:  # pragma: no cover
     raise RuntimeError("python-docx is required to handle DOCX files") from exc
 
   document = docx.Document(path.as_posix())
-  paragraphs = [p.text for p in document.paragraphs if p.text]
-  doc_text = "\n".join(paragraphs).strip()
-
-  # Placeholder: render single-page white image sized to A4 at given DPI
-  # A4: 8.27 x 11.69 inches
-  width_px = int(8.27 * dpi)
-  height_px = int(11.69 * dpi)
-  img = Image.new("RGB", (width_px, height_px), color=(255, 255, 255))
-  out_path = temp_dir / "page-0001.png"
-  img.save(out_path.as_posix(), format="PNG")
-  return [
-    RenderedDocxPage(
-      index0=0,
-      image_path=out_path,
-      width_px=width_px,
-      height_px=height_px,
-      text=doc_text,
-    )
-  ]
+  pager = _Paginator(document, dpi, temp_dir, selected_pages)
+  for item in _body_items(document):
+    if hasattr(item, "rows"):
+      pager.table(item)
+    else:
+      pager.paragraph(item)
+      if _xpath(item._p, "./w:pPr/w:sectPr"):
+        pager.new_section()
+    yield from pager.ready
+    pager.ready.clear()
+    if pager.done:
+      return
+  pager.close()
+  yield from pager.ready
 
 
+def render_docx_to_images(
+  path: Path, dpi: int, temp_dir: Path, selected_pages: Optional[List[int]] = None
+) -> List[RenderedDocxPage]:
+  return list(render_docx_pages(path, dpi, temp_dir, selected_pages))
@@ -1,19 +1,80 @@
 """PPTX slide rendering via python-pptx and Pillow.
 
-Renders each slide to a PNG using python-pptx to extract shapes and a
-simple rasterization approach. For MVP, we snapshot the slide by saving
-the slide as an image using Pillow drawing; fidelity will be improved
-iteratively.
+Responsibilities:
+- Rasterize slides at shape level: backgrounds (solid, gradient, picture),
+  filled and outlined auto shapes, text frames, pictures, tables, lines and
+  groups, with theme colors resolved from the slide master.
+- Render each layout's background and master/layout decorations once and
+  reuse the image for every slide on that layout.
+- Render only the selected slides, on a thread pool: shapes are read
+  sequentially into display lists, pixels are drawn and encoded in parallel.
+
+Rotation, charts (drawn as a framed area with their title), text effects
+and non-raster pictures (EMF/WMF/SVG, drawn as gray boxes) are approximated.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from PIL import Image
 
+from ._raster import (
+  BLACK,
+  WHITE,
+  Color,
+  Line,
+  Op,
+  Picture,
+  Rect,
+  TextFrame,
+  TextPara,
+  TextStyle,
+  draw_ops,
+  rasterize,
+  render_parallel,
+  save_png,
+)
+
+_NS = {
+  "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+  "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+  "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+EMU_PER_INCH = 914400
+EMU_PER_PT = 12700
+_DEFAULT_INSETS = (91440, 45720, 91440, 45720)  # left, top, right, bottom (EMU)
+_GRID_COLOR: Color = (128, 128, 128)
+_CHART_FRAME: Color = (160, 160, 160)
+
+# MSO_THEME_COLOR names and scheme-color values → `a:clrScheme` slots.
+_THEME_SLOTS = {
+  "TEXT_1": "dk1",
+  "DARK_1": "dk1",
+  "BACKGROUND_1": "lt1",
+  "LIGHT_1": "lt1",
+  "TEXT_2": "dk2",
+  "DARK_2": "dk2",
+  "BACKGROUND_2": "lt2",
+  "LIGHT_2": "lt2",
+  "HYPERLINK": "hlink",
+  "FOLLOWED_HYPERLINK": "folHlink",
+  "tx1": "dk1",
+  "bg1": "lt1",
+  "tx2": "dk2",
+  "bg2": "lt2",
+  **{f"ACCENT_{i}": f"accent{i}" for i in range(1, 7)},
+}
+_DEFAULT_THEME: Dict[str, Color] = {"dk1": BLACK, "lt1": WHITE, "accent1": (68, 114, 196)}
+
+# Point sizes for placeholders whose size comes from the master text styles.
+_PLACEHOLDER_PT = {"TITLE": 40, "CENTER_TITLE": 48, "VERTICAL_TITLE": 40, "SUBTITLE": 24}
+_BODY_PT_BY_LEVEL = (28, 24, 20, 18, 18)
+_DEFAULT_PT = 18
+_BULLETED_PLACEHOLDERS = ("BODY", "OBJECT", "VERTICAL_BODY", "VERTICAL_OBJECT")
+
 
 @dataclass(frozen=True)
 class RenderedSlide:
@@ -22,41 +83,507 @@ class RenderedSlide:
   width_px: int
   height_px: int
   text: str = ""
+  drawings: int = 0
+  images: int = 0
+
+
+@dataclass(frozen=True)
+class _Transform:
+  """EMU → pixel mapping; groups compose their child offsets into it."""
+
+  sx: float
+  sy: float
+  dx: float = 0.0
+  dy: float = 0.0
+
+  def point(self, x: float, y: float) -> Tuple[float, float]:
+    return x * self.sx + self.dx, y * self.sy + self.dy
+
+  def box(self, left: Any, top: Any, width: Any, height: Any) -> Tuple[float, ...]:
+    x0, y0 = self.point(left or 0, top or 0)
+    x1, y1 = self.point((left or 0) + (width or 0), (top or 0) + (height or 0))
+    return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+
+@dataclass
+class _SlideJob:
+  index0: int
+  base_key: Tuple[str, ...]
+  ops: List[Op]
+  out_path: Path
+
+
+class _Palette:
+  """Theme colors of a slide master, plus color/fill resolution."""
+
+  def __init__(self, master: Any) -> None:
+    self.theme = dict(_DEFAULT_THEME)
+    try:
+      from lxml import etree
+      from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+      root = etree.fromstring(master.part.part_related_by(RT.THEME).blob)
+      for slot in _xpath(root, "//a:themeElements/a:clrScheme/*"):
+        name = etree.QName(slot).localname
+        value = _xpath(slot, "./a:srgbClr/@val | ./a:sysClr/@lastClr")
+        if value:
+          self.theme[name] = _hex(value[0])
+    except Exception:
+      pass
+
+  def scheme(self, name: str) -> Optional[Color]:
+    return self.theme.get(_THEME_SLOTS.get(name, name))
+
+  def color(self, fmt: Any, default: Optional[Color] = None) -> Optional[Color]:
+    from pptx.enum.dml import MSO_COLOR_TYPE
+
+    try:
+      if fmt.type == MSO_COLOR_TYPE.RGB:
+        base: Optional[Color] = tuple(fmt.rgb)  # type: ignore[assignment]
+      elif fmt.type == MSO_COLOR_TYPE.SCHEME:
+        base = self.scheme(fmt.theme_color.name)
+      else:
+        return default
+      brightness = fmt.brightness or 0.0
+    except Exception:
+      return default
+    return _brighten(base, brightness) if base is not None else default
+
+  def fill(self, fill: Any) -> Optional[Color]:
+    """Solid color of a fill (first gradient stop for gradients), else None."""
+    from pptx.enum.dml import MSO_FILL
+
+    try:
+      if fill.type == MSO_FILL.SOLID:
+        return self.color(fill.fore_color)
+      if fill.type == MSO_FILL.GRADIENT:
+        stops = list(fill.gradient_stops)
+        return self.color(stops[0].color) if stops else None
+    except Exception:
+      return None
+    return None
+
+  def style_ref(self, element: Any, ref: str) -> Optional[Color]:
+    """Theme color from a shape's `p:style` reference (default shape styling)."""
+    found = _xpath(element, f"./p:style/a:{ref}")
+    if not found or found[0].get("idx") == "0":
+      return None
+    scheme = _xpath(found[0], "./a:schemeClr/@val")
+    return self.scheme(scheme[0]) if scheme else None
+
+
+def _xpath(element: Any, path: str) -> List[Any]:
+  from lxml import etree
+
+  return etree._Element.xpath(element, path, namespaces=_NS)
+
+
+def _hex(value: str) -> Color:
+  value = value.strip().lstrip("#")
+  return (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16))
+
+
+def _brighten(color: Color, brightness: float) -> Color:
+  if brightness > 0:
+    return tuple(int(c + (255 - c) * brightness) for c in color)  # type: ignore[return-value]
+  if brightness < 0:
+    return tuple(int(c * (1 + brightness)) for c in color)  # type: ignore[return-value]
+  return color
+
+
+def _background_owner(slide: Any) -> Any:
+  """The slide, layout or master whose `p:bg` applies to `slide`."""
+  for owner in (slide, slide.slide_layout, slide.slide_layout.slide_master):
+    if _xpath(owner._element, "./p:cSld/p:bg"):
+      return owner
+  return None
+
+
+def _background_ops(owner: Any, palette: _Palette, size: Tuple[int, int]) -> List[Op]:
+  full = (0.0, 0.0, float(size[0]), float(size[1]))
+  white = [Rect(full, fill=palette.scheme("lt1") or WHITE)]
+  if owner is None:
+    return white
+  blip = _xpath(owner._element, "./p:cSld/p:bg/p:bgPr/a:blipFill/a:blip/@r:embed")
+  if blip:
+    try:
+      return white + [Picture(full, owner.part.related_part(blip[0]).blob)]
+    except Exception:
+      return white
+  ref = _xpath(owner._element, "./p:cSld/p:bg/p:bgRef/a:schemeClr/@val")
+  if ref:
+    return [Rect(full, fill=palette.scheme(ref[0]) or WHITE)]
+  color = palette.fill(owner.background.fill)
+  return [Rect(full, fill=color)] if color else white
+
+
+def _shows_master_shapes(owner: Any) -> bool:
+  return owner._element.get("showMasterSp") not in ("0", "false")
+
 
+def _inset_box(frame: Any, box: Tuple[float, ...], t: _Transform) -> Tuple[float, ...]:
+  insets = []
+  for name, default in zip(("left", "top", "right", "bottom"), _DEFAULT_INSETS):
+    value = getattr(frame, f"margin_{name}", None)
+    insets.append(default if value is None else value)
+  left, top, right, bottom = insets
+  return (
+    box[0] + left * t.sx,
+    box[1] + top * t.sy,
+    max(box[2] - right * t.sx, box[0] + left * t.sx + 1),
+    max(box[3] - bottom * t.sy, box[1] + top * t.sy + 1),
+  )
 
-def render_pptx_to_images(path: Path, dpi: int, temp_dir: Path) -> List[RenderedSlide]:
+
+def _placeholder_kind(shape: Any) -> str:
+  try:
+    return shape.placeholder_format.type.name if shape.is_placeholder else ""
+  except Exception:
+    return ""
+
+
+def _paragraphs(
+  frame: Any,
+  palette: _Palette,
+  px_per_pt: float,
+  kind: str = "",
+  text_color: Optional[Color] = None,
+  default_pt: Optional[float] = None,
+  centered: bool = False,
+) -> Tuple[TextPara, ...]:
+  from pptx.enum.text import PP_ALIGN
+
+  paras: List[TextPara] = []
+  numbering: Dict[int, int] = {}
+  for paragraph in frame.paragraphs:
+    text = "".join(run.text for run in paragraph.runs) if paragraph.runs else paragraph.text
+    level = paragraph.level or 0
+    run_font = paragraph.runs[0].font if paragraph.runs else None
+    size = (run_font.size if run_font is not None else None) or paragraph.font.size
+    if size is not None:
+      pt = size.pt
+    elif default_pt is not None:
+      pt = default_pt
+    elif kind in _PLACEHOLDER_PT:
+      pt = _PLACEHOLDER_PT[kind]
+    elif kind in _BULLETED_PLACEHOLDERS:
+      pt = _BODY_PT_BY_LEVEL[min(level, len(_BODY_PT_BY_LEVEL) - 1)]
+    else:
+      pt = _DEFAULT_PT
+    bold = bool((run_font is not None and run_font.bold) or paragraph.font.bold)
+    color = palette.color(run_font.color, None) if run_font is not None else None
+    color = color or palette.color(paragraph.font.color, None) or text_color
+    color = color or palette.scheme("tx1") or BLACK
+
+    ppr = paragraph._p.pPr
+    bullet = ""
+    if ppr is not None and _xpath(ppr, "./a:buChar"):
+      bullet = _xpath(ppr, "./a:buChar/@char")[0]
+    elif ppr is not None and _xpath(ppr, "./a:buAutoNum"):
+      numbering[level] = numbering.get(level, 0) + 1
+      bullet = f"{numbering[level]}."
+    elif kind in _BULLETED_PLACEHOLDERS and text and not (
+      ppr is not None and _xpath(ppr, "./a:buNone")
+    ):
+      bullet = "•"
+
+    align = paragraph.alignment
+    if align is None:
+      centered = centered or kind in ("CENTER_TITLE", "SUBTITLE")
+      align = PP_ALIGN.CENTER if centered else PP_ALIGN.LEFT
+    paras.append(
+      TextPara(
+        text=text,
+        style=TextStyle(size_px=pt * px_per_pt, bold=bold, color=color),
+        align={PP_ALIGN.CENTER: "center", PP_ALIGN.RIGHT: "right"}.get(align, "left"),
+        indent_px=level * 0.375 * 72 * px_per_pt,
+        bullet=bullet,
+        space_after_px=0.2 * pt * px_per_pt if bullet else 0.0,
+      )
+    )
+  return tuple(paras)
+
+
+def _text_frame_op(
+  shape: Any,
+  box: Tuple[float, ...],
+  t: _Transform,
+  palette: _Palette,
+  px_per_pt: float,
+  text_color: Optional[Color] = None,
+  auto_shape: bool = False,
+) -> Optional[TextFrame]:
+  """Text of a shape; auto shapes center their text like PowerPoint's defaults."""
+  from pptx.enum.text import MSO_ANCHOR
+
+  frame = shape.text_frame
+  if not frame.text.strip():
+    return None
+  kind = _placeholder_kind(shape)
+  anchor = {MSO_ANCHOR.MIDDLE: "middle", MSO_ANCHOR.BOTTOM: "bottom", MSO_ANCHOR.TOP: "top"}.get(
+    frame.vertical_anchor, "middle" if "TITLE" in kind or auto_shape else "top"
+  )
+  return TextFrame(
+    box=_inset_box(frame, box, t),
+    paras=_paragraphs(frame, palette, px_per_pt, kind, text_color, centered=auto_shape),
+    anchor=anchor,
+    wrap=frame.word_wrap is not False,
+  )
+
+
+def _table_ops(
+  shape: Any, box: Tuple[float, ...], t: _Transform, palette: _Palette, px_per_pt: float
+) -> Tuple[List[Op], List[str]]:
+  table = shape.table
+  xs = [box[0]]
+  for column in table.columns:
+    xs.append(xs[-1] + column.width * t.sx)
+  ys = [box[1]]
+  for row in table.rows:
+    ys.append(ys[-1] + row.height * t.sy)
+  header = palette.scheme("accent1") if table.first_row else None
+  ops: List[Op] = []
+  text_rows: List[str] = []
+  for r, row in enumerate(table.rows):
+    cells_text: List[str] = []
+    for c, cell in enumerate(row.cells):
+      cells_text.append(cell.text)
+      if cell.is_spanned:
+        continue
+      span_w = cell.span_width if cell.is_merge_origin else 1
+      span_h = cell.span_height if cell.is_merge_origin else 1
+      cell_box = (xs[c], ys[r], xs[min(c + span_w, len(xs) - 1)], ys[min(r + span_h, len(ys) - 1)])
+      fill = palette.fill(cell.fill) or (header if r == 0 else None)
+      ops.append(Rect(cell_box, fill=fill, outline=_GRID_COLOR, width=1))
+      if cell.text.strip():
+        text_color = WHITE if r == 0 and header is not None and fill == header else None
+        ops.append(
+          TextFrame(
+            box=_inset_box(cell, cell_box, t),
+            paras=_paragraphs(cell.text_frame, palette, px_per_pt, "", text_color, _DEFAULT_PT),
+          )
+        )
+    text_rows.append("\t".join(cells_text))
+  return ops, text_rows
+
+
+def _group_transform(group: Any, t: _Transform) -> _Transform:
+  xfrm = _xpath(group._element, "./p:grpSpPr/a:xfrm")
+  if not xfrm:
+    return t
+  x = xfrm[0]
+
+  def _pair(tag: str, a: str, b: str) -> Optional[Tuple[int, int]]:
+    node = _xpath(x, f"./a:{tag}")
+    return (int(node[0].get(a)), int(node[0].get(b))) if node else None
+
+  off, ext = _pair("off", "x", "y"), _pair("ext", "cx", "cy")
+  ch_off, ch_ext = _pair("chOff", "x", "y"), _pair("chExt", "cx", "cy")
+  if not (off and ext and ch_off and ch_ext) or not ch_ext[0] or not ch_ext[1]:
+    return t
+  kx, ky = ext[0] / ch_ext[0], ext[1] / ch_ext[1]
+  return _Transform(
+    sx=t.sx * kx,
+    sy=t.sy * ky,
+    dx=t.sx * (off[0] - ch_off[0] * kx) + t.dx,
+    dy=t.sy * (off[1] - ch_off[1] * ky) + t.dy,
+  )
+
+
+class _Collector:
+  """Walks shapes into display-list ops, text and scheduling signals."""
+
+  def __init__(self, palette: _Palette, px_per_pt: float) -> None:
+    self.palette = palette
+    self.px_per_pt = px_per_pt
+    self.ops: List[Op] = []
+    self.text: List[str] = []
+    self.drawings = 0
+    self.images = 0
+
+  def shapes(self, shapes: Sequence[Any], t: _Transform, placeholders: bool = True) -> None:
+    for shape in shapes:
+      if not placeholders and getattr(shape, "is_placeholder", False):
+        continue  # layout/master placeholders are prompts, not content
+      try:
+        self.shape(shape, t)
+      except Exception:
+        continue  # one unreadable shape must not blank the slide
+
+  def shape(self, shape: Any, t: _Transform) -> None:
+    from pptx.enum.shapes import MSO_SHAPE, MSO_SHAPE_TYPE
+
+    palette = self.palette
+    if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+      self.shapes(shape.shapes, _group_transform(shape, t))
+      return
+    if hasattr(shape, "begin_x"):  # connector
+      color = palette.color(shape.line.color) or palette.style_ref(shape._element, "lnRef")
+      width = max(int((shape.line.width or EMU_PER_PT) * t.sx), 1)
+      points = (t.point(shape.begin_x, shape.begin_y), t.point(shape.end_x, shape.end_y))
+      self.ops.append(Line(points, color=color or BLACK, width=width))
+      self.drawings += 1
+      return
+
+    box = t.box(shape.left, shape.top, shape.width, shape.height)
+    if getattr(shape, "has_table", False) and shape.has_table:
+      ops, rows = _table_ops(shape, box, t, palette, self.px_per_pt)
+      self.ops.extend(ops)
+      self.text.append("\n".join(rows))
+      self.drawings += len(ops)
+      return
+    if getattr(shape, "has_chart", False) and shape.has_chart:
+      self.ops.append(Rect(box, outline=_CHART_FRAME, width=2))
+      chart = shape.chart
+      if chart.has_title and chart.chart_title.has_text_frame:
+        title = chart.chart_title.text_frame.text
+        if title.strip():
+          self.ops.append(
+            TextFrame(
+              box=box,
+              paras=(
+                TextPara(title, TextStyle(_DEFAULT_PT * self.px_per_pt, True), align="center"),
+              ),
+            )
+          )
+          self.text.append(title)
+      self.drawings += 1
+      return
+    image = None
+    try:
+      image = shape.image
+    except Exception:
+      pass
+    if image is not None:
+      crop = tuple(
+        float(getattr(shape, f"crop_{side}", 0.0) or 0.0)
+        for side in ("left", "top", "right", "bottom")
+      )
+      self.ops.append(Picture(box, image.blob, crop))  # type: ignore[arg-type]
+      self.images += 1
+      return
+
+    element = shape._element
+    fill = palette.fill(shape.fill) if hasattr(shape, "fill") else None
+    if fill is None and shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
+      fill = palette.style_ref(element, "fillRef")
+      if _xpath(element, "./p:spPr/a:noFill"):
+        fill = None
+    outline = None
+    outline_width = 1
+    line = getattr(shape, "line", None)
+    if line is not None and not _xpath(element, "./p:spPr/a:ln/a:noFill"):
+      outline = palette.fill(line.fill) if line.fill.type is not None else None
+      if outline is None and shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
+        outline = palette.style_ref(element, "lnRef")
+      outline_width = max(int((line.width or EMU_PER_PT) * t.sx), 1)
+    if fill is not None or outline is not None:
+      geometry = "rect"
+      try:
+        auto = shape.auto_shape_type
+        geometry = {MSO_SHAPE.OVAL: "ellipse", MSO_SHAPE.ROUNDED_RECTANGLE: "rounded"}.get(
+          auto, "rect"
+        )
+      except Exception:
+        pass
+      self.ops.append(Rect(box, fill=fill, outline=outline, width=outline_width, geometry=geometry))
+      self.drawings += 1
+
+    if getattr(shape, "has_text_frame", False) and shape.has_text_frame:
+      text_color = palette.style_ref(element, "fontRef") if fill is not None else None
+      op = _text_frame_op(
+        shape,
+        box,
+        t,
+        palette,
+        self.px_per_pt,
+        text_color=text_color,
+        auto_shape=shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE,
+      )
+      if op is not None:
+        self.ops.append(op)
+        self.text.append(shape.text_frame.text)
+
+
+def render_pptx_to_images(
+  path: Path,
+  dpi: int,
+  temp_dir: Path,
+  selected_pages: Optional[List[int]] = None,
+  workers: Optional[int] = None,
+) -> List[RenderedSlide]:
+  """Render slides of a PPTX into PNG images at the given DPI.
+
+  selected_pages: 1-based slide numbers to render; if None, render all.
+  workers: rendering threads (default: up to 8, bounded by CPU count).
+  """
   try:
     from pptx import Presentation
   except Exception as exc:  # pragma: no cover
     raise RuntimeError("python-pptx is required to handle PPTX files") from exc
 
   prs = Presentation(path.as_posix())
-  rendered: List[RenderedSlide] = []
-  for i, slide in enumerate(prs.slides):
-    # Approximate size using slide width/height in EMUs, convert to pixels via DPI
-    # 1 inch = 914400 EMUs
-    emu_per_inch = 914400
-    w_in = prs.slide_width / emu_per_inch
-    h_in = prs.slide_height / emu_per_inch
-    width_px = int(w_in * dpi)
-    height_px = int(h_in * dpi)
-    # Placeholder: blank image; actual rasterization would draw shapes/text
-    img = Image.new("RGB", (width_px, height_px), color=(255, 255, 255))
-    out_path = temp_dir / f"slide-{i+1:04d}.png"
-    img.save(out_path.as_posix(), format="PNG")
-    slide_text_parts: List[str] = []
-    for shape in slide.shapes:
-      if hasattr(shape, "text") and shape.text:
-        slide_text_parts.append(shape.text)
-    rendered.append(
-      RenderedSlide(
-        index0=i,
-        image_path=out_path,
-        width_px=width_px,
-        height_px=height_px,
-        text="\n".join(part.strip() for part in slide_text_parts if part).strip(),
-      )
+  scale = dpi / EMU_PER_INCH
+  px_per_pt = dpi / 72.0
+  size = (int(prs.slide_width * scale), int(prs.slide_height * scale))
+  t = _Transform(scale, scale)
+  slides = list(prs.slides)
+  numbers = (
+    [p for p in selected_pages if 1 <= p <= len(slides)]
+    if selected_pages
+    else range(1, len(slides) + 1)
+  )
+
+  palettes: Dict[int, _Palette] = {}
+  bases: Dict[Tuple[str, ...], List[Op]] = {}
+  jobs: List[_SlideJob] = []
+  results: Dict[int, RenderedSlide] = {}
+  for number in numbers:
+    slide = slides[number - 1]
+    layout = slide.slide_layout
+    master = layout.slide_master
+    palette = palettes.setdefault(id(master), _Palette(master))
+
+    # Background plus master/layout decorations, shared by every slide that
+    # has the same background owner, layout and master-shape visibility.
+    owner = _background_owner(slide)
+    decorated = _shows_master_shapes(slide)
+    base_key = (
+      str(owner.part.partname) if owner is not None else "",
+      str(layout.part.partname),
+      "1" if decorated else "0",
+    )
+    if base_key not in bases:
+      base = _Collector(palette, px_per_pt)
+      base.ops.extend(_background_ops(owner, palette, size))
+      if decorated:
+        if _shows_master_shapes(layout):
+          base.shapes(master.shapes, t, placeholders=False)
+        base.shapes(layout.shapes, t, placeholders=False)
+      bases[base_key] = base.ops
+
+    collector = _Collector(palette, px_per_pt)
+    collector.shapes(slide.shapes, t)
+    out_path = temp_dir / f"slide-{number:04d}.png"
+    jobs.append(_SlideJob(number - 1, base_key, collector.ops, out_path))
+    results[number - 1] = RenderedSlide(
+      index0=number - 1,
+      image_path=out_path,
+      width_px=size[0],
+      height_px=size[1],
+      text="\n".join(part.strip() for part in collector.text if part.strip()).strip(),
+      drawings=collector.drawings,
+      images=collector.images,
     )
-  return rendered
 
+  keys = list(bases)
+  base_images = dict(
+    zip(keys, render_parallel(lambda key: rasterize(size, bases[key]), keys, workers))
+  )
+
+  def _render(job: _SlideJob) -> None:
+    img: Image.Image = base_images[job.base_key].copy()
+    save_png(draw_ops(img, job.ops), job.out_path)
 
+  render_parallel(_render, jobs, workers)
+  return [results[job.index0] for job in jobs]
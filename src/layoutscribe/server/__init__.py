@@ -0,0 +1,6 @@
+"""Long-running server mode.
+
+Submodules:
+- `jobs.py`: job records, queue, and the warm asyncio worker pool
+- `http.py`: stdlib HTTP API for submitting jobs and polling/streaming pages
+"""
@@ -0,0 +1,223 @@
+"""HTTP front end for server mode (stdlib only).
+
+Endpoints:
+- `GET  /health` → `{"status": "ok", "version": ...}`
+- `POST /jobs` → `202 {"id": ..., "status_url": ...}`. Either a JSON body
+  `{"path": "...", "outputs": [...], ...}` (path must live under one of the
+  configured path roots) or a raw upload with `?filename=doc.pdf` and
+  options as query parameters.
+- `GET  /jobs/<id>` → job summary.
+- `GET  /jobs/<id>/pages?since=N&wait=S` → pages finished after the first
+  `N`, long-polling up to `S` seconds.
+- `GET  /jobs/<id>/stream` → NDJSON, one line per page as it finishes and
+  a final status line.
+- `GET  /jobs/<id>/result` → the `ParsedDocument` JSON once done.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .. import __version__
+from .jobs import FINISHED_STATES, JOB_DONE, Job, JobManager
+
+SUPPORTED_SUFFIXES = (".pdf", ".pptx", ".docx")
+# Client-settable `parse` options and their coercions.
+JOB_OPTIONS = {
+  "outputs": lambda v: [o.strip() for o in (v if isinstance(v, list) else str(v).split(",")) if o],
+  "llm": str,
+  "pages_spec": str,
+  "dpi": int,
+  "parallel_pages": int,
+  "budget_usd": float,
+  "deadline_s": float,
+  "page_timeout_s": float,
+  "page_retries": int,
+  "schedule": str,
+  "trim_margins": lambda v: str(v).lower() in {"1", "true", "yes"},
+  "save_overlays": lambda v: str(v).lower() in {"1", "true", "yes"},
+  "save_intermediate": lambda v: str(v).lower() in {"1", "true", "yes"},
+}
+
+
+class BadRequest(Exception):
+  def __init__(self, status: HTTPStatus, message: str) -> None:
+    super().__init__(message)
+    self.status = status
+
+
+class LayoutScribeServer(ThreadingHTTPServer):
+  daemon_threads = True
+
+  def __init__(
+    self,
+    address: Tuple[str, int],
+    manager: JobManager,
+    path_roots: Optional[List[Path]] = None,
+    upload_dir: Optional[Path] = None,
+    max_upload_bytes: int = 200 * 1024 * 1024,
+  ) -> None:
+    super().__init__(address, _Handler)
+    self.manager = manager
+    self.path_roots = [p.resolve() for p in (path_roots or [])]
+    self.upload_dir = upload_dir or Path(tempfile.mkdtemp(prefix="layoutscribe_uploads_"))
+    self.max_upload_bytes = max_upload_bytes
+
+
+def _coerce_options(raw: Dict[str, Any]) -> Dict[str, Any]:
+  options: Dict[str, Any] = {}
+  for key, value in raw.items():
+    if key == "pages":
+      key = "pages_spec"
+    coerce = JOB_OPTIONS.get(key)
+    if coerce is None or value is None:
+      continue
+    try:
+      options[key] = coerce(value)
+    except (TypeError, ValueError) as exc:
+      raise BadRequest(HTTPStatus.BAD_REQUEST, f"invalid value for {key}") from exc
+  return options
+
+
+class _Handler(BaseHTTPRequestHandler):
+  server: LayoutScribeServer
+  protocol_version = "HTTP/1.1"
+
+  def log_message(self, format: str, *args: Any) -> None:
+    return
+
+  def _send_json(self, status: HTTPStatus, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def _job_or_404(self, job_id: str) -> Job:
+    job = self.server.manager.get(job_id)
+    if job is None:
+      raise BadRequest(HTTPStatus.NOT_FOUND, f"unknown job {job_id}")
+    return job
+
+  def do_GET(self) -> None:
+    url = urlparse(self.path)
+    parts = [p for p in url.path.split("/") if p]
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+    try:
+      if parts == ["health"]:
+        self._send_json(HTTPStatus.OK, {"status": "ok", "version": __version__})
+      elif len(parts) == 2 and parts[0] == "jobs":
+        self._send_json(HTTPStatus.OK, self._job_or_404(parts[1]).summary())
+      elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "pages":
+        job = self._job_or_404(parts[1])
+        since = int(query.get("since", 0))
+        pages = job.pages_since(since, wait_s=min(float(query.get("wait", 0)), 60.0))
+        payload = job.summary()
+        payload.update({"pages": pages, "next": since + len(pages)})
+        self._send_json(HTTPStatus.OK, payload)
+      elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "stream":
+        self._stream(self._job_or_404(parts[1]))
+      elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+        job = self._job_or_404(parts[1])
+        summary = job.summary()
+        if summary["status"] == JOB_DONE:
+          self._send_json(HTTPStatus.OK, job.result or {})
+        elif summary["status"] in FINISHED_STATES:
+          self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, summary)
+        else:
+          self._send_json(HTTPStatus.ACCEPTED, summary)
+      else:
+        raise BadRequest(HTTPStatus.NOT_FOUND, "not found")
+    except BadRequest as exc:
+      self._send_json(exc.status, {"error": str(exc)})
+    except ValueError:
+      self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid query parameter"})
+
+  def do_POST(self) -> None:
+    url = urlparse(self.path)
+    try:
+      if url.path.rstrip("/") != "/jobs":
+        raise BadRequest(HTTPStatus.NOT_FOUND, "not found")
+      length = int(self.headers.get("Content-Length") or 0)
+      if length > self.server.max_upload_bytes:
+        raise BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "upload too large")
+      body = self.rfile.read(length)
+      content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip()
+      if content_type == "application/json":
+        payload = json.loads(body or b"{}")
+        if not isinstance(payload, dict):
+          raise BadRequest(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+        job = self._submit_path(payload)
+      else:
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        job = self._submit_upload(body, query)
+      self._send_json(HTTPStatus.ACCEPTED, {"id": job.id, "status_url": f"/jobs/{job.id}"})
+    except BadRequest as exc:
+      self._send_json(exc.status, {"error": str(exc)})
+    except (ValueError, json.JSONDecodeError):
+      self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid request body"})
+
+  def _submit_path(self, payload: Dict[str, Any]) -> Job:
+    raw_path = payload.pop("path", None)
+    if not raw_path:
+      raise BadRequest(HTTPStatus.BAD_REQUEST, "missing 'path'")
+    path = Path(raw_path).resolve()
+    if not any(path.is_relative_to(root) for root in self.server.path_roots):
+      raise BadRequest(HTTPStatus.FORBIDDEN, "path is outside the allowed roots")
+    if not path.is_file() or path.suffix.lower() not in SUPPORTED_SUFFIXES:
+      raise BadRequest(HTTPStatus.BAD_REQUEST, "path is not a supported document")
+    return self.server.manager.submit(path, _coerce_options(payload))
+
+  def _submit_upload(self, body: bytes, query: Dict[str, str]) -> Job:
+    suffix = Path(query.pop("filename", "")).suffix.lower()
+    if suffix not in SUPPORTED_SUFFIXES:
+      raise BadRequest(HTTPStatus.BAD_REQUEST, "filename must end in .pdf, .pptx or .docx")
+    if not body:
+      raise BadRequest(HTTPStatus.BAD_REQUEST, "empty upload")
+    options = _coerce_options(query)
+    dest = self.server.upload_dir / f"{uuid.uuid4().hex}{suffix}"
+    dest.write_bytes(body)
+    return self.server.manager.submit(dest, options, cleanup_path=True)
+
+  def _stream(self, job: Job) -> None:
+    self.send_response(HTTPStatus.OK)
+    self.send_header("Content-Type", "application/x-ndjson")
+    self.send_header("Transfer-Encoding", "chunked")
+    self.end_headers()
+    sent = 0
+    try:
+      while True:
+        pages = job.pages_since(sent, wait_s=1.0)
+        for page in pages:
+          self._write_chunk(json.dumps({"page": page}).encode("utf-8") + b"\n")
+        sent += len(pages)
+        summary = job.summary()
+        if summary["status"] in FINISHED_STATES and summary["pages_done"] == sent:
+          self._write_chunk(json.dumps(summary).encode("utf-8") + b"\n")
+          break
+      self.wfile.write(b"0\r\n\r\n")
+    except (BrokenPipeError, ConnectionResetError):
+      self.close_connection = True
+
+  def _write_chunk(self, data: bytes) -> None:
+    self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+    self.wfile.flush()
+
+
+def make_server(
+  manager: JobManager,
+  host: str = "127.0.0.1",
+  port: int = 8765,
+  path_roots: Optional[List[Path]] = None,
+  upload_dir: Optional[Path] = None,
+) -> LayoutScribeServer:
+  """Create a server bound to `host:port`; the caller starts the manager."""
+  return LayoutScribeServer((host, port), manager, path_roots=path_roots, upload_dir=upload_dir)
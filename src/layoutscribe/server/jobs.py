@@ -0,0 +1,188 @@
+"""Job queue and warm worker pool for server mode.
+
+Responsibilities:
+- Hold submitted parse jobs and their per-page progress.
+- Run a persistent asyncio loop in a background thread with a fixed number
+  of worker coroutines, so imports, the schema validator, LiteLLM's
+  provider clients and the provider semaphore stay warm across jobs.
+- Let HTTP threads poll or block for new pages without touching the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED)
+
+
+@dataclass
+class Job:
+  id: str
+  path: Path
+  options: Dict[str, Any]
+  status: str = JOB_QUEUED
+  pages: List[Dict[str, Any]] = field(default_factory=list)
+  result: Optional[Dict[str, Any]] = None
+  error: Optional[str] = None
+  created_at: float = field(default_factory=time.time)
+  finished_at: Optional[float] = None
+  cleanup_path: bool = False
+  changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+  def summary(self) -> Dict[str, Any]:
+    with self.changed:
+      return {
+        "id": self.id,
+        "status": self.status,
+        "pages_done": len(self.pages),
+        "error": self.error,
+        "created_at": self.created_at,
+        "finished_at": self.finished_at,
+      }
+
+  def pages_since(self, since: int, wait_s: float = 0.0) -> List[Dict[str, Any]]:
+    """Pages completed after the first `since`, optionally waiting for more."""
+    with self.changed:
+      if wait_s > 0 and len(self.pages) <= since and self.status not in FINISHED_STATES:
+        self.changed.wait(timeout=wait_s)
+      return list(self.pages[since:])
+
+  def _add_page(self, page: Dict[str, Any]) -> None:
+    with self.changed:
+      self.pages.append(page)
+      self.changed.notify_all()
+
+  def _set_status(self, status: str, **fields: Any) -> None:
+    with self.changed:
+      self.status = status
+      for key, value in fields.items():
+        setattr(self, key, value)
+      if status in FINISHED_STATES:
+        self.finished_at = time.time()
+      self.changed.notify_all()
+
+
+class JobManager:
+  """Accept jobs from any thread and run them on a warm worker pool."""
+
+  def __init__(
+    self,
+    llm: str,
+    workers: int = 2,
+    provider_concurrency: int = 6,
+    output_root: Optional[Path] = None,
+    max_finished_jobs: int = 1000,
+    defaults: Optional[Dict[str, Any]] = None,
+  ) -> None:
+    self.llm = llm
+    self.workers = workers
+    self.provider_concurrency = provider_concurrency
+    self.output_root = output_root
+    self.max_finished_jobs = max_finished_jobs
+    self.defaults = defaults or {}
+    self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+    self._lock = threading.Lock()
+    self._loop: Optional[asyncio.AbstractEventLoop] = None
+    self._queue: Optional["asyncio.Queue[Job]"] = None
+    self._thread: Optional[threading.Thread] = None
+    self._tasks: List["asyncio.Task[None]"] = []
+    self._ready = threading.Event()
+
+  def start(self) -> None:
+    if self._thread is not None:
+      return
+    self._thread = threading.Thread(target=self._run_loop, name="layoutscribe-jobs", daemon=True)
+    self._thread.start()
+    self._ready.wait()
+
+  def stop(self) -> None:
+    if self._loop is None or self._thread is None:
+      return
+    asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+    self._thread.join(timeout=10)
+    self._thread = None
+
+  async def _shutdown(self) -> None:
+    for task in self._tasks:
+      task.cancel()
+    await asyncio.gather(*self._tasks, return_exceptions=True)
+    asyncio.get_running_loop().stop()
+
+  def submit(
+    self, path: Path, options: Optional[Dict[str, Any]] = None, cleanup_path: bool = False
+  ) -> Job:
+    if self._loop is None or self._queue is None:
+      raise RuntimeError("JobManager is not started")
+    job = Job(
+      id=uuid.uuid4().hex,
+      path=path,
+      options={**self.defaults, **(options or {})},
+      cleanup_path=cleanup_path,
+    )
+    with self._lock:
+      self._jobs[job.id] = job
+      self._evict_finished()
+    self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+    return job
+
+  def get(self, job_id: str) -> Optional[Job]:
+    with self._lock:
+      return self._jobs.get(job_id)
+
+  def _evict_finished(self) -> None:
+    finished = [jid for jid, job in self._jobs.items() if job.status in FINISHED_STATES]
+    for jid in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+      del self._jobs[jid]
+
+  def _run_loop(self) -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    self._loop = loop
+    self._queue = asyncio.Queue()
+    limiter = asyncio.Semaphore(self.provider_concurrency)
+    self._tasks = [loop.create_task(self._worker(limiter)) for _ in range(self.workers)]
+    self._ready.set()
+    try:
+      loop.run_forever()
+    finally:
+      loop.close()
+
+  async def _worker(self, limiter: asyncio.Semaphore) -> None:
+    from ..api import parse
+
+    assert self._queue is not None
+    while True:
+      job = await self._queue.get()
+      job._set_status(JOB_RUNNING)
+      options = dict(job.options)
+      outputs = options.pop("outputs", ["markdown", "text", "layout_json"])
+      llm = options.pop("llm", None) or self.llm
+      output_dir = self.output_root / job.id if self.output_root is not None else None
+      try:
+        doc = await parse(
+          path=job.path.as_posix(),
+          outputs=outputs,
+          llm=llm,
+          output_dir=output_dir,
+          on_page=job._add_page,
+          limiter=limiter,
+          **options,
+        )
+        job._set_status(JOB_DONE, result=doc.model_dump(mode="json"))
+      except Exception as exc:
+        job._set_status(JOB_FAILED, error=f"{type(exc).__name__}: {exc}")
+      finally:
+        if job.cleanup_path:
+          job.path.unlink(missing_ok=True)
+        self._queue.task_done()
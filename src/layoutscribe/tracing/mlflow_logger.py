@@ -2,15 +2,34 @@
 
 Responsibilities:
 - Initialize MLflow runs when tracing is enabled.
-- Log parameters, metrics, and artifacts (e.g., layout.json, document.md).
+- Log parameters, metrics, and artifacts (e.g., layout.json, document.md)
+  from a background thread, so tracing never stalls parsing: calls enqueue
+  and return, and the thread coalesces queued params and metrics into
+  `log_batch` requests and sends artifact directories with `log_artifacts`.
+- Stream per-page metrics as pages finish (`RunLogger.log_page`).
 - Ensure no secrets are logged and paths are sanitized.
+
+The queue is bounded. When it is full, metrics are dropped and counted
+rather than blocking the caller; params and artifacts, logged outside the
+page loop, wait for room. `close()` flushes the queue (up to a timeout)
+and ends the run. If the flush times out, `unflushed` is set: the sender
+thread may still be uploading, so the caller must keep logged files around.
 """
 
 from __future__ import annotations
 
 import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+# MLflow caps one `log_batch` request at 1000 metrics and 100 params.
+_MAX_BATCH_METRICS = 1000
+_MAX_BATCH_PARAMS = 100
+
+_STOP = object()
 
 
 def _get_mlflow():
@@ -21,40 +40,166 @@ def _get_mlflow():
     return None
 
 
-def start_run(run_name: Optional[str] = None) -> bool:
-  mlflow = _get_mlflow()
-  if mlflow is None:
-    return False
-  uri = os.getenv("LAYOUTSCRIBE_MLFLOW_TRACKING_URI")
-  if uri:
-    mlflow.set_tracking_uri(uri)
-  mlflow.start_run(run_name=run_name)
-  return True
+def _safe_params(params: Dict[str, Any]) -> Dict[str, str]:
+  # Drop any keys that look like secrets
+  return {
+    k: str(v)
+    for k, v in params.items()
+    if v is not None and "key" not in k.lower() and "token" not in k.lower()
+  }
+
 
+class RunLogger:
+  """One MLflow run fed through a bounded queue and a sender thread."""
 
-def log_params(params: Dict[str, Any]) -> None:
-  mlflow = _get_mlflow()
-  if mlflow is None:
-    return
-  # Drop any keys that look like secrets
-  safe = {k: v for k, v in params.items() if "key" not in k.lower() and "token" not in k.lower()}
-  mlflow.log_params({k: str(v) for k, v in safe.items() if v is not None})
+  def __init__(
+    self,
+    mlflow: Any,
+    run_id: str,
+    max_queue: int = 10_000,
+    flush_timeout_s: float = 60.0,
+  ) -> None:
+    self._mlflow = mlflow
+    self._client = mlflow.tracking.MlflowClient()
+    self.run_id = run_id
+    self.flush_timeout_s = flush_timeout_s
+    self.dropped = 0  # metrics dropped because the queue was full
+    self.errors = 0  # requests the tracking server rejected or never answered
+    self.last_error: Optional[str] = None
+    self.unflushed = False  # close() timed out while uploads were still running
+    self._pages = 0
+    self._closed = False
+    self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+    self._thread = threading.Thread(target=self._drain, name="layoutscribe-mlflow", daemon=True)
+    self._thread.start()
 
+  @classmethod
+  def start(cls, run_name: Optional[str] = None, **kwargs: Any) -> Optional["RunLogger"]:
+    """Start a run, or return None when MLflow is not installed."""
+    mlflow = _get_mlflow()
+    if mlflow is None:
+      return None
+    uri = os.getenv("LAYOUTSCRIBE_MLFLOW_TRACKING_URI")
+    if uri:
+      mlflow.set_tracking_uri(uri)
+    run = mlflow.start_run(run_name=run_name)
+    return cls(mlflow, run.info.run_id, **kwargs)
 
-def log_artifact(path: Path, artifact_path: Optional[str] = None) -> None:
-  mlflow = _get_mlflow()
-  if mlflow is None:
-    return
-  if path.exists():
-    mlflow.log_artifact(path.as_posix(), artifact_path=artifact_path)
+  def _put(self, item: Tuple[Any, ...], wait: bool) -> bool:
+    if self._closed:
+      return False
+    try:
+      self._queue.put(item, block=wait)
+    except queue.Full:
+      return False
+    return True
 
+  def log_params(self, params: Dict[str, Any]) -> None:
+    self._put(("params", _safe_params(params)), wait=True)
+
+  def log_metrics(self, metrics: Dict[str, Optional[float]], step: int = 0) -> None:
+    """Queue metrics without blocking; dropped (and counted) if the queue is full."""
+    stamp = int(time.time() * 1000)
+    values = [(k, float(v), stamp, step) for k, v in metrics.items() if v is not None]
+    if values and not self._put(("metrics", values), wait=False):
+      self.dropped += len(values)
+
+  def log_page(self, page: Dict[str, Any]) -> None:
+    """Per-page metrics at step = page number; usable as `parse(on_page=...)`."""
+    blocks = page.get("blocks") or []
+    self._pages += 1
+    self.log_metrics(
+      {
+        "page_blocks": len(blocks),
+        "page_tables": sum(1 for b in blocks if b.get("type") == "table"),
+        "page_chars": sum(len(b.get("text") or "") for b in blocks),
+        "pages_done": self._pages,
+      },
+      step=int(page.get("page_number") or self._pages),
+    )
+
+  def log_artifact(self, path: Path, artifact_path: Optional[str] = None) -> None:
+    if path.exists():
+      self._put(("artifact", path, artifact_path), wait=True)
+
+  def log_artifacts(self, local_dir: Path, artifact_path: Optional[str] = None) -> None:
+    if local_dir.is_dir():
+      self._put(("artifacts", local_dir, artifact_path), wait=True)
+
+  def log_files(self, paths: List[Path], artifact_path: Optional[str] = None) -> None:
+    """Log `paths`, uploading a directory in one call when it holds only these files."""
+    by_dir: Dict[Path, List[Path]] = {}
+    for path in paths:
+      if path.exists():
+        by_dir.setdefault(path.parent, []).append(path)
+    for directory, files in by_dir.items():
+      contents = {entry.name for entry in directory.iterdir()}
+      if len(files) > 1 and contents == {f.name for f in files}:
+        self.log_artifacts(directory, artifact_path)
+      else:
+        for path in files:
+          self.log_artifact(path, artifact_path)
+
+  def _drain(self) -> None:
+    stop = False
+    while not stop:
+      batch = [self._queue.get()]
+      while True:
+        try:
+          batch.append(self._queue.get_nowait())
+        except queue.Empty:
+          break
+      if any(item is _STOP for item in batch):
+        stop = True
+        batch = [item for item in batch if item is not _STOP]
+      self._send(batch)
+
+  def _send(self, batch: List[Tuple[Any, ...]]) -> None:
+    Metric, Param = self._mlflow.entities.Metric, self._mlflow.entities.Param
+    params: Dict[str, str] = {}
+    metrics: List[Any] = []
+    for item in batch:
+      if item[0] == "params":
+        params.update(item[1])
+      elif item[0] == "metrics":
+        metrics.extend(Metric(key, value, stamp, step) for key, value, stamp, step in item[1])
+    param_list = [Param(k, v) for k, v in params.items()]
+    for i in range(0, len(param_list), _MAX_BATCH_PARAMS):
+      self._call(self._client.log_batch, self.run_id, params=param_list[i : i + _MAX_BATCH_PARAMS])
+    for i in range(0, len(metrics), _MAX_BATCH_METRICS):
+      self._call(self._client.log_batch, self.run_id, metrics=metrics[i : i + _MAX_BATCH_METRICS])
+    for item in batch:
+      if item[0] == "artifact":
+        self._call(self._client.log_artifact, self.run_id, item[1].as_posix(), item[2])
+      elif item[0] == "artifacts":
+        self._call(self._client.log_artifacts, self.run_id, item[1].as_posix(), item[2])
+
+  def _call(self, fn: Any, *args: Any, **kwargs: Any) -> None:
+    try:
+      fn(*args, **kwargs)
+    except Exception as exc:  # tracing must not fail the parse
+      self.errors += 1
+      self.last_error = f"{type(exc).__name__}: {exc}"
+
+  def close(self, status: str = "FINISHED") -> None:
+    """Flush queued calls (up to `flush_timeout_s`) and end the run; idempotent."""
+    if self._closed:
+      return
+    self._closed = True
+    deadline = time.monotonic() + self.flush_timeout_s
+    try:
+      self._queue.put(_STOP, timeout=self.flush_timeout_s)
+      self._thread.join(max(deadline - time.monotonic(), 0.0))
+    except queue.Full:
+      pass
+    if self._thread.is_alive():
+      self.unflushed = True
+      self.errors += 1
+      self.last_error = f"flush did not finish within {self.flush_timeout_s:g}s"
+    try:
+      self._mlflow.end_run(status=status)
+    except Exception:
+      pass
 
-def end_run(status: str = "FINISHED") -> None:
-  mlflow = _get_mlflow()
-  if mlflow is None:
-    return
-  try:
-    mlflow.end_run(status=status)
-  except Exception:
-    pass
 
+__all__ = ["RunLogger"]
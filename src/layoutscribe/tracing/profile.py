@@ -0,0 +1,243 @@
+"""Run profiling: span timeline, CPU profile and per-stage memory peaks.
+
+Responsibilities:
+- Record timed spans (render, encode, LLM call, provider-slot wait, retry
+  backoff, review, re-ask, export, ...) for the profiler active in the
+  current context. `span()` costs one context-variable lookup when
+  profiling is off.
+- Put each asyncio task (or thread) on its own track and write the spans as
+  Chrome trace JSON, which opens in chrome://tracing and ui.perfetto.dev.
+- Summarize each stage: span count, busy and wall time, longest span, peak
+  and mean concurrency, and the tracemalloc peak seen while it ran.
+- Run cProfile over the event-loop thread and save it as `.pstats`.
+
+Memory peaks are read and reset when a span ends, so under overlap a peak
+is credited to the stage whose span ended first; treat them as an upper
+bound per stage. cProfile covers only the thread that started the
+profiler: work moved to threads (DOCX layout, PPTX conversion) appears in
+the trace but not in the CPU profile. tracemalloc slows allocation-heavy
+code, so compare timings of profiled runs with each other only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from ..utils.io import ensure_dir
+
+TRACE_FILENAME = "trace.json"
+CPU_FILENAME = "cpu.pstats"
+STAGES_FILENAME = "stages.json"
+
+T = TypeVar("T")
+
+_ACTIVE: ContextVar[Optional["Profiler"]] = ContextVar("layoutscribe_profiler", default=None)
+
+
+def _track() -> Tuple[Tuple[str, int], str]:
+  """Key and label of the current asyncio task, or of the thread outside one."""
+  try:
+    task = asyncio.current_task()
+  except RuntimeError:
+    task = None
+  if task is not None:
+    return ("task", id(task)), task.get_name()
+  thread = threading.current_thread()
+  return ("thread", thread.ident or 0), thread.name
+
+
+@contextmanager
+def span(name: str, stage: str, **args: Any) -> Iterator[None]:
+  """Time the enclosed block as `stage` when a profiler is active.
+
+  Works around `await`s as well; the span is drawn on the track of the task
+  that opened it.
+  """
+  profiler = _ACTIVE.get()
+  if profiler is None:
+    yield
+    return
+  track = _track()
+  start = time.perf_counter_ns()
+  try:
+    yield
+  finally:
+    profiler.record(name, stage, start, time.perf_counter_ns(), track, args)
+
+
+def spanned(items: Iterable[T], name: str, stage: str) -> Iterator[T]:
+  """Yield from `items`, timing each step (e.g. a lazy page renderer)."""
+  iterator = iter(items)
+  while True:
+    with span(name, stage):
+      try:
+        item = next(iterator)
+      except StopIteration:
+        return
+    yield item
+
+
+class Profiler:
+  """Collects spans for one run; `start()`/`stop()` bracket the run."""
+
+  def __init__(self, cpu: bool = True, memory: bool = True) -> None:
+    self.cpu = cpu
+    self.memory = memory
+    self.spans: List[Tuple[str, str, int, int, int, Dict[str, Any]]] = []
+    self.mem_peaks: Dict[str, int] = {}
+    self._tracks: Dict[Tuple[str, int], int] = {}
+    self._labels: Dict[int, str] = {}
+    self._lock = threading.Lock()
+    self._cprofile: Optional[cProfile.Profile] = None
+    self._token: Optional[Token[Optional[Profiler]]] = None
+    self._owns_tracemalloc = False
+    self._t0 = 0
+    self._t1 = 0
+
+  def start(self) -> "Profiler":
+    self._t0 = time.perf_counter_ns()
+    if self.memory and not tracemalloc.is_tracing():
+      tracemalloc.start()
+      self._owns_tracemalloc = True
+    if self.memory:
+      tracemalloc.reset_peak()
+    if self.cpu:
+      self._cprofile = cProfile.Profile()
+      try:
+        self._cprofile.enable()
+      except ValueError:  # another profiler is already running on this thread
+        self._cprofile = None
+    self._token = _ACTIVE.set(self)
+    return self
+
+  def stop(self) -> None:
+    """Stop collecting; safe to call more than once."""
+    if self._token is not None:
+      _ACTIVE.reset(self._token)
+      self._token = None
+    if self._cprofile is not None:
+      self._cprofile.disable()
+    if self._owns_tracemalloc:
+      tracemalloc.stop()
+      self._owns_tracemalloc = False
+    if not self._t1:
+      self._t1 = time.perf_counter_ns()
+
+  def record(
+    self,
+    name: str,
+    stage: str,
+    start_ns: int,
+    end_ns: int,
+    track: Tuple[Tuple[str, int], str],
+    args: Dict[str, Any],
+  ) -> None:
+    key, label = track
+    with self._lock:
+      tid = self._tracks.get(key)
+      if tid is None:
+        tid = self._tracks[key] = len(self._tracks) + 1
+        self._labels[tid] = label
+      self.spans.append((name, stage, start_ns, end_ns, tid, args))
+      if self.memory and tracemalloc.is_tracing():
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        if peak > self.mem_peaks.get(stage, 0):
+          self.mem_peaks[stage] = peak
+
+  def trace_events(self) -> List[Dict[str, Any]]:
+    """Chrome trace events: one complete ("X") event per span, in µs."""
+    events: List[Dict[str, Any]] = [
+      {"ph": "M", "pid": 1, "tid": 0, "name": "process_name", "args": {"name": "layoutscribe"}}
+    ]
+    for tid, label in sorted(self._labels.items()):
+      events.append(
+        {"ph": "M", "pid": 1, "tid": tid, "name": "thread_name", "args": {"name": label}}
+      )
+      events.append(
+        {"ph": "M", "pid": 1, "tid": tid, "name": "thread_sort_index", "args": {"sort_index": tid}}
+      )
+    for name, stage, start, end, tid, args in self.spans:
+      events.append(
+        {
+          "ph": "X",
+          "pid": 1,
+          "tid": tid,
+          "name": name,
+          "cat": stage,
+          "ts": (start - self._t0) / 1000,
+          "dur": (end - start) / 1000,
+          "args": args,
+        }
+      )
+    return events
+
+  def stage_summary(self) -> Dict[str, Dict[str, Any]]:
+    """Per-stage totals; `mean_concurrency` is busy time over wall time."""
+    by_stage: Dict[str, List[Tuple[int, int]]] = {}
+    for _, stage, start, end, _, _ in self.spans:
+      by_stage.setdefault(stage, []).append((start, end))
+    run_ns = max((self._t1 or time.perf_counter_ns()) - self._t0, 1)
+    summary: Dict[str, Dict[str, Any]] = {}
+    for stage, intervals in sorted(by_stage.items()):
+      busy = sum(end - start for start, end in intervals)
+      # Sweep line: ends sort before starts at the same instant.
+      edges = sorted([(s, 1) for s, _ in intervals] + [(e, -1) for _, e in intervals])
+      level = peak = 0
+      wall = 0
+      opened = 0
+      for at, step in edges:
+        if level == 0 and step > 0:
+          opened = at
+        level += step
+        if level == 0:
+          wall += at - opened
+        peak = max(peak, level)
+      summary[stage] = {
+        "count": len(intervals),
+        "busy_s": round(busy / 1e9, 6),
+        "wall_s": round(wall / 1e9, 6),
+        "max_s": round(max(end - start for start, end in intervals) / 1e9, 6),
+        "max_concurrency": peak,
+        "mean_concurrency": round(busy / wall, 3) if wall else 0.0,
+        "share_of_run": round(wall / run_ns, 3),
+        "mem_peak_bytes": self.mem_peaks.get(stage),
+      }
+    return summary
+
+  def write(self, out_dir: Path) -> List[Path]:
+    """Write trace JSON, stage summary and (when collected) the CPU profile."""
+    self.stop()
+    out = ensure_dir(Path(out_dir))
+    stages = self.stage_summary()
+    trace = {
+      "traceEvents": self.trace_events(),
+      "displayTimeUnit": "ms",
+      "otherData": {"run_s": round((self._t1 - self._t0) / 1e9, 6)},
+    }
+    paths = [out / TRACE_FILENAME, out / STAGES_FILENAME]
+    paths[0].write_text(json.dumps(trace), encoding="utf-8")
+    paths[1].write_text(json.dumps(stages, indent=2), encoding="utf-8")
+    if self._cprofile is not None:
+      self._cprofile.dump_stats(str(out / CPU_FILENAME))
+      paths.append(out / CPU_FILENAME)
+    return paths
+
+
+__all__ = [
+  "CPU_FILENAME",
+  "Profiler",
+  "STAGES_FILENAME",
+  "TRACE_FILENAME",
+  "span",
+  "spanned",
+]
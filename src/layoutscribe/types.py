@@ -6,14 +6,18 @@ Responsibilities:
   `docs/schema/layout_page.schema.json`.
 - Centralize typed contracts used by API and CLI layers.
 
-Note: Fields only; no behavior or validation logic is implemented here.
+Note: Fields only; the one exception is `ParsedDocument.layout_json`, which
+is materialized lazily from the pipeline's compact `BlockStore`.
 """
 
 from __future__ import annotations
 
-from typing import Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, computed_field, model_validator
+
+if TYPE_CHECKING:
+  from .layout.store import BlockStore
 
 
 BlockType = Literal[
@@ -56,20 +60,139 @@ class DocumentLayout(BaseModel):
 
 
 class ParsedDocument(BaseModel):
+  """Parse result.
+
+  `layout_json` accepts a `DocumentLayout` (or dict) like a regular field,
+  or a `layout_store` (`BlockStore`) from which Pydantic models are built
+  on first access only; the store is released once materialized.
+  """
+
   markdown: Optional[str] = None
   text: Optional[str] = None
-  layout_json: Optional[DocumentLayout] = None
   overlays_dir: Optional[str] = None
   intermediate_dir: Optional[str] = None
   metadata: Optional["DocumentMetadata"] = None
   artifact_paths: Optional[Dict[str, List[str]]] = None
 
+  _layout: Optional[DocumentLayout] = PrivateAttr(default=None)
+  _layout_store: Optional["BlockStore"] = PrivateAttr(default=None)
+
+  @model_validator(mode="wrap")
+  @classmethod
+  def _capture_layout(cls, data: Any, handler: Any) -> "ParsedDocument":
+    layout = store = None
+    if isinstance(data, dict):
+      data = dict(data)
+      layout = data.pop("layout_json", None)
+      store = data.pop("layout_store", None)
+    doc = handler(data)
+    if layout is not None:
+      doc.layout_json = layout
+    if store is not None:
+      doc._layout_store = store
+    return doc
+
+  @computed_field  # type: ignore[prop-decorator]
+  @property
+  def layout_json(self) -> Optional[DocumentLayout]:
+    if self._layout is None and self._layout_store is not None:
+      self._layout = self._layout_store.to_document_layout()
+      self._layout_store = None
+    return self._layout
+
+  @layout_json.setter
+  def layout_json(self, value: Any) -> None:
+    if value is not None and not isinstance(value, DocumentLayout):
+      value = DocumentLayout.model_validate(value)
+    self._layout = value
+    self._layout_store = None
+
+  @property
+  def layout_store(self) -> Optional["BlockStore"]:
+    return self._layout_store
+
+  def layout_dict(self) -> Optional[Dict[str, Any]]:
+    """`layout_json` as plain data, skipping Pydantic when still compact."""
+    if self._layout is None and self._layout_store is not None:
+      return {"pages": self._layout_store.to_pages()}
+    if self._layout is None:
+      return None
+    return self._layout.model_dump()
+
 
 class PageMetadata(BaseModel):
   page_number: int
   block_count: int
   table_count: int
   text_preview: str
+  calls: Optional[int] = None  # answered vision calls, re-asks and hedges included
+  prompt_tokens: Optional[int] = None
+  completion_tokens: Optional[int] = None
+  cost_usd: Optional[float] = None
+  timed_out: Optional[bool] = None  # cut off by a deadline; text-layer fallback
+
+
+class HedgeStats(BaseModel):
+  issued: int = 0  # duplicate requests sent
+  won: int = 0  # pages answered by the duplicate
+  cancelled: int = 0  # losing calls cancelled
+
+
+class TierStats(BaseModel):
+  model: str
+  pages: int = 0  # pages whose final answer came from this tier
+  calls: int = 0  # vision calls, including re-asks
+  cost_usd: float = 0.0  # from the token ledger
+
+
+class EndpointStats(BaseModel):
+  model: str
+  api_base: Optional[str] = None
+  calls: int = 0
+  failures: int = 0
+  drains: int = 0  # times taken out of rotation
+  latency_s: Optional[float] = None  # EWMA of successful calls
+
+
+class ProviderReaskStats(BaseModel):
+  provider: str
+  answers: int = 0  # first-pass answers reviewed
+  reasks: int = 0  # answers whose review errors called for a re-ask
+  reask_rate: float = 0.0
+
+
+class ModelUsage(BaseModel):
+  model: str
+  calls: int = 0  # answered vision calls
+  prompt_tokens: int = 0
+  cached_prompt_tokens: int = 0  # prompt tokens served from the provider cache
+  cache_write_tokens: int = 0  # prompt tokens written to the cache (Anthropic)
+  uncached_prompt_tokens: int = 0
+  completion_tokens: int = 0
+  cache_hit_rate: float = 0.0  # cached / prompt tokens
+  cost_usd: float = 0.0
+
+
+class CostSummary(BaseModel):
+  calls: int = 0
+  prompt_tokens: int = 0
+  cached_prompt_tokens: int = 0
+  completion_tokens: int = 0
+  cost_usd: float = 0.0  # priced from usage; unpriced calls at cost_per_page_usd
+  budget_usd: Optional[float] = None
+  unpriced_calls: int = 0
+
+
+class RenderCacheStats(BaseModel):
+  hits: int = 0  # pages linked from the cache instead of rendered
+  misses: int = 0  # pages rendered and added to the cache
+
+
+class PageStatus(BaseModel):
+  status: Literal["ok", "recovered", "failed", "timed_out", "skipped_budget"] = "ok"
+  attempts: int = 0  # page passes, not counting per-call retries
+  error: Optional[str] = None  # exception class of the last failure
+  message: Optional[str] = None
 
 
 class DocumentMetadata(BaseModel):
@@ -77,6 +200,15 @@ class DocumentMetadata(BaseModel):
   blocks_total: int
   table_total: int
   pages: List[PageMetadata]
+  hedging: Optional[HedgeStats] = None
+  tiers: Optional[List[TierStats]] = None
+  endpoints: Optional[List[EndpointStats]] = None
+  reasks: Optional[List[ProviderReaskStats]] = None
+  usage: Optional[List[ModelUsage]] = None
+  cost: Optional[CostSummary] = None
+  timed_out_pages: Optional[List[int]] = None  # set when a deadline was configured
+  page_status: Optional[Dict[int, PageStatus]] = None
+  render_cache: Optional[RenderCacheStats] = None
 
 
 __all__ = [
@@ -88,6 +220,14 @@ __all__ = [
   "ParsedDocument",
   "DocumentMetadata",
   "PageMetadata",
+  "HedgeStats",
+  "TierStats",
+  "EndpointStats",
+  "ProviderReaskStats",
+  "ModelUsage",
+  "CostSummary",
+  "PageStatus",
+  "RenderCacheStats",
 ]
 
 
@@ -3,16 +3,28 @@
 Responsibilities:
 - Provide decorators/utilities for exponential backoff with jitter on
   retryable provider errors (429/5xx/timeouts).
+- Show backoff sleeps as spans in `--profile` traces.
 """
 
 from __future__ import annotations
 
+import asyncio
+
 from tenacity import retry, stop_after_attempt, wait_exponential_jitter
 
+from ..tracing.profile import span
+
+
+async def _sleep(seconds: float) -> None:
+  with span("retry backoff", "backoff", seconds=round(seconds, 3)):
+    await asyncio.sleep(seconds)
+
+
 DEFAULT_RETRY = retry(
   reraise=True,
   stop=stop_after_attempt(5),
   wait=wait_exponential_jitter(exp_base=2, max=10),
+  sleep=_sleep,
 )
 
 
@@ -0,0 +1,216 @@
+"""Columnar (Parquet/Arrow) block export for corpus-scale analytics.
+
+Responsibilities:
+- Convert a `BlockStore` into an Arrow table with one row per block:
+  `doc_id, page, block_id, type, bbox, level, conf, text, table_rows`.
+- Append tables to a Hive-partitioned Parquet dataset (`dt=YYYY-MM-DD/`),
+  one file per document or per batch, renamed into place atomically.
+- Scan the dataset with partition and row-group predicate pushdown.
+
+Requires `pyarrow` (`pip install "layoutscribe[analytics]"`).
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..layout.store import BlockStore
+from .io import ensure_dir
+
+if TYPE_CHECKING:
+  import pyarrow as pa
+  import pyarrow.dataset as ds
+
+
+PARTITION_KEY = "dt"
+
+
+def _pyarrow() -> Any:
+  try:
+    import pyarrow  # type: ignore
+    import pyarrow.dataset  # noqa: F401  # type: ignore
+    import pyarrow.parquet  # noqa: F401  # type: ignore
+  except ImportError as exc:
+    raise RuntimeError("pyarrow is required for columnar export (layoutscribe[analytics])") from exc
+  return pyarrow
+
+
+def block_schema() -> "pa.Schema":
+  pa = _pyarrow()
+  return pa.schema(
+    [
+      ("doc_id", pa.string()),
+      ("page", pa.int32()),
+      ("block_id", pa.string()),
+      ("type", pa.dictionary(pa.int16(), pa.string())),
+      ("bbox", pa.list_(pa.float32(), 4)),
+      ("level", pa.int8()),
+      ("conf", pa.float32()),
+      ("text", pa.string()),
+      ("table_rows", pa.list_(pa.list_(pa.string()))),
+    ]
+  )
+
+
+def store_to_table(store: BlockStore, doc_id: str) -> "pa.Table":
+  """Build an Arrow table directly from the store's columns."""
+  pa = _pyarrow()
+  n = store.block_count
+  rows_per_page = np.diff(store.page_offsets)
+  pages = np.repeat(store.page_numbers, rows_per_page).astype(np.int32)
+  bbox = pa.FixedSizeListArray.from_arrays(pa.array(store.bboxes.reshape(-1)), 4)
+  types = pa.DictionaryArray.from_arrays(
+    pa.array(store.type_codes.astype(np.int16)), pa.array(store.type_names, pa.string())
+  )
+  levels = pa.array(store.levels, mask=store.levels == 0)
+  confs = pa.array(store.confs, mask=np.isnan(store.confs))
+  columns = [
+    pa.array([doc_id] * n, pa.string()),
+    pa.array(pages),
+    pa.array([store.block_id(row) for row in range(n)], pa.string()),
+    types,
+    bbox,
+    levels,
+    confs,
+    pa.array([store.text(row) for row in range(n)], pa.string()),
+    pa.array([store.tables.get(row) for row in range(n)], pa.list_(pa.list_(pa.string()))),
+  ]
+  return pa.Table.from_arrays(columns, schema=block_schema())
+
+
+class BlockDatasetWriter:
+  """Append documents to a partitioned Parquet dataset.
+
+  Tables are buffered and flushed as one file once `batch_rows` blocks have
+  accumulated (or on `close()`), which keeps file counts low in batch mode.
+  Files are written under a dot-prefixed name (ignored by dataset
+  discovery) and renamed into place when complete.
+  """
+
+  def __init__(
+    self,
+    dataset_dir: Path,
+    batch_rows: int = 250_000,
+    partition: Optional[str] = None,
+  ) -> None:
+    self.dataset_dir = dataset_dir
+    self.batch_rows = batch_rows
+    self.partition = partition or _dt.date.today().isoformat()
+    self.files: List[Path] = []
+    self._pending: List["pa.Table"] = []
+    self._pending_rows = 0
+
+  def append(self, store: BlockStore, doc_id: str) -> None:
+    table = store_to_table(store, doc_id)
+    self._pending.append(table)
+    self._pending_rows += table.num_rows
+    if self._pending_rows >= self.batch_rows:
+      self.flush()
+
+  def flush(self) -> Optional[Path]:
+    if not self._pending:
+      return None
+    pa = _pyarrow()
+    table = pa.concat_tables(self._pending)
+    self._pending = []
+    self._pending_rows = 0
+    part_dir = ensure_dir(self.dataset_dir / f"{PARTITION_KEY}={self.partition}")
+    dest = part_dir / f"part-{uuid.uuid4().hex}.parquet"
+    tmp = part_dir / f".{dest.name}.part"
+    try:
+      pa.parquet.write_table(table, tmp.as_posix(), compression="zstd")
+      os.replace(tmp, dest)
+    finally:
+      tmp.unlink(missing_ok=True)
+    self.files.append(dest)
+    return dest
+
+  def close(self) -> List[Path]:
+    self.flush()
+    return self.files
+
+  def __enter__(self) -> "BlockDatasetWriter":
+    return self
+
+  def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+    if exc_type is None:
+      self.close()
+
+
+def append_blocks(dataset_dir: Path, store: BlockStore, doc_id: str) -> Path:
+  """Append one document's blocks as a new Parquet file."""
+  writer = BlockDatasetWriter(dataset_dir)
+  writer.append(store, doc_id)
+  return writer.close()[0]
+
+
+def open_block_dataset(dataset_dir: Path) -> "ds.Dataset":
+  pa = _pyarrow()
+  return pa.dataset.dataset(
+    dataset_dir.as_posix(),
+    format="parquet",
+    partitioning="hive",
+    schema=block_schema().append(pa.field(PARTITION_KEY, pa.string())),
+  )
+
+
+def scan_blocks(
+  dataset_dir: Path,
+  filter: Optional[Any] = None,
+  columns: Optional[List[str]] = None,
+) -> "pa.Table":
+  """Scan blocks with predicate pushdown.
+
+  `filter` is a `pyarrow.dataset` expression, e.g.
+  `(ds.field("type") == "table") & (ds.field("page") <= 20)`; partition and
+  row-group statistics prune files before any data is decoded.
+  """
+  return open_block_dataset(dataset_dir).to_table(filter=filter, columns=columns)
+
+
+def load_layout_pages(path: Path) -> List[Dict[str, Any]]:
+  """Load pages from a `layout.json` or `layout.jsonl` artifact."""
+  if path.suffix == ".jsonl":
+    from .jsonl import LayoutJsonlReader
+
+    with LayoutJsonlReader(path) as reader:
+      return list(reader)
+  with path.open("r", encoding="utf-8") as f:
+    return json.load(f).get("pages", [])
+
+
+def find_layout_artifacts(roots: Iterable[Path]) -> List[Tuple[str, Path]]:
+  """Locate layout artifacts under `roots` as `(doc_id, path)` pairs.
+
+  The doc id is the artifact's parent directory name, matching the default
+  `artifacts/<basename>/` layout. `layout.jsonl` wins over `layout.json`.
+  """
+  found: Dict[Path, Path] = {}
+  for root in roots:
+    candidates = [root] if root.is_file() else sorted(root.rglob("layout.json*"))
+    for path in candidates:
+      if path.name not in {"layout.json", "layout.jsonl"}:
+        continue
+      current = found.get(path.parent)
+      if current is None or path.suffix == ".jsonl":
+        found[path.parent] = path
+  return [(parent.name, path) for parent, path in sorted(found.items())]
+
+
+__all__ = [
+  "BlockDatasetWriter",
+  "append_blocks",
+  "block_schema",
+  "find_layout_artifacts",
+  "load_layout_pages",
+  "open_block_dataset",
+  "scan_blocks",
+  "store_to_table",
+]
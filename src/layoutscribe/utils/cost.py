@@ -1,24 +1,120 @@
 """Token usage and cost accounting.
 
 Responsibilities:
-- Track token usage and estimate cost per page and per run when provider
-  data is available.
-- Enforce optional budget cap logic.
+- Price token usage per model from a configurable table: explicit
+  overrides, then LiteLLM's model cost map, then a small built-in table.
+- Keep a run ledger of actual cost per model and per page, plus the
+  estimated cost of calls in flight.
+- Enforce the optional budget cap before each dispatch: first-pass calls
+  raise `BudgetExceededError`, optional calls (re-asks, hedges,
+  escalations) are simply declined.
 """
 
 from __future__ import annotations
 
-from typing import Dict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..exceptions import BudgetExceededError
+from ..llm.usage import TokenUsage
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+  """USD per 1M tokens; cached/cache-write rates default to the prompt rate."""
+
+  prompt_per_mtok: float
+  completion_per_mtok: float
+  cached_per_mtok: Optional[float] = None
+  cache_write_per_mtok: Optional[float] = None
+
+  def cost_usd(self, counts: Dict[str, int]) -> float:
+    cached = counts.get("cached_prompt_tokens", 0)
+    written = counts.get("cache_write_tokens", 0)
+    # `prompt_tokens` includes cache reads and writes (OpenAI natively,
+    # Anthropic as normalized by LiteLLM); the rest is billed at full rate.
+    uncached = max(counts.get("prompt_tokens", 0) - cached - written, 0)
+    cached_rate = self.prompt_per_mtok if self.cached_per_mtok is None else self.cached_per_mtok
+    write_rate = (
+      self.prompt_per_mtok if self.cache_write_per_mtok is None else self.cache_write_per_mtok
+    )
+    return (
+      uncached * self.prompt_per_mtok
+      + cached * cached_rate
+      + written * write_rate
+      + counts.get("completion_tokens", 0) * self.completion_per_mtok
+    ) / 1_000_000
+
+
+# Fallback when LiteLLM has no entry; LiteLLM's map is kept more current.
+DEFAULT_PRICES: Dict[str, ModelPrice] = {
+  "openai/gpt-4o": ModelPrice(2.5, 10.0, 1.25),
+  "openai/gpt-4o-mini": ModelPrice(0.15, 0.6, 0.075),
+  "openai/o4-mini": ModelPrice(1.1, 4.4, 0.275),
+  "anthropic/claude-3-5-sonnet-latest": ModelPrice(3.0, 15.0, 0.3, 3.75),
+}
+
+
+def parse_price(spec: str) -> Tuple[str, ModelPrice]:
+  """Parse `model=prompt,completion[,cached[,cache_write]]` (USD per 1M tokens)."""
+  model, sep, rates = spec.strip().rpartition("=")
+  if not sep or not model:
+    raise ValueError(f"Price spec '{spec}' must be model=prompt,completion[,cached]")
+  try:
+    values = [float(v) for v in rates.split(",")]
+  except ValueError as exc:
+    raise ValueError(f"Invalid price in '{spec}'") from exc
+  if not 2 <= len(values) <= 4:
+    raise ValueError(f"Price spec '{spec}' needs 2 to 4 rates")
+  return model.strip(), ModelPrice(*values)
+
+
+def _litellm_price(model_id: str) -> Optional[ModelPrice]:
+  try:
+    import litellm  # type: ignore
+  except ImportError:
+    return None
+  costs = getattr(litellm, "model_cost", None) or {}
+  entry = costs.get(model_id) or costs.get(model_id.split("/", 1)[-1])
+  if not entry or entry.get("input_cost_per_token") is None:
+    return None
+
+  def _per_mtok(key: str) -> Optional[float]:
+    value = entry.get(key)
+    return None if value is None else float(value) * 1_000_000
+
+  return ModelPrice(
+    prompt_per_mtok=float(entry["input_cost_per_token"]) * 1_000_000,
+    completion_per_mtok=float(entry.get("output_cost_per_token") or 0.0) * 1_000_000,
+    cached_per_mtok=_per_mtok("cache_read_input_token_cost"),
+    cache_write_per_mtok=_per_mtok("cache_creation_input_token_cost"),
+  )
+
+
+class PriceTable:
+  """Per-model prices: `overrides`, then LiteLLM's cost map, then `DEFAULT_PRICES`."""
+
+  def __init__(self, overrides: Optional[Dict[str, ModelPrice]] = None) -> None:
+    self.overrides = dict(overrides or {})
+    self._cache: Dict[str, Optional[ModelPrice]] = {}
+
+  def price(self, model_id: str) -> Optional[ModelPrice]:
+    if model_id in self.overrides:
+      return self.overrides[model_id]
+    if model_id not in self._cache:
+      found = None
+      if not model_id.startswith("fake/"):
+        found = _litellm_price(model_id) or DEFAULT_PRICES.get(model_id)
+      self._cache[model_id] = found
+    return self._cache[model_id]
 
 
 def estimated_cost_usd(tokens_in: int, tokens_out: int, model: str) -> float:
-  """Estimate USD cost given token usage and model."""
-  # Placeholder flat pricing per 1M tokens; adjust as needed per provider
-  pricing = {
-    "openai/gpt-4o": (5.0 / 1_000_000, 15.0 / 1_000_000),  # $5 prompt / $15 completion per 1M tokens
-  }
-  rate_in, rate_out = pricing.get(model, (5.0 / 1_000_000, 15.0 / 1_000_000))
-  return tokens_in * rate_in + tokens_out * rate_out
+  """Cost of `tokens_in` prompt and `tokens_out` completion tokens (0 if unpriced)."""
+  price = PriceTable().price(model)
+  if price is None:
+    return 0.0
+  return price.cost_usd({"prompt_tokens": tokens_in, "completion_tokens": tokens_out})
 
 
 def should_abort_budget(current_spend: float, budget_usd: float | None) -> bool:
@@ -27,3 +123,128 @@ def should_abort_budget(current_spend: float, budget_usd: float | None) -> bool:
   return current_spend >= budget_usd
 
 
+class CostLedger(TokenUsage):
+  """Actual token cost per model and page, checked against `budget_usd`.
+
+  Calls to models without a price are charged `default_call_usd`. Before a
+  model has answered, a call is estimated at its prior (`priors`, else
+  `default_call_usd`), afterwards at the model's mean actual cost; calls in
+  flight count at that estimate until their usage arrives.
+  """
+
+  def __init__(
+    self,
+    prices: Optional[PriceTable] = None,
+    budget_usd: Optional[float] = None,
+    default_call_usd: float = 0.0,
+    priors: Optional[Dict[str, float]] = None,
+  ) -> None:
+    super().__init__()
+    self.prices = prices or PriceTable()
+    self.budget_usd = budget_usd
+    self.default_call_usd = default_call_usd
+    self.priors = dict(priors or {})
+    self.spent_usd = 0.0
+    self.pending_usd = 0.0
+    self.unpriced_calls = 0
+    self._model_cost: Dict[str, float] = {}
+    self._pages: Dict[int, Dict[str, float]] = {}
+
+  def estimate(self, model_id: str) -> float:
+    calls = self._totals.get(model_id, {}).get("calls", 0)
+    if calls:
+      return self._model_cost.get(model_id, 0.0) / calls
+    return self.priors.get(model_id, self.default_call_usd)
+
+  def affordable(self, model_id: str) -> bool:
+    if self.budget_usd is None:
+      return True
+    return self.spent_usd + self.pending_usd + self.estimate(model_id) <= self.budget_usd
+
+  def require(self, model_id: str) -> None:
+    """Raise `BudgetExceededError` unless a call to `model_id` fits the budget."""
+    if not self.affordable(model_id):
+      raise BudgetExceededError(
+        f"${self.spent_usd:.4f} spent and ${self.pending_usd:.4f} in flight of "
+        f"${self.budget_usd:.4f}; next {model_id} call est. ${self.estimate(model_id):.4f}"
+      )
+
+  def begin(self, model_id: str) -> float:
+    hold = self.estimate(model_id)
+    self.pending_usd += hold
+    return hold
+
+  def release(self, hold: float) -> None:
+    self.pending_usd = max(self.pending_usd - hold, 0.0)
+
+  def record(
+    self, model_id: str, usage: Any, hold: float = 0.0, page: Optional[int] = None
+  ) -> Dict[str, int]:
+    counts = super().record(model_id, usage)
+    self.release(hold)
+    price = self.prices.price(model_id)
+    if price is None:
+      self.unpriced_calls += 1
+      cost = self.default_call_usd
+    else:
+      cost = price.cost_usd(counts)
+    self.spent_usd += cost
+    self._model_cost[model_id] = self._model_cost.get(model_id, 0.0) + cost
+    if page is not None:
+      totals = self._pages.setdefault(
+        page, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+      )
+      totals["calls"] += 1
+      totals["prompt_tokens"] += counts["prompt_tokens"]
+      totals["completion_tokens"] += counts["completion_tokens"]
+      totals["cost_usd"] += cost
+    return counts
+
+  def for_page(self, page_number: int) -> "PageLedger":
+    return PageLedger(self, page_number)
+
+  def model_cost(self, model_id: str) -> float:
+    return round(self._model_cost.get(model_id, 0.0), 6)
+
+  def page_totals(self, page_number: int) -> Dict[str, Any]:
+    totals = self._pages.get(page_number)
+    if totals is None:
+      return {}
+    return {
+      "calls": int(totals["calls"]),
+      "prompt_tokens": int(totals["prompt_tokens"]),
+      "completion_tokens": int(totals["completion_tokens"]),
+      "cost_usd": round(totals["cost_usd"], 6),
+    }
+
+  def stats(self) -> List[Dict[str, Any]]:
+    return [{**row, "cost_usd": self.model_cost(row["model"])} for row in super().stats()]
+
+  def summary(self) -> Dict[str, Any]:
+    rows = super().stats()
+    return {
+      "calls": sum(r["calls"] for r in rows),
+      "prompt_tokens": sum(r["prompt_tokens"] for r in rows),
+      "cached_prompt_tokens": sum(r["cached_prompt_tokens"] for r in rows),
+      "completion_tokens": sum(r["completion_tokens"] for r in rows),
+      "cost_usd": round(self.spent_usd, 6),
+      "budget_usd": self.budget_usd,
+      "unpriced_calls": self.unpriced_calls,
+    }
+
+
+class PageLedger:
+  """`CostLedger` view that attributes recorded usage to one page."""
+
+  def __init__(self, ledger: CostLedger, page_number: int) -> None:
+    self.ledger = ledger
+    self.page_number = page_number
+
+  def begin(self, model_id: str) -> float:
+    return self.ledger.begin(model_id)
+
+  def release(self, hold: float) -> None:
+    self.ledger.release(hold)
+
+  def record(self, model_id: str, usage: Any, hold: float = 0.0) -> Dict[str, int]:
+    return self.ledger.record(model_id, usage, hold, page=self.page_number)
@@ -0,0 +1,113 @@
+"""Margin trimming for rendered pages.
+
+Responsibilities:
+- Detect a page's content box: pixels that differ from the paper color
+  (the most common border value), on a downsampled grayscale copy.
+- Save a padded crop of that box next to the page image when it removes
+  enough area to be worth re-encoding; the crop is what the model sees.
+- Map normalized bboxes from crop coordinates back to the full page, so
+  review, composition and overlays only ever see full-page coordinates.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageChops
+
+from .images import RenderedPage
+
+PixelBox = Tuple[int, int, int, int]
+
+_THRESHOLD = 24  # gray levels from the paper color that count as content
+_SAMPLE = 4  # downsampling factor for detection
+_PADDING = 0.02  # of the page's longer side
+_MIN_SAVING = 0.1  # crop only when it removes at least this share of the area
+
+
+def content_box(img: Image.Image, threshold: int = _THRESHOLD) -> Optional[PixelBox]:
+  """Pixel box around non-background content, or None for a blank page."""
+  gray = img.convert("L")
+  factor = _SAMPLE if min(gray.size) >= _SAMPLE * 32 else 1
+  small = gray.reduce(factor) if factor > 1 else gray
+  w, h = small.size
+  histogram = [0] * 256
+  for strip in (
+    small.crop((0, 0, w, 2)),
+    small.crop((0, h - 2, w, h)),
+    small.crop((0, 0, 2, h)),
+    small.crop((w - 2, 0, w, h)),
+  ):
+    for value, count in enumerate(strip.histogram()):
+      histogram[value] += count
+  paper = max(range(256), key=histogram.__getitem__)
+  diff = ImageChops.difference(small, Image.new("L", small.size, paper))
+  found = diff.point(lambda v: 255 if v > threshold else 0).getbbox()
+  if found is None:
+    return None
+  x0, y0, x1, y1 = found
+  return (
+    x0 * factor,
+    y0 * factor,
+    min(x1 * factor, gray.width),
+    min(y1 * factor, gray.height),
+  )
+
+
+def trim_margins(
+  rp: RenderedPage, padding: float = _PADDING, min_saving: float = _MIN_SAVING
+) -> RenderedPage:
+  """`rp` with `crop_path`/`crop_box` set when trimming saves enough area."""
+  with Image.open(rp.image_path) as img:
+    box = content_box(img)
+    if box is None:
+      return rp
+    pad = max(8, int(padding * max(img.width, img.height)))
+    x0, y0 = max(box[0] - pad, 0), max(box[1] - pad, 0)
+    x1, y1 = min(box[2] + pad, img.width), min(box[3] + pad, img.height)
+    if (x1 - x0) * (y1 - y0) > (1 - min_saving) * img.width * img.height:
+      return rp
+    crop_path = rp.image_path.with_name(f"{rp.image_path.stem}-crop.png")
+    img.crop((x0, y0, x1, y1)).save(crop_path.as_posix(), format="PNG")
+  return dataclasses.replace(rp, crop_path=crop_path, crop_box=(x0, y0, x1, y1))
+
+
+def vision_input(rp: RenderedPage) -> Tuple[Any, int, int]:
+  """Image path and pixel size to send to the model (the crop if any)."""
+  if rp.crop_path is None or rp.crop_box is None:
+    return rp.image_path, rp.width_px, rp.height_px
+  x0, y0, x1, y1 = rp.crop_box
+  return rp.crop_path, x1 - x0, y1 - y0
+
+
+def _to_page(bbox: Any, box: PixelBox, width: int, height: int) -> Any:
+  if not isinstance(bbox, list) or len(bbox) != 4:
+    return bbox
+  try:
+    values = [float(v) for v in bbox]
+  except (TypeError, ValueError):
+    return bbox
+  if not all(0.0 <= v <= 1.0 for v in values):
+    return bbox  # left for the reviewer to flag
+  x0, y0, x1, y1 = box
+  cw, ch = x1 - x0, y1 - y0
+  return [
+    round((x0 + values[0] * cw) / width, 6),
+    round((y0 + values[1] * ch) / height, 6),
+    round((x0 + values[2] * cw) / width, 6),
+    round((y0 + values[3] * ch) / height, 6),
+  ]
+
+
+def uncrop_page(page: Dict[str, Any], rp: RenderedPage) -> Dict[str, Any]:
+  """Remap a model answer for `rp`'s crop to full-page coordinates (in place)."""
+  if rp.crop_box is None:
+    return page
+  blocks: List[Any] = page.get("blocks") or []
+  for block in blocks:
+    if isinstance(block, dict) and "bbox" in block:
+      block["bbox"] = _to_page(block["bbox"], rp.crop_box, rp.width_px, rp.height_px)
+  page["width_px"] = rp.width_px
+  page["height_px"] = rp.height_px
+  return page
@@ -0,0 +1,76 @@
+"""Document deadlines and per-page timeouts.
+
+Responsibilities:
+- Bound each page's work by the document deadline and, from the moment its
+  first vision call holds a provider slot, by the per-page timeout (time
+  spent queueing for a slot does not count against the page).
+- Cancel in-flight work cooperatively when the bound passes: provider
+  calls, retry backoff and slot waits all see `CancelledError`, and the
+  cancellation surfaces as `DeadlineExceededError`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Optional, TypeVar
+
+from ..exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+
+class PageDeadline:
+  """Run one page's work until `deadline_at` (loop time) or its page timeout."""
+
+  def __init__(self, deadline_at: Optional[float], page_timeout_s: Optional[float] = None) -> None:
+    self.deadline_at = deadline_at
+    self.page_timeout_s = page_timeout_s
+    self.expired = False
+    self._expires_at = deadline_at
+    self._started = False
+    self._task: Optional["asyncio.Future[Any]"] = None
+    self._handle: Optional[asyncio.TimerHandle] = None
+
+  def start(self) -> None:
+    """Called before each dispatch: refuse once expired, else start the page clock."""
+    now = asyncio.get_running_loop().time()
+    if self._expires_at is not None and now >= self._expires_at:
+      self.expired = True
+      raise DeadlineExceededError(self._reason())
+    if self._started or self.page_timeout_s is None:
+      return
+    self._started = True
+    when = now + self.page_timeout_s
+    if self.deadline_at is not None:
+      when = min(when, self.deadline_at)
+    self._expires_at = when
+    self._schedule()
+
+  def _schedule(self) -> None:
+    if self._handle is not None:
+      self._handle.cancel()
+      self._handle = None
+    if self._task is not None and self._expires_at is not None:
+      self._handle = asyncio.get_running_loop().call_at(self._expires_at, self._expire)
+
+  def _expire(self) -> None:
+    self.expired = True
+    if self._task is not None and not self._task.done():
+      self._task.cancel()
+
+  def _reason(self) -> str:
+    return "page timeout" if self._expires_at != self.deadline_at else "document deadline"
+
+  async def run(self, work: Awaitable[T]) -> T:
+    """Await `work`, raising `DeadlineExceededError` if it is cut off."""
+    self._task = asyncio.ensure_future(work)
+    self._schedule()
+    try:
+      return await self._task
+    except asyncio.CancelledError:
+      if self.expired:
+        raise DeadlineExceededError(self._reason()) from None
+      raise
+    finally:
+      if self._handle is not None:
+        self._handle.cancel()
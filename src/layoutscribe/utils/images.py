@@ -9,10 +9,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
 from ..exceptions import RenderingError
 
+if TYPE_CHECKING:
+  from .render_cache import RenderCache
+
 
 @dataclass(frozen=True)
 class RenderedPage:
@@ -21,49 +24,123 @@ class RenderedPage:
   width_px: int
   height_px: int
   text: str = ""
+  # Cheap layout signals for scheduling (see `agents.scheduler`); PDF only.
+  drawings: int = 0
+  images: int = 0
+  # Margin-trimmed crop sent to the model instead of the page (see `utils.crop`).
+  crop_path: Optional[Path] = None
+  crop_box: Optional[Tuple[int, int, int, int]] = None
 
 
 def render_pdf_to_images(
-  path: Path, dpi: int, temp_dir: Path, selected_pages: Optional[List[int]] = None
+  path: Path,
+  dpi: int,
+  temp_dir: Path,
+  selected_pages: Optional[List[int]] = None,
+  cache: Optional["RenderCache"] = None,
 ) -> List[RenderedPage]:
   """Render a PDF into page images at the given DPI using PyMuPDF.
 
   selected_pages: 1-based page indices to render; if None, render all pages.
+  With `cache`, pages rendered before (by content hash, DPI and renderer)
+  are linked from it and new ones are added; a fully cached selection
+  never opens the PDF.
   """
   try:
     import fitz  # PyMuPDF
   except Exception as exc:  # pragma: no cover
     raise RenderingError("PyMuPDF (fitz) is required to render PDFs") from exc
 
-  try:
-    doc = fitz.open(path.as_posix())
-  except Exception as exc:  # pragma: no cover
-    raise RenderingError(f"Failed to open PDF: {path}") from exc
+  doc = None
+
+  def _open() -> Any:
+    try:
+      return fitz.open(path.as_posix())
+    except Exception as exc:  # pragma: no cover
+      raise RenderingError(f"Failed to open PDF: {path}") from exc
+
+  key = variant = ""
+  total: Optional[int] = None
+  if cache is not None:
+    from .render_cache import RENDER_VERSION
+
+    key = cache.document_key(path)
+    variant = f"{dpi}dpi-rgb-mupdf{fitz.VersionBind}-v{RENDER_VERSION}"
+    total = cache.page_count(key)
+  if total is None:
+    doc = _open()
+    total = len(doc)
+    if cache is not None:
+      cache.set_page_count(key, total)
 
   rendered: List[RenderedPage] = []
   pages_iter = (
-    [p - 1 for p in selected_pages if 1 <= p <= len(doc)] if selected_pages else range(len(doc))
+    [p - 1 for p in selected_pages if 1 <= p <= total] if selected_pages else range(total)
   )
   for i in pages_iter:
+    out_path = temp_dir / f"page-{i+1:04d}.png"
+    cached = cache.get(key, variant, i, out_path) if cache is not None else None
+    if cached is not None:
+      rendered.append(cached)
+      continue
+    if doc is None:
+      doc = _open()
     page = doc.load_page(i)
     zoom = dpi / 72.0
     mat = fitz.Matrix(zoom, zoom)
     pix = page.get_pixmap(matrix=mat, alpha=False)
-    out_path = temp_dir / f"page-{i+1:04d}.png"
     pix.save(out_path.as_posix())
-    rendered.append(
-      RenderedPage(
-        index0=i,
-        image_path=out_path,
-        width_px=pix.width,
-        height_px=pix.height,
-        text=(page.get_text("text") or "").strip(),
-      )
+    rp = RenderedPage(
+      index0=i,
+      image_path=out_path,
+      width_px=pix.width,
+      height_px=pix.height,
+      text=(page.get_text("text") or "").strip(),
+      drawings=len(page.get_cdrawings()),
+      images=len(page.get_images()),
     )
-  doc.close()
+    if cache is not None:
+      cache.put(key, variant, rp)
+    rendered.append(rp)
+  if doc is not None:
+    doc.close()
   return rendered
 
 
+def pdf_text_layer(path: Path, dpi: int, pages: List[int]) -> List[RenderedPage]:
+  """Text layer and pixel size of 0-based `pages`, without rasterizing them.
+
+  Used for text-layer fallbacks of pages whose vision work failed
+  elsewhere; `image_path` is the PDF itself, as no image is written.
+  """
+  try:
+    import fitz  # PyMuPDF
+  except Exception as exc:  # pragma: no cover
+    raise RenderingError("PyMuPDF (fitz) is required to read PDFs") from exc
+  try:
+    doc = fitz.open(path.as_posix())
+  except Exception as exc:
+    raise RenderingError(f"Failed to open PDF: {path}") from exc
+  zoom = dpi / 72.0
+  out: List[RenderedPage] = []
+  with doc:
+    for i in pages:
+      if not 0 <= i < len(doc):
+        continue
+      page = doc.load_page(i)
+      size = (page.rect * fitz.Matrix(zoom, zoom)).irect
+      out.append(
+        RenderedPage(
+          index0=i,
+          image_path=path,
+          width_px=size.width,
+          height_px=size.height,
+          text=(page.get_text("text") or "").strip(),
+        )
+      )
+  return out
+
+
 def pdf_num_pages(path: Path) -> int:
   try:
     import fitz  # PyMuPDF
@@ -3,13 +3,17 @@
 Responsibilities:
 - Manage temp directories, artifact output paths, and cleanup policies.
 - Provide helpers for saving overlays and intermediate JSON when enabled.
+- Provide an `ArtifactSink` so pipeline stages write each artifact once,
+  atomically, to its final location.
 """
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Dict, Iterator, List, Literal, Optional
 import json
+import os
 import tempfile
 import shutil
 
@@ -17,6 +21,10 @@ if TYPE_CHECKING:
   from ..types import ParsedDocument
 
 
+TempRetention = Literal["delete", "keep", "on_error"]
+TEMP_RETENTION_POLICIES = ("delete", "keep", "on_error")
+
+
 def ensure_dir(path: Path) -> Path:
   path.mkdir(parents=True, exist_ok=True)
   return path
@@ -31,19 +39,41 @@ def create_temp_dir(prefix: str = "layoutscribe_") -> Path:
   return Path(tempfile.mkdtemp(prefix=prefix))
 
 
+@contextmanager
+def atomic_path(dest: Path) -> Iterator[Path]:
+  """Yield a sibling temp path that is renamed onto `dest` on success.
+
+  Readers never observe a partially written file; on failure the temp
+  file is removed and `dest` is left untouched.
+  """
+  ensure_dir(dest.parent)
+  fd, tmp_name = tempfile.mkstemp(
+    prefix=f".{dest.name}.", suffix=f".part{dest.suffix}", dir=dest.parent
+  )
+  os.close(fd)
+  tmp = Path(tmp_name)
+  try:
+    yield tmp
+    os.replace(tmp, dest)
+  finally:
+    if tmp.exists():
+      tmp.unlink()
+
+
 def write_text(path: Path, content: str) -> None:
-  ensure_dir(path.parent)
-  with path.open("w", encoding="utf-8") as f:
-    f.write(content)
+  with atomic_path(path) as tmp:
+    with tmp.open("w", encoding="utf-8") as f:
+      f.write(content)
 
 
 def write_json(path: Path, data: dict) -> None:
-  ensure_dir(path.parent)
-  with path.open("w", encoding="utf-8") as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
+  with atomic_path(path) as tmp:
+    with tmp.open("w", encoding="utf-8") as f:
+      json.dump(data, f, indent=2, ensure_ascii=False)
 
 
-def parse_pages_spec(spec: str, total_pages: int) -> List[int]:
+def parse_pages_spec(spec: str, total_pages: Optional[int] = None) -> List[int]:
+  """1-based page numbers in `spec` (e.g. `1-3,7`); None means no known upper bound."""
   pages: List[int] = []
   for part in spec.split(","):
     part = part.strip()
@@ -56,16 +86,120 @@ def parse_pages_spec(spec: str, total_pages: int) -> List[int]:
       if start > end:
         start, end = end, start
       for p in range(start, end + 1):
-        if 1 <= p <= total_pages:
+        if 1 <= p and (total_pages is None or p <= total_pages):
           pages.append(p)
     else:
       p = int(part)
-      if 1 <= p <= total_pages:
+      if 1 <= p and (total_pages is None or p <= total_pages):
         pages.append(p)
   # de-duplicate and sort
   return sorted(set(pages))
 
 
+class ArtifactSink:
+  """Single destination for the artifacts of one run.
+
+  Persisted artifacts (overlays, intermediate JSON, primary outputs) are
+  written directly under `output_dir`. Scratch files such as rendered page
+  images go to a lazily created temp dir that is cleaned up on `close()`
+  according to `retention`:
+
+  - `delete`: always remove scratch files.
+  - `keep`: leave the temp dir in place (debugging).
+  - `on_error`: keep the temp dir only when the run failed.
+
+  Without an `output_dir`, requested overlays/intermediate JSON are
+  written inside the temp dir and survive cleanup so callers can read
+  them; rendered pages are still removed.
+  """
+
+  def __init__(
+    self, output_dir: Optional[Path] = None, retention: TempRetention = "delete"
+  ) -> None:
+    if retention not in TEMP_RETENTION_POLICIES:
+      raise ValueError(
+        f"Unknown temp retention '{retention}'. Choose from {', '.join(TEMP_RETENTION_POLICIES)}."
+      )
+    self.output_dir = output_dir
+    self.retention = retention
+    self.manifest: Dict[str, List[str]] = {"primary": [], "overlays": [], "intermediate": []}
+    self._temp_dir: Optional[Path] = None
+    self._temp_artifacts = False
+
+  @property
+  def temp_dir(self) -> Path:
+    if self._temp_dir is None:
+      self._temp_dir = create_temp_dir()
+    return self._temp_dir
+
+  @property
+  def scratch_dir(self) -> Path:
+    """Directory for rendered page images and other disposable files."""
+    return ensure_dir(self.temp_dir / "render")
+
+  @property
+  def root(self) -> Path:
+    return self.output_dir if self.output_dir is not None else self.temp_dir
+
+  def dir_for(self, kind: str, persist: bool = True) -> Path:
+    """Return the directory for an artifact kind (e.g. `overlays`).
+
+    Non-persisted artifacts (e.g. overlays drawn only for tracing) land in
+    the temp dir even when an `output_dir` is set.
+    """
+    base = self.root if persist else self.temp_dir
+    if base == self.temp_dir:
+      self._temp_artifacts = True
+    return ensure_dir(base / kind)
+
+  def primary_path(self, name: str) -> Path:
+    """Final path for a streamed primary output such as `layout.jsonl`."""
+    if self.output_dir is None:
+      self._temp_artifacts = True
+    return ensure_dir(self.root) / name
+
+  def record(self, kind: str, path: Path) -> None:
+    self.manifest.setdefault(kind, []).append(path.as_posix())
+
+  def write_json(self, kind: str, name: str, data: dict, persist: bool = True) -> Path:
+    dest = self.dir_for(kind, persist) / name
+    write_json(dest, data)
+    self.record(kind, dest)
+    return dest
+
+  def export(self, doc: "ParsedDocument", outputs: List[str]) -> Dict[str, List[str]]:
+    """Write primary outputs once into `output_dir` and return the manifest."""
+    if self.output_dir is None:
+      return self.manifest
+    ensure_dir(self.output_dir)
+    layout = doc.layout_dict() if "layout_json" in outputs else None
+    if layout is not None:
+      layout_path = self.output_dir / "layout.json"
+      write_json(layout_path, layout)
+      self.record("primary", layout_path)
+    if "markdown" in outputs and doc.markdown:
+      md_path = self.output_dir / "document.md"
+      write_text(md_path, doc.markdown)
+      self.record("primary", md_path)
+    if "text" in outputs and doc.text:
+      txt_path = self.output_dir / "document.txt"
+      write_text(txt_path, doc.text)
+      self.record("primary", txt_path)
+    return self.manifest
+
+  def close(self, failed: bool = False) -> None:
+    """Apply the retention policy to the temp dir."""
+    if self._temp_dir is None:
+      return
+    if self.retention == "keep" or (self.retention == "on_error" and failed):
+      return
+    if self.output_dir is None and self._temp_artifacts:
+      shutil.rmtree(self._temp_dir / "render", ignore_errors=True)
+      return
+    shutil.rmtree(self._temp_dir, ignore_errors=True)
+    self._temp_dir = None
+
+
 def export_outputs(
   doc: "ParsedDocument",
   outputs: List[str],
@@ -73,61 +207,33 @@ def export_outputs(
   save_overlays: bool = False,
   save_intermediate: bool = False,
 ) -> Dict[str, List[str]]:
-  """Write selected outputs to disk and optionally export overlays/intermediate."""
-
-  ensure_dir(target_dir)
-  manifest: Dict[str, List[str]] = {"primary": [], "overlays": [], "intermediate": []}
-
-  if "layout_json" in outputs and doc.layout_json is not None:
-    layout_path = target_dir / "layout.json"
-    data = doc.layout_json.model_dump() if hasattr(doc.layout_json, "model_dump") else doc.layout_json  # type: ignore[union-attr]
-    write_json(layout_path, data)  # type: ignore[arg-type]
-    manifest["primary"].append(layout_path.as_posix())
-
-  if "markdown" in outputs and doc.markdown:
-    md_path = target_dir / "document.md"
-    write_text(md_path, doc.markdown)
-    manifest["primary"].append(md_path.as_posix())
-
-  if "text" in outputs and doc.text:
-    txt_path = target_dir / "document.txt"
-    write_text(txt_path, doc.text)
-    manifest["primary"].append(txt_path.as_posix())
-
-  overlay_sources: List[Path] = []
-  if doc.overlays_dir:
-    overlay_dir = Path(doc.overlays_dir)
-    if overlay_dir.exists() and overlay_dir.is_dir():
-      overlay_sources = sorted(overlay_dir.glob("*.png"))
-
-  if overlay_sources:
-    if save_overlays:
-      overlays_target = target_dir / "overlays"
-      ensure_dir(overlays_target)
-      for src in overlay_sources:
-        dest = overlays_target / src.name
-        shutil.copy2(src, dest)
-        manifest["overlays"].append(dest.as_posix())
-    else:
-      manifest["overlays"].extend(path.as_posix() for path in overlay_sources)
-
-  intermediate_sources: List[Path] = []
-  if doc.intermediate_dir:
-    interm_dir = Path(doc.intermediate_dir)
-    if interm_dir.exists() and interm_dir.is_dir():
-      intermediate_sources = sorted(interm_dir.glob("*.json"))
-
-  if intermediate_sources:
-    if save_intermediate:
-      intermediate_target = target_dir / "intermediate"
-      ensure_dir(intermediate_target)
-      for src in intermediate_sources:
-        dest = intermediate_target / src.name
-        shutil.copy2(src, dest)
-        manifest["intermediate"].append(dest.as_posix())
-    else:
-      manifest["intermediate"].extend(path.as_posix() for path in intermediate_sources)
+  """Write selected outputs to disk and optionally export overlays/intermediate.
 
-  return manifest
+  Prefer passing `output_dir` to `api.parse`, which writes artifacts in
+  place through an `ArtifactSink`. This helper exists for documents parsed
+  without one; sources already under `target_dir` are not copied again.
+  """
 
+  sink = ArtifactSink(target_dir)
+  manifest = sink.export(doc, outputs)
 
+  for kind, source_dir, pattern, persist in (
+    ("overlays", doc.overlays_dir, "*.png", save_overlays),
+    ("intermediate", doc.intermediate_dir, "*.json", save_intermediate),
+  ):
+    if not source_dir:
+      continue
+    src_dir = Path(source_dir)
+    if not (src_dir.exists() and src_dir.is_dir()):
+      continue
+    for src in sorted(src_dir.glob(pattern)):
+      if not persist:
+        manifest[kind].append(src.as_posix())
+        continue
+      dest = target_dir / kind / src.name
+      if src.resolve() != dest.resolve():
+        with atomic_path(dest) as tmp:
+          shutil.copy2(src, tmp)
+      manifest[kind].append(dest.as_posix())
+
+  return manifest
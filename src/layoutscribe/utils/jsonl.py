@@ -0,0 +1,171 @@
+"""Streaming JSONL layout output with a random-access page index.
+
+Responsibilities:
+- Write one page per line to `layout.jsonl` as pages complete (in any
+  order), plus a compact binary offset index `layout.jsonl.idx`.
+- Read page N in O(1) by memory-mapping the JSONL file and slicing at the
+  indexed offset, without loading the rest of the document.
+- Serialize with `orjson` when installed, falling back to `json`.
+
+Index format: a sequence of little-endian `(page_number: u32, offset: u64,
+length: u32)` records, one per written page, in write order.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .io import ensure_dir
+
+try:
+  import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+  orjson = None
+
+INDEX_RECORD = struct.Struct("<IQI")
+INDEX_SUFFIX = ".idx"
+
+
+def dumps_json(data: Any) -> bytes:
+  """Compact single-line JSON bytes using the fastest available encoder."""
+  if orjson is not None:
+    return orjson.dumps(data)
+  return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(raw: bytes) -> Any:
+  if orjson is not None:
+    return orjson.loads(raw)
+  return json.loads(raw)
+
+
+def index_path_for(path: Path) -> Path:
+  return path.with_name(path.name + INDEX_SUFFIX)
+
+
+class LayoutJsonlWriter:
+  """Append pages to a JSONL file as they complete.
+
+  Data and index are written to `.part` files and atomically renamed into
+  place by `close()`, so readers never see a half-written document.
+  """
+
+  def __init__(self, path: Path) -> None:
+    ensure_dir(path.parent)
+    self.path = path
+    self.index_path = index_path_for(path)
+    self._data_part = path.with_name(f".{path.name}.part")
+    self._index_part = path.with_name(f".{self.index_path.name}.part")
+    self._data = self._data_part.open("wb")
+    self._index = self._index_part.open("wb")
+    self._offset = 0
+    self.pages_written = 0
+
+  def write_page(self, page: Dict[str, Any]) -> None:
+    line = dumps_json(page) + b"\n"
+    self._data.write(line)
+    self._index.write(INDEX_RECORD.pack(int(page["page_number"]), self._offset, len(line) - 1))
+    self._offset += len(line)
+    self.pages_written += 1
+
+  def close(self, commit: bool = True) -> None:
+    if self._data.closed:
+      return
+    self._data.close()
+    self._index.close()
+    if commit:
+      os.replace(self._data_part, self.path)
+      os.replace(self._index_part, self.index_path)
+    else:
+      self._data_part.unlink(missing_ok=True)
+      self._index_part.unlink(missing_ok=True)
+
+  def __enter__(self) -> "LayoutJsonlWriter":
+    return self
+
+  def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+    self.close(commit=exc_type is None)
+
+
+class LayoutJsonlReader:
+  """Random-access reader over `layout.jsonl` and its offset index.
+
+  If the index file is missing, it is rebuilt in memory with one scan.
+  """
+
+  def __init__(self, path: Path) -> None:
+    self.path = Path(path)
+    self._file = self.path.open("rb")
+    size = os.fstat(self._file.fileno()).st_size
+    self._mm: Optional[mmap.mmap] = (
+      mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+    )
+    self._entries: Dict[int, Tuple[int, int]] = {}
+    index_path = index_path_for(self.path)
+    if index_path.exists():
+      raw = index_path.read_bytes()
+      for page_number, offset, length in INDEX_RECORD.iter_unpack(raw):
+        self._entries[page_number] = (offset, length)
+    else:
+      self._rebuild_index()
+
+  def _rebuild_index(self) -> None:
+    if self._mm is None:
+      return
+    offset = 0
+    while offset < len(self._mm):
+      end = self._mm.find(b"\n", offset)
+      if end == -1:
+        end = len(self._mm)
+      if end > offset:
+        page = loads_json(self._mm[offset:end])
+        self._entries[int(page["page_number"])] = (offset, end - offset)
+      offset = end + 1
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def page_numbers(self) -> List[int]:
+    return sorted(self._entries)
+
+  def raw_page(self, page_number: int) -> bytes:
+    """Return the serialized JSON for one page without decoding it."""
+    try:
+      offset, length = self._entries[page_number]
+    except KeyError as exc:
+      raise KeyError(f"page {page_number} not in {self.path}") from exc
+    assert self._mm is not None
+    return self._mm[offset : offset + length]
+
+  def page(self, page_number: int) -> Dict[str, Any]:
+    return loads_json(self.raw_page(page_number))
+
+  def __iter__(self) -> Iterator[Dict[str, Any]]:
+    for page_number in self.page_numbers():
+      yield self.page(page_number)
+
+  def close(self) -> None:
+    if self._mm is not None:
+      self._mm.close()
+      self._mm = None
+    self._file.close()
+
+  def __enter__(self) -> "LayoutJsonlReader":
+    return self
+
+  def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+    self.close()
+
+
+__all__ = [
+  "LayoutJsonlReader",
+  "LayoutJsonlWriter",
+  "dumps_json",
+  "index_path_for",
+  "loads_json",
+]
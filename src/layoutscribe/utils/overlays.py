@@ -62,7 +62,8 @@ def draw_overlays(
     color = _color_for(btype)
     draw.rectangle([(rx0, ry0), (rx1, ry1)], outline=color, width=2)
     if font:
-      tw, th = draw.textsize(label, font=font)
+      left, top, right, bottom = draw.textbbox((0, 0), label, font=font)
+      tw, th = right - left, bottom - top
       draw.rectangle([(rx0, ry0 - th - 2), (rx0 + tw + 4, ry0)], fill=color)
       draw.text((rx0 + 2, ry0 - th - 1), label, fill=(255, 255, 255), font=font)
 
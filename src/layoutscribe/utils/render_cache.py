@@ -0,0 +1,175 @@
+"""Persistent cache of rendered PDF pages.
+
+Responsibilities:
+- Key pages by the SHA-256 of the input file's bytes, the page index and a
+  render variant (DPI, color mode, renderer version), so a re-run or a run
+  with another model reuses pages even if the file was copied or renamed.
+- Store each page's PNG with a JSON sidecar (size, text layer, scheduling
+  signals), and each document's page count, so a fully cached document is
+  never opened.
+- Hand out hard links (or copies) into the run's scratch dir, so later
+  stages can write next to the image and eviction never pulls a file from
+  under a running job.
+- Evict least recently used pages once the cache exceeds its size limit.
+
+Writes go through `.part` files and atomic renames; the sidecar is written
+last and marks an entry complete, so concurrent workers can share a cache.
+
+Layout: `<root>/<hash[:2]>/<hash>/pages.json` and
+`<root>/<hash[:2]>/<hash>/<variant>/page-NNNN.{png,json}`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .images import RenderedPage
+from .io import ensure_dir
+
+DEFAULT_MAX_BYTES = 2048 * 1024**2
+# Bump when rendering changes in a way the variant does not capture.
+RENDER_VERSION = 1
+
+_HASH_CHUNK = 1 << 20
+
+
+def _atomic_write(dest: Path, data: bytes) -> None:
+  tmp = dest.with_name(f".{dest.name}.{os.getpid()}.part")
+  try:
+    tmp.write_bytes(data)
+    os.replace(tmp, dest)
+  finally:
+    tmp.unlink(missing_ok=True)
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+  dest.unlink(missing_ok=True)
+  try:
+    os.link(src, dest)
+  except OSError:
+    shutil.copyfile(src, dest)
+
+
+class RenderCache:
+  """Rendered pages on disk, shared across runs, models and processes."""
+
+  def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    self.root = Path(root)
+    self.max_bytes = max_bytes
+    self.hits = 0
+    self.misses = 0
+    self._hashes: Dict[Tuple[str, int, int], str] = {}
+    self._size: Optional[int] = None  # bytes on disk, scanned on first write
+
+  def document_key(self, path: Path) -> str:
+    """SHA-256 of the file's bytes, memoized per path, size and mtime."""
+    stat = path.stat()
+    memo = (path.resolve().as_posix(), stat.st_size, stat.st_mtime_ns)
+    key = self._hashes.get(memo)
+    if key is None:
+      digest = hashlib.sha256()
+      with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+          digest.update(chunk)
+      key = self._hashes[memo] = digest.hexdigest()
+    return key
+
+  def _doc_dir(self, key: str) -> Path:
+    return self.root / key[:2] / key
+
+  def page_count(self, key: str) -> Optional[int]:
+    try:
+      return int(json.loads((self._doc_dir(key) / "pages.json").read_text())["pages"])
+    except (OSError, ValueError, KeyError, TypeError):
+      return None
+
+  def set_page_count(self, key: str, pages: int) -> None:
+    doc_dir = ensure_dir(self._doc_dir(key))
+    _atomic_write(doc_dir / "pages.json", json.dumps({"pages": pages}).encode("utf-8"))
+
+  def _entry(self, key: str, variant: str, index0: int) -> Tuple[Path, Path]:
+    base = self._doc_dir(key) / variant / f"page-{index0 + 1:04d}"
+    return base.with_suffix(".png"), base.with_suffix(".json")
+
+  def get(self, key: str, variant: str, index0: int, dest: Path) -> Optional[RenderedPage]:
+    """Link a cached page to `dest`, or None on a miss."""
+    png, meta_path = self._entry(key, variant, index0)
+    try:
+      meta: Dict[str, Any] = json.loads(meta_path.read_text(encoding="utf-8"))
+      _link_or_copy(png, dest)
+      os.utime(meta_path)  # recency for eviction
+    except (OSError, ValueError):
+      self.misses += 1
+      return None
+    self.hits += 1
+    return RenderedPage(
+      index0=index0,
+      image_path=dest,
+      width_px=int(meta["width_px"]),
+      height_px=int(meta["height_px"]),
+      text=str(meta.get("text", "")),
+      drawings=int(meta.get("drawings", 0)),
+      images=int(meta.get("images", 0)),
+    )
+
+  def put(self, key: str, variant: str, rp: RenderedPage) -> None:
+    png, meta_path = self._entry(key, variant, rp.index0)
+    ensure_dir(png.parent)
+    _atomic_write(png, rp.image_path.read_bytes())
+    meta = {
+      "width_px": rp.width_px,
+      "height_px": rp.height_px,
+      "text": rp.text,
+      "drawings": rp.drawings,
+      "images": rp.images,
+    }
+    data = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    _atomic_write(meta_path, data)
+    if self._size is None:
+      self._size = self._scan()[1]
+    else:
+      self._size += png.stat().st_size + len(data)
+    if self._size > self.max_bytes:
+      self.evict()
+
+  def _scan(self) -> Tuple[List[Tuple[float, int, Path, Path]], int]:
+    entries: List[Tuple[float, int, Path, Path]] = []
+    total = 0
+    for meta_path in self.root.glob("*/*/*/page-*.json"):
+      png = meta_path.with_suffix(".png")
+      try:
+        meta_stat = meta_path.stat()
+        size = meta_stat.st_size + png.stat().st_size
+      except OSError:
+        continue
+      entries.append((meta_stat.st_mtime, size, meta_path, png))
+      total += size
+    return entries, total
+
+  def evict(self) -> int:
+    """Drop least recently used pages until under `max_bytes`; returns bytes freed.
+
+    Sizes are rescanned, since other processes may share the cache.
+    """
+    entries, total = self._scan()
+    freed = 0
+    entries.sort()
+    for _, size, meta_path, png in entries:
+      if total - freed <= self.max_bytes:
+        break
+      meta_path.unlink(missing_ok=True)  # sidecar first: the entry stops being a hit
+      png.unlink(missing_ok=True)
+      freed += size
+    self._size = total - freed
+    return freed
+
+  def stats(self) -> Dict[str, int]:
+    return {"hits": self.hits, "misses": self.misses}
+
+
+__all__ = ["DEFAULT_MAX_BYTES", "RENDER_VERSION", "RenderCache"]
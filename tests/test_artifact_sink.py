@@ -0,0 +1,95 @@
+import json
+import shutil
+
+import pytest
+
+from layoutscribe.layout.store import BlockStore
+from layoutscribe.types import ParsedDocument
+from layoutscribe.utils.io import ArtifactSink, atomic_path
+
+PAGES = [
+  {
+    "page_number": 1,
+    "width_px": 100,
+    "height_px": 100,
+    "blocks": [{"id": "b1", "type": "paragraph", "bbox": [0.1, 0.1, 0.9, 0.2], "text": "Hi"}],
+  }
+]
+
+
+def _doc():
+  return ParsedDocument(markdown="# Hi\n", text="Hi\n", layout_store=BlockStore.from_pages(PAGES))
+
+
+def test_export_records_outputs_and_close_keeps_them(tmp_path):
+  out = tmp_path / "out"
+  sink = ArtifactSink(out)
+  (sink.scratch_dir / "page-0001.png").write_bytes(b"png")
+  overlay = sink.write_json("overlays", "page-0001.json", {"n": 1})
+  manifest = sink.export(_doc(), ["markdown", "text", "layout_json"])
+  scratch = sink.temp_dir
+  sink.close()
+
+  names = ("layout.json", "document.md", "document.txt")
+  assert manifest["primary"] == [(out / name).as_posix() for name in names]
+  assert manifest["overlays"] == [overlay.as_posix()] and overlay.parent == out / "overlays"
+  assert json.loads((out / "layout.json").read_text())["pages"][0]["blocks"][0]["text"] == "Hi"
+  assert (out / "document.md").read_text() == "# Hi\n"
+  assert not scratch.exists()
+  assert sorted(p.name for p in out.iterdir()) == [
+    "document.md",
+    "document.txt",
+    "layout.json",
+    "overlays",
+  ]
+
+
+@pytest.mark.parametrize(
+  "retention, failed, kept",
+  [
+    ("delete", False, False),
+    ("delete", True, False),
+    ("keep", False, True),
+    ("keep", True, True),
+    ("on_error", False, False),
+    ("on_error", True, True),
+  ],
+)
+def test_retention_policies(tmp_path, retention, failed, kept):
+  sink = ArtifactSink(tmp_path / "out", retention=retention)
+  page = sink.scratch_dir / "page-0001.png"
+  page.write_bytes(b"png")
+  sink.close(failed=failed)
+  assert page.exists() is kept
+  if kept:
+    shutil.rmtree(sink.temp_dir)
+
+
+def test_temp_artifacts_survive_without_output_dir(tmp_path):
+  sink = ArtifactSink()
+  (sink.scratch_dir / "page-0001.png").write_bytes(b"png")
+  overlay = sink.write_json("overlays", "page-0001.json", {"n": 1})
+  sink.close()
+  assert overlay.exists() and not (sink.temp_dir / "render").exists()
+
+
+def test_unknown_retention_is_rejected():
+  with pytest.raises(ValueError, match="Unknown temp retention 'sometimes'"):
+    ArtifactSink(retention="sometimes")  # type: ignore[arg-type]
+
+
+def test_atomic_path_keeps_old_file_when_the_write_fails(tmp_path):
+  dest = tmp_path / "layout.json"
+  dest.write_text("old")
+  with pytest.raises(RuntimeError):
+    with atomic_path(dest) as part:
+      part.write_text("half")
+      raise RuntimeError("disk full")
+  assert dest.read_text() == "old"
+  assert [p.name for p in tmp_path.iterdir()] == ["layout.json"]
+
+  with atomic_path(dest) as part:
+    assert part.parent == tmp_path and part.name.startswith(".layout.json.")
+    part.write_text("new")
+  assert dest.read_text() == "new"
+  assert [p.name for p in tmp_path.iterdir()] == ["layout.json"]
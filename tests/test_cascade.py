@@ -0,0 +1,46 @@
+import asyncio
+
+from layoutscribe.agents.cascade import Cascade, ModelTier, parse_tier
+
+
+def _page(conf):
+  return {"blocks": [{"id": "b1", "conf": conf}, {"id": "b2", "conf": None}]}
+
+
+def test_parse_tier_keeps_model_ids_with_separators():
+  assert parse_tier("openai/gpt-4o", 0.02) == ModelTier("openai/gpt-4o", 0.02)
+  assert parse_tier("vertex_ai/claude@2024=0.5", 0.02) == ModelTier("vertex_ai/claude@2024", 0.5)
+
+
+def test_escalates_failing_and_low_confidence_pages_only():
+  answers = {"mini": {"ok": _page(0.9), "bad": _page(0.9), "unsure": _page(0.3)}}
+  tiers = [ModelTier("mini", 0.001), ModelTier("flagship", 0.02)]
+  cascade = Cascade(tiers, min_conf=0.5)
+
+  async def run(kind):
+    async def call(model):
+      return answers["mini"][kind] if model == "mini" else _page(0.95)
+
+    def review(page):
+      return ["bbox out of range"] if kind == "bad" and page is answers["mini"]["bad"] else []
+
+    return await cascade.run(call, review)
+
+  tiers_used = [asyncio.run(run(kind))[2] for kind in ("ok", "bad", "unsure", "ok")]
+  assert tiers_used == [0, 1, 1, 0]
+  assert cascade.stats() == [
+    {"model": "mini", "pages": 2, "calls": 4, "cost_usd": 0.004},
+    {"model": "flagship", "pages": 2, "calls": 2, "cost_usd": 0.04},
+  ]
+
+
+def test_refused_escalation_keeps_cheap_answer():
+  cascade = Cascade(
+    [ModelTier("mini", 0.0), ModelTier("flagship", 1.0)], may_escalate=lambda tier: False
+  )
+
+  async def call(model):
+    return _page(0.9)
+
+  page, errors, tier = asyncio.run(cascade.run(call, lambda page: ["missing required bbox"]))
+  assert tier == 0 and errors == ["missing required bbox"]
@@ -0,0 +1,90 @@
+import pytest
+
+from layoutscribe.layout.store import BlockStore
+from layoutscribe.utils.columnar import BlockDatasetWriter, append_blocks, scan_blocks
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+
+def _pages(title):
+  return [
+    {
+      "page_number": 1,
+      "width_px": 100,
+      "height_px": 200,
+      "blocks": [
+        {"id": "b1", "type": "heading", "bbox": [0.1, 0.1, 0.9, 0.2], "text": title, "level": 1},
+        {
+          "id": "b2",
+          "type": "table",
+          "bbox": [0.1, 0.3, 0.9, 0.6],
+          "table": {"rows": [["A", "B"], ["1", "2"]]},
+          "conf": 0.5,
+        },
+      ],
+    },
+    {
+      "page_number": 2,
+      "width_px": 100,
+      "height_px": 200,
+      "blocks": [{"id": "b1", "type": "paragraph", "bbox": [0.1, 0.1, 0.9, 0.5], "text": "Body"}],
+    },
+  ]
+
+
+def test_appended_documents_keep_column_types(tmp_path):
+  dataset = tmp_path / "blocks"
+  first = append_blocks(dataset, BlockStore.from_pages(_pages("Alpha")), "alpha")
+  with BlockDatasetWriter(dataset) as writer:
+    writer.append(BlockStore.from_pages(_pages("Beta")), "beta")
+  assert first.parent.name.startswith("dt=") and len(writer.files) == 1
+  assert not list(dataset.rglob(".*"))  # no leftover partial files
+
+  table = scan_blocks(dataset)
+  assert table.num_rows == 6
+  schema = table.schema
+  assert pa.types.is_dictionary(schema.field("type").type)
+  assert schema.field("bbox").type == pa.list_(pa.float32(), 4)
+  assert schema.field("table_rows").type == pa.list_(pa.list_(pa.string()))
+  assert sorted(set(table.column("doc_id").to_pylist())) == ["alpha", "beta"]
+
+
+def test_scan_filters_by_doc_and_type(tmp_path):
+  dataset = tmp_path / "blocks"
+  for doc_id in ("alpha", "beta"):
+    append_blocks(dataset, BlockStore.from_pages(_pages(doc_id.title())), doc_id)
+
+  tables = scan_blocks(
+    dataset,
+    filter=(ds.field("doc_id") == "beta") & (ds.field("type") == "table"),
+    columns=["doc_id", "page", "block_id", "bbox", "conf", "table_rows"],
+  ).to_pylist()
+  assert len(tables) == 1
+  row = tables[0]
+  assert (row["doc_id"], row["page"], row["block_id"]) == ("beta", 1, "b2")
+  assert row["bbox"] == pytest.approx([0.1, 0.3, 0.9, 0.6])
+  assert row["conf"] == pytest.approx(0.5)
+  assert row["table_rows"] == [["A", "B"], ["1", "2"]]
+
+  headings = scan_blocks(dataset, filter=ds.field("type") == "heading", columns=["text", "level"])
+  assert sorted(headings.column("text").to_pylist()) == ["Alpha", "Beta"]
+  assert headings.column("level").to_pylist() == [1, 1]
+
+
+def test_parse_appends_blocks_dataset(tmp_path):
+  import asyncio
+
+  import fitz
+
+  from layoutscribe.api import parse
+
+  pdf = fitz.open()
+  pdf.new_page().insert_text((72, 72), "Quarterly report")
+  pdf.save(tmp_path / "q.pdf")
+  dataset = tmp_path / "blocks"
+  doc = asyncio.run(
+    parse(str(tmp_path / "q.pdf"), ["markdown"], "fake/m", dpi=50, blocks_dataset=dataset)
+  )
+  table = scan_blocks(dataset, filter=ds.field("doc_id") == "q")
+  assert table.num_rows == doc.metadata.blocks_total > 0
@@ -0,0 +1,52 @@
+import json
+
+from layoutscribe.layout.validate import build_default_validator
+from layoutscribe.llm.compact import compact_page, expand_page
+from layoutscribe.llm.jsonstream import parse_page_json
+
+
+def _dense_page(n=40):
+  blocks = []
+  for i in range(n):
+    y = i / n
+    blocks.append(
+      {
+        "id": f"b{i + 1}",
+        "type": "paragraph",
+        "bbox": [0.08, round(y, 3), 0.92, round(y + 0.02, 3)],
+        "text": f"Line {i}",
+        "conf": 0.93,
+      }
+    )
+  blocks.append(
+    {
+      "id": f"b{n + 1}",
+      "type": "table",
+      "bbox": [0.1, 0.5, 0.9, 0.7],
+      "table": {"rows": [["Name", "a|b"], ["x\\y", "2"]]},
+      "conf": 0.8,
+    }
+  )
+  return {"page_number": 1, "width_px": 1000, "height_px": 1400, "blocks": blocks}
+
+
+def test_compact_round_trip_is_canonical_and_valid():
+  page = _dense_page()
+  wire = json.dumps(compact_page(page))
+  expanded = expand_page(parse_page_json(wire), 1000, 1400)
+  assert expanded == page
+  assert list(build_default_validator().iter_errors(expanded)) == []
+
+
+def test_compact_wire_is_much_smaller():
+  page = _dense_page()
+  full = json.dumps(page, separators=(",", ":"))
+  compact = json.dumps(compact_page(page), separators=(",", ":"))
+  assert len(compact) < 0.6 * len(full)
+
+
+def test_truncated_compact_answer_keeps_complete_blocks():
+  wire = json.dumps(compact_page(_dense_page(3)))
+  salvaged = expand_page(parse_page_json(wire[: wire.index("Line 2") - 5]), 800, 600)
+  assert [b["text"] for b in salvaged["blocks"]] == ["Line 0", "Line 1"]
+  assert salvaged["width_px"] == 800
@@ -0,0 +1,69 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from layoutscribe.exceptions import BudgetExceededError
+from layoutscribe.utils.cost import CostLedger, ModelPrice, PriceTable, parse_price
+
+SAMPLE = Path(__file__).resolve().parents[1] / "notebooks" / "samples" / "Praneeth_Paikray_2025.pdf"
+
+
+def test_price_covers_cached_and_completion_tokens():
+  price = ModelPrice(prompt_per_mtok=2.0, completion_per_mtok=8.0, cached_per_mtok=0.5)
+  counts = {
+    "prompt_tokens": 1_000_000,
+    "cached_prompt_tokens": 600_000,
+    "completion_tokens": 250_000,
+  }
+  assert price.cost_usd(counts) == pytest.approx(0.8 + 0.3 + 2.0)
+  assert parse_price("azure/gpt-4o=2.5,10,1.25") == ("azure/gpt-4o", ModelPrice(2.5, 10.0, 1.25))
+  with pytest.raises(ValueError):
+    parse_price("azure/gpt-4o=2.5")
+
+
+def test_ledger_attributes_cost_and_guards_budget():
+  prices = PriceTable({"m/priced": ModelPrice(1000.0, 1000.0)})
+  ledger = CostLedger(prices, budget_usd=2.4, default_call_usd=0.5)
+  hold = ledger.begin("m/priced")
+  assert ledger.pending_usd == 0.5
+  ledger.for_page(1).record("m/priced", {"prompt_tokens": 900, "completion_tokens": 100}, hold)
+  ledger.for_page(2).record("m/other", {"prompt_tokens": 10})
+  assert ledger.pending_usd == 0.0
+  assert ledger.page_totals(1) == {
+    "calls": 1,
+    "prompt_tokens": 900,
+    "completion_tokens": 100,
+    "cost_usd": 1.0,
+  }
+  assert ledger.summary()["cost_usd"] == 1.5
+  assert ledger.summary()["unpriced_calls"] == 1
+  # The next priced call is estimated at that model's mean actual cost.
+  assert not ledger.affordable("m/priced")
+  assert ledger.affordable("m/other")
+  with pytest.raises(BudgetExceededError):
+    ledger.require("m/priced")
+
+
+def test_parse_stops_before_dispatch_over_budget(tmp_path):
+  pytest.importorskip("fitz")
+  from layoutscribe.api import parse
+
+  kwargs = dict(outputs=["markdown"], llm="fake/m", provider_concurrency=1, output_dir=tmp_path)
+  doc = asyncio.run(parse(str(SAMPLE), **kwargs, prices=["fake/m=10,20"]))
+  assert doc.metadata.cost.calls == 2
+  assert doc.metadata.cost.cost_usd == pytest.approx(sum(p.cost_usd for p in doc.metadata.pages))
+  assert all(p.prompt_tokens for p in doc.metadata.pages)
+  # The budget covers one page: the other falls back to its text layer.
+  doc = asyncio.run(parse(str(SAMPLE), **kwargs, budget_usd=0.03, cost_per_page_usd=0.02))
+  statuses = {n: s.status for n, s in doc.metadata.page_status.items()}
+  assert sorted(statuses.values()) == ["ok", "skipped_budget"]
+  skipped = next(n for n, s in statuses.items() if s == "skipped_budget")
+  assert doc.metadata.page_status[skipped].error == "BudgetExceededError"
+  assert doc.metadata.cost.calls == 1 and doc.metadata.page_count == 2
+  assert doc.metadata.pages[skipped - 1].block_count  # text-layer fallback
+  with pytest.raises(BudgetExceededError):
+    asyncio.run(parse(str(SAMPLE), **kwargs, budget_usd=0.01, cost_per_page_usd=0.02))
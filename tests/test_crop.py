@@ -0,0 +1,54 @@
+from PIL import Image, ImageDraw
+
+from layoutscribe.utils.crop import trim_margins, uncrop_page, vision_input
+from layoutscribe.utils.images import RenderedPage
+from layoutscribe.utils.overlays import draw_overlays
+
+
+def _page(tmp_path, box=(300, 400, 900, 1000), size=(1200, 1600)):
+  img = Image.new("RGB", size, (250, 250, 250))
+  draw = ImageDraw.Draw(img)
+  draw.rectangle(box, fill=(20, 20, 20))
+  draw.point((5, 5), fill=(240, 240, 240))  # paper noise below the threshold
+  path = tmp_path / "page-0001.png"
+  img.save(path)
+  return RenderedPage(index0=0, image_path=path, width_px=size[0], height_px=size[1], text="")
+
+
+def test_crop_covers_content_with_padding(tmp_path):
+  rp = trim_margins(_page(tmp_path))
+  assert rp.crop_path is not None and rp.crop_path.exists()
+  x0, y0, x1, y1 = rp.crop_box
+  assert x0 <= 300 and y0 <= 400 and x1 >= 901 and y1 >= 1001
+  assert x0 >= 300 - 40 and y1 <= 1001 + 40
+  path, w, h = vision_input(rp)
+  assert path == rp.crop_path and Image.open(path).size == (w, h) == (x1 - x0, y1 - y0)
+
+
+def test_full_and_blank_pages_are_not_cropped(tmp_path):
+  assert trim_margins(_page(tmp_path, box=(10, 10, 1190, 1590))).crop_path is None
+  blank = _page(tmp_path, box=(0, 0, 0, 0))
+  Image.new("RGB", (1200, 1600), "white").save(blank.image_path)
+  assert trim_margins(blank).crop_path is None
+
+
+def test_bboxes_are_remapped_to_the_full_page(tmp_path):
+  rp = trim_margins(_page(tmp_path))
+  x0, y0, x1, y1 = rp.crop_box
+  page = {
+    "width_px": x1 - x0,
+    "height_px": y1 - y0,
+    "blocks": [{"bbox": [0.0, 0.0, 1.0, 1.0]}, {"bbox": [0.5, 0.5, 1.2, 1.0]}],
+  }
+  uncrop_page(page, rp)
+  assert page["blocks"][0]["bbox"] == [
+    round(x0 / 1200, 6),
+    round(y0 / 1600, 6),
+    round(x1 / 1200, 6),
+    round(y1 / 1600, 6),
+  ]
+  assert page["blocks"][1]["bbox"] == [0.5, 0.5, 1.2, 1.0]  # invalid: left for review
+  assert (page["width_px"], page["height_px"]) == (1200, 1600)
+  out = tmp_path / "overlay.png"
+  draw_overlays(rp.image_path, page, out)
+  assert Image.open(out).size == (1200, 1600)
@@ -0,0 +1,72 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from layoutscribe.exceptions import DeadlineExceededError
+from layoutscribe.llm.fake import fake_page
+from layoutscribe.utils.deadlines import PageDeadline
+
+SAMPLE = Path(__file__).resolve().parents[1] / "notebooks" / "samples" / "Praneeth_Paikray_2025.pdf"
+
+
+def test_page_clock_starts_at_first_dispatch():
+  async def main():
+    cancelled = asyncio.Event()
+
+    async def work(clock):
+      await asyncio.sleep(0.2)  # queueing for a slot: not on the page clock
+      clock.start()
+      try:
+        await asyncio.sleep(10)
+      except asyncio.CancelledError:
+        cancelled.set()
+        raise
+
+    clock = PageDeadline(None, page_timeout_s=0.1)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError, match="page timeout"):
+      await clock.run(work(clock))
+    assert 0.25 < time.monotonic() - started < 2
+    assert cancelled.is_set()
+
+    loop = asyncio.get_running_loop()
+    with pytest.raises(DeadlineExceededError, match="document deadline"):
+      await PageDeadline(loop.time() + 0.05, page_timeout_s=5).run(asyncio.sleep(10))
+    assert await PageDeadline(loop.time() + 5).run(asyncio.sleep(0, result="ok")) == "ok"
+
+  asyncio.run(main())
+
+
+def test_parse_returns_partial_document_at_page_timeout(tmp_path, monkeypatch):
+  pytest.importorskip("fitz")
+  from layoutscribe.agents import page_vision
+  from layoutscribe.api import parse
+
+  calls = []
+
+  async def hang_after_first(model, image_bytes, *args, **kwargs):
+    calls.append(model)
+    if len(calls) > 1:
+      await asyncio.sleep(60)
+    return fake_page(image_bytes)
+
+  monkeypatch.setattr(page_vision, "vision_json_call", hang_after_first)
+  started = time.monotonic()
+  doc = asyncio.run(
+    parse(
+      str(SAMPLE),
+      outputs=["markdown"],
+      llm="fake/m",
+      provider_concurrency=1,
+      page_timeout_s=0.5,
+      output_dir=tmp_path,
+    )
+  )
+  assert time.monotonic() - started < 10
+  meta = doc.metadata
+  assert meta.timed_out_pages == [2]
+  assert [p.timed_out for p in meta.pages] == [None, True]
+  assert meta.pages[0].text_preview.startswith("fake page")
+  assert meta.pages[1].text_preview and not meta.pages[1].text_preview.startswith("fake page")
@@ -0,0 +1,88 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from layoutscribe.distributed.coordinator import collect_document, submit_document
+from layoutscribe.distributed.queue import PageQueue
+from layoutscribe.distributed.worker import run_worker
+
+SAMPLE = Path(__file__).resolve().parents[1] / "notebooks" / "samples" / "Praneeth_Paikray_2025.pdf"
+
+
+def test_expired_lease_is_retried_and_first_completion_wins(tmp_path):
+  pytest.importorskip("fitz")
+  db = tmp_path / "queue.sqlite"
+  doc_id = submit_document(db, SAMPLE, "fake/model", pages_spec="1")
+  queue = PageQueue(db, lease_timeout_s=-1)
+  stale = queue.lease("crashed-worker")
+  fresh = queue.lease("live-worker")
+  assert stale.task == fresh.task and fresh.attempts == 2
+  assert queue.complete(fresh, {"page_number": 1, "blocks": []})
+  assert not queue.complete(stale, {"page_number": 1, "blocks": [{"id": "x"}]})
+  assert queue.results(doc_id)[0].page == {"page_number": 1, "blocks": []}
+  queue.close()
+
+
+def test_workers_and_coordinator_compose_document(tmp_path):
+  pytest.importorskip("fitz")
+  db = tmp_path / "queue.sqlite"
+  doc_id = submit_document(db, SAMPLE, "fake/model")
+
+  async def _two_workers():
+    return await asyncio.gather(
+      run_worker(db, concurrency=2, idle_exit_s=0, poll_s=0.01),
+      run_worker(db, concurrency=2, idle_exit_s=0, poll_s=0.01),
+    )
+
+  assert sum(asyncio.run(_two_workers())) == 2
+  out = tmp_path / "out"
+  doc = collect_document(db, doc_id, ["markdown", "layout_json"], output_dir=out, timeout_s=5)
+  layout = json.loads((out / "layout.json").read_text())
+  assert [p["page_number"] for p in layout["pages"]] == [1, 2]
+  assert doc.metadata.page_count == 2
+  assert {n: s.status for n, s in doc.metadata.page_status.items()} == {1: "ok", 2: "ok"}
+  assert "failed_pages" not in doc.artifact_paths
+
+
+def test_task_fails_after_max_attempts_of_expired_leases(tmp_path):
+  pytest.importorskip("fitz")
+  db = tmp_path / "queue.sqlite"
+  doc_id = submit_document(db, SAMPLE, "fake/model", pages_spec="1")
+  queue = PageQueue(db, lease_timeout_s=-1, max_attempts=3)
+  leases = [queue.lease(f"killed-worker-{n}") for n in range(3)]
+  assert [lease.attempts for lease in leases] == [1, 2, 3]
+  assert queue.lease("next-worker") is None
+  result = queue.results(doc_id)[0]
+  assert result.state == "failed" and result.error.startswith("WorkerLost")
+  assert queue.progress(doc_id)["failed"] == 1
+  queue.close()
+  doc = collect_document(db, doc_id, ["markdown"], timeout_s=1)
+  status = doc.metadata.page_status[1]
+  assert (status.status, status.attempts, status.error) == ("failed", 3, "WorkerLost")
+  assert doc.artifact_paths is None or "failed_pages" not in doc.artifact_paths
+
+
+def test_failed_page_falls_back_to_its_text_layer_like_a_local_run(tmp_path):
+  pytest.importorskip("fitz")
+  from layoutscribe.utils.images import render_pdf_to_images
+
+  db = tmp_path / "queue.sqlite"
+  doc_id = submit_document(db, SAMPLE, "fake/model", dpi=72)
+  queue = PageQueue(db, max_attempts=1)
+  first, second = queue.lease("w"), queue.lease("w")
+  queue.complete(first, {"page_number": 1, "width_px": 10, "height_px": 10, "blocks": []})
+  queue.fail(second, "ProviderRateLimitError: Rate limit: 429")
+  queue.close()
+
+  doc = collect_document(db, doc_id, ["markdown", "layout_json"], timeout_s=1)
+  assert doc.metadata.page_count == 2
+  status = doc.metadata.page_status
+  assert status[1].status == "ok" and status[2].status == "failed"
+  assert status[2].error == "ProviderRateLimitError"
+  local = render_pdf_to_images(SAMPLE, 72, tmp_path, [2])[0]
+  fallback = doc.layout_json.pages[1]
+  assert (fallback.width_px, fallback.height_px) == (local.width_px, local.height_px)
+  assert [b.text for b in fallback.blocks] == [local.text]
+  assert local.text.splitlines()[0] in doc.markdown
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from PIL import Image  # noqa: E402
+
+from layoutscribe.loaders.docx import render_docx_pages, render_docx_to_images  # noqa: E402
+
+
+def _contract(path, clauses=12):
+  document = docx.Document()
+  document.add_heading("Service Agreement", 0)
+  for i in range(1, clauses + 1):
+    document.add_heading(f"Clause {i}", 1)
+    document.add_paragraph(f"Clause {i} text. " + "The parties agree to terms. " * 40)
+    document.add_paragraph("an obligation", style="List Bullet")
+    if i == 2:
+      table = document.add_table(rows=2, cols=2)
+      for r in range(2):
+        for c in range(2):
+          table.cell(r, c).text = f"cell {r}{c}"
+      document.add_page_break()
+  document.save(path)
+  return path
+
+
+def test_document_is_paginated_onto_letter_pages(tmp_path):
+  pages = render_docx_to_images(_contract(tmp_path / "c.docx"), 72, tmp_path)
+  assert len(pages) > 3
+  assert [p.index0 for p in pages] == list(range(len(pages)))
+  assert (pages[0].width_px, pages[0].height_px) == (612, 792)
+  assert pages[0].text.startswith("Service Agreement")
+  assert Image.open(pages[0].image_path).convert("L").getextrema()[0] < 128
+  # The explicit page break after clause 2's table starts clause 3 on a new page.
+  breaking = next(p for p in pages if "cell 11" in p.text)
+  after = pages[breaking.index0 + 1]
+  assert after.text.startswith("Clause 3")
+  assert sum(p.drawings for p in pages) == 4  # one frame per table cell
+
+
+def test_vertically_merged_cells_have_no_inner_borders(tmp_path):
+  document = docx.Document()
+  table = document.add_table(rows=3, cols=2)
+  for r in range(3):
+    table.cell(r, 1).text = f"cell {r}1"
+  table.cell(0, 0).merge(table.cell(2, 0)).text = "merged"
+  document.save(tmp_path / "m.docx")
+  (page,) = render_docx_to_images(tmp_path / "m.docx", 72, tmp_path)
+  image = Image.open(page.image_path).convert("RGB")
+
+  def _borders(x):
+    column = [image.getpixel((x, y)) == (128, 128, 128) for y in range(page.height_px)]
+    return sum(1 for y in range(1, len(column)) if column[y] and not column[y - 1])
+
+  left, width = 72, (612 - 2 * 72) // 2  # Letter page, 1-inch margins
+  assert _borders(left + width // 2) == 2  # merged column: top and bottom only
+  assert _borders(left + width + width // 2) == 4
+  assert page.text.splitlines()[1:] == ["\tcell 11", "\tcell 21"]
+
+
+def test_pages_stream_lazily_and_selection_stops_layout(tmp_path):
+  path = _contract(tmp_path / "c.docx", clauses=30)
+  stream = render_docx_pages(path, 50, tmp_path)
+  first = next(stream)
+  assert first.index0 == 0 and not (tmp_path / "page-0003.png").exists()
+  stream.close()
+
+  out = tmp_path / "selected"
+  out.mkdir()
+  selected = list(render_docx_pages(path, 50, out, selected_pages=[2]))
+  assert [p.index0 for p in selected] == [1]
+  assert [f.name for f in out.iterdir()] == ["page-0002.png"]
+
+
+def test_parse_docx_streams_pages_through_vision(tmp_path):
+  from layoutscribe.api import parse
+
+  path = _contract(tmp_path / "c.docx")
+  options = dict(outputs=["markdown"], llm="fake/m", dpi=50, output_dir=tmp_path)
+  doc = asyncio.run(parse(str(path), pages_spec="2-3", parallel_pages=1, **options))
+  assert [p.page_number for p in doc.metadata.pages] == [2, 3]
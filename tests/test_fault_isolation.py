@@ -0,0 +1,56 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from layoutscribe.exceptions import ProviderAuthError, ProviderRateLimitError
+from layoutscribe.llm.fake import fake_page
+
+SAMPLE = Path(__file__).resolve().parents[1] / "notebooks" / "samples" / "Praneeth_Paikray_2025.pdf"
+
+
+def _parse(tmp_path, monkeypatch, outcomes, **kwargs):
+  """Run a 2-page parse whose n-th vision call raises `outcomes[n]` (if set)."""
+  pytest.importorskip("fitz")
+  from layoutscribe.agents import page_vision
+  from layoutscribe.api import parse
+
+  calls = []
+
+  async def scripted(model, image_bytes, *args, **kw):
+    calls.append(model)
+    error = outcomes.get(len(calls))
+    if error is not None:
+      raise error
+    return fake_page(image_bytes)
+
+  monkeypatch.setattr(page_vision, "vision_json_call", scripted)
+  options = dict(outputs=["markdown"], llm="fake/m", provider_concurrency=1, output_dir=tmp_path)
+  options.update(kwargs)
+  return asyncio.run(parse(str(SAMPLE), page_retry_backoff_s=0.01, **options)), calls
+
+
+def test_failed_page_is_retried_in_a_later_pass(tmp_path, monkeypatch):
+  doc, calls = _parse(tmp_path, monkeypatch, {2: ProviderRateLimitError("429")})
+  status = doc.metadata.page_status
+  assert status[1].status == "ok" and status[1].attempts == 1
+  assert status[2].status == "recovered" and status[2].attempts == 2
+  assert status[2].error == "ProviderRateLimitError"
+  assert len(calls) == 3
+  assert all(p.text_preview.startswith("fake page") for p in doc.metadata.pages)
+
+
+def test_page_that_keeps_failing_falls_back_without_losing_others(tmp_path, monkeypatch):
+  errors = {n: ProviderRateLimitError("429") for n in (2, 3)}
+  doc, _ = _parse(tmp_path, monkeypatch, errors, page_retries=1)
+  status = doc.metadata.page_status
+  assert status[1].status == "ok"
+  assert status[2].status == "failed" and status[2].attempts == 2
+  assert doc.metadata.pages[0].text_preview.startswith("fake page")
+  assert not doc.metadata.pages[1].text_preview.startswith("fake page")
+
+
+def test_run_fails_only_when_every_page_fails(tmp_path, monkeypatch):
+  errors = {n: ProviderAuthError("401") for n in (1, 2)}
+  with pytest.raises(ProviderAuthError):
+    _parse(tmp_path, monkeypatch, errors)
@@ -0,0 +1,58 @@
+import asyncio
+
+from layoutscribe.llm.hedging import HedgePolicy, Hedger
+
+
+def _policy(**overrides):
+  params = dict(percentile=0.9, max_fraction=1.0, min_samples=3, min_delay_s=0.0)
+  params.update(overrides)
+  return HedgePolicy(**params)
+
+
+def test_slow_call_is_hedged_and_loser_cancelled():
+  cancelled = []
+
+  async def call(model):
+    try:
+      await asyncio.sleep(5.0 if model == "slow" else 0.01)
+    except asyncio.CancelledError:
+      cancelled.append(model)
+      raise
+    return model
+
+  async def main():
+    hedger = Hedger(_policy(hedge_model="fast"))
+    for _ in range(3):
+      assert await hedger.run(call, "fast") == "fast"
+    assert await hedger.run(call, "slow") == "fast"
+    return hedger
+
+  hedger = asyncio.run(main())
+  assert hedger.stats() == {"issued": 1, "won": 1, "cancelled": 1}
+  assert cancelled == ["slow"]
+
+
+def test_rejected_answer_waits_for_valid_one_and_spend_cap_blocks_hedges():
+  async def call(model):
+    await asyncio.sleep(0.05 if model == "sloppy" else 0.1)
+    return model
+
+  async def main():
+    hedger = Hedger(
+      _policy(hedge_model="careful", min_samples=1),
+      accept=lambda answer: answer != "sloppy",
+      may_spend=lambda: False,
+    )
+    hedger.latency.observe(0.0)
+    refused = await hedger.run(call, "sloppy")
+    hedger.may_spend = None
+    for _ in range(20):
+      hedger.latency.observe(0.0)
+    hedged = await hedger.run(call, "sloppy")
+    return hedger, refused, hedged
+
+  hedger, refused, hedged = asyncio.run(main())
+  assert refused == "sloppy"
+  # The primary answers first but is rejected, so the hedge's answer wins.
+  assert hedged == "careful"
+  assert hedger.issued == 1 and hedger.won == 1
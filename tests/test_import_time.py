@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+# Generous relative to the ~50 ms measured locally; override on slow runners.
+BUDGET_MS = float(os.getenv("LAYOUTSCRIBE_IMPORT_BUDGET_MS", "250"))
+HEAVY_MODULES = (
+  "layoutscribe.api",
+  "layoutscribe.agents.graph",
+  "asyncio",
+  "jsonschema",
+  "PIL",
+  "numpy",
+  "pydantic",
+  "litellm",
+  "fitz",
+  "mlflow",
+)
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+  return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def _cold_import_ms(module: str) -> float:
+  proc = _run("-X", "importtime", "-c", f"import {module}")
+  for line in proc.stderr.splitlines():
+    if line.rstrip().endswith(f"| {module}"):
+      return int(line.split("|")[1]) / 1000
+  raise AssertionError(f"no importtime entry for {module}")
+
+
+def test_cli_import_does_not_load_pipeline():
+  code = (
+    "import sys, layoutscribe.cli; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+  )
+  assert _run("-c", code).stdout.strip() == ""
+
+
+def test_cli_cold_import_within_budget():
+  best = min(_cold_import_ms("layoutscribe.cli") for _ in range(3))
+  assert best < BUDGET_MS, f"layoutscribe.cli imported in {best:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_version_answers_without_pipeline():
+  code = (
+    "import sys; from layoutscribe.cli import app\n"
+    "try:\n  app(['--version'])\nexcept SystemExit:\n  pass\n"
+    "print('graph' if 'layoutscribe.agents.graph' in sys.modules else 'ok')"
+  )
+  out = _run("-c", code).stdout.split()
+  assert out[-1] == "ok"
@@ -0,0 +1,25 @@
+from layoutscribe.utils.jsonl import LayoutJsonlReader, LayoutJsonlWriter, index_path_for
+
+
+def _page(n):
+  return {"page_number": n, "width_px": 10, "height_px": 10, "blocks": [{"id": f"b{n}"}]}
+
+
+def test_random_access_out_of_order(tmp_path):
+  path = tmp_path / "layout.jsonl"
+  with LayoutJsonlWriter(path) as writer:
+    for n in (3, 1, 2):
+      writer.write_page(_page(n))
+  with LayoutJsonlReader(path) as reader:
+    assert len(reader) == 3
+    assert reader.page(2)["blocks"][0]["id"] == "b2"
+    assert [p["page_number"] for p in reader] == [1, 2, 3]
+
+
+def test_reader_rebuilds_missing_index(tmp_path):
+  path = tmp_path / "layout.jsonl"
+  with LayoutJsonlWriter(path) as writer:
+    writer.write_page(_page(5))
+  index_path_for(path).unlink()
+  with LayoutJsonlReader(path) as reader:
+    assert reader.page(5)["page_number"] == 5
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from layoutscribe.llm.jsonstream import IncrementalPageParser, MalformedOutput, parse_page_json
+
+PAGE = {
+  "page_number": 3,
+  "width_px": 1200,
+  "height_px": 1600,
+  "blocks": [
+    {"id": "b1", "type": "title", "bbox": [0.1, 0.05, 0.9, 0.1], "text": 'A {tricky} "title" ]'},
+    {"id": "b2", "type": "table", "bbox": [0.1, 0.2, 0.9, 0.5], "table": {"rows": [["a", "b"]]}},
+    {"id": "b3", "type": "paragraph", "bbox": [0.1, 0.6, 0.9, 0.9], "text": "body"},
+  ],
+}
+
+
+def test_blocks_are_emitted_as_their_objects_close():
+  text = "```json\n" + json.dumps(PAGE) + "\n```"
+  parser = IncrementalPageParser()
+  emitted = []
+  for ch in text:
+    emitted.extend(block["id"] for block in parser.feed(ch))
+  assert emitted == ["b1", "b2", "b3"]
+  assert not parser.truncated
+  assert parser.result() == PAGE
+
+
+def test_truncated_output_keeps_complete_blocks():
+  text = json.dumps(PAGE)
+  cut = text[: text.index('"b3"') + 10]
+  page = parse_page_json(cut)
+  assert [b["id"] for b in page["blocks"]] == ["b1", "b2"]
+  assert (page["page_number"], page["width_px"], page["height_px"]) == (3, 1200, 1600)
+
+
+def test_prose_and_unbalanced_output_abort_early():
+  with pytest.raises(MalformedOutput):
+    IncrementalPageParser().feed("Sure! Here is the layout:")
+  parser = IncrementalPageParser()
+  with pytest.raises(MalformedOutput):
+    parser.feed('{"blocks": [{"id": "b1"]')
+  assert parse_page_json("not json")["blocks"] == []
+
+
+def test_complete_output_skips_the_incremental_scanner(monkeypatch):
+  import layoutscribe.llm.jsonstream as jsonstream
+
+  raw = json.dumps(PAGE)
+  fenced = "```json\n" + raw + "\n```"
+  assert parse_page_json(fenced) == PAGE  # fences still go through the scanner
+  monkeypatch.setattr(jsonstream, "IncrementalPageParser", None)
+  assert parse_page_json(raw) == PAGE
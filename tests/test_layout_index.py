@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from layoutscribe.layout.index import INDEX_FILENAME, LayoutIndex, LayoutIndexBuilder
+
+
+def _page(number, blocks):
+  return {"page_number": number, "width_px": 100, "height_px": 100, "blocks": blocks}
+
+
+def _block(i, type_, bbox, text):
+  return {"id": f"b{i}", "type": type_, "bbox": bbox, "text": text}
+
+
+def _report(doc, pages=30):
+  out = []
+  for n in range(1, pages + 1):
+    out.append(
+      _page(
+        n,
+        [
+          _block(1, "heading", [0.1, 0.05, 0.9, 0.1], f"{doc} Revenue page {n}"),
+          _block(2, "paragraph", [0.1, 0.2, 0.9, 0.5], "Costs rose in the quarter."),
+          _block(3, "table", [0.5, 0.6, 0.95, 0.9], f"table {n}"),
+        ],
+      )
+    )
+  return out
+
+
+def test_queries_combine_type_page_region_and_words(tmp_path):
+  builder = LayoutIndexBuilder("a")
+  for page in reversed(_report("A")):  # pages finish out of order
+    builder.add_page(page)
+  index = builder.build()
+
+  tables = index.query(types="table", pages="10-20")
+  assert [(r.page, r.block_id) for r in tables] == [(n, "b3") for n in range(10, 21)]
+  headings = index.query(types=["heading"], text="REVENUE page 7")
+  assert [r.page for r in headings] == [7]
+  # Only the table reaches the bottom-right corner; touching counts.
+  corner = index.query(region=(0.95, 0.9, 1.0, 1.0), pages=3)
+  assert [r.block_id for r in corner] == ["b3"]
+  assert index.query(region=(0.0, 0.0, 0.05, 0.05)) == []
+  block = index.block(headings[0])
+  assert block.type == "heading" and block.text == "A Revenue page 7"
+
+
+def test_saved_indexes_merge_into_a_corpus(tmp_path):
+  paths = []
+  for doc in ("a", "b", "c"):
+    path = LayoutIndex.from_pages(_report(doc.upper()), doc).save(tmp_path / doc / INDEX_FILENAME)
+    paths.append(path)
+  corpus = LayoutIndex.merge([LayoutIndex.load(p) for p in paths])
+  corpus.save(tmp_path / "corpus.npz")
+  corpus = LayoutIndex.load(tmp_path / "corpus.npz")
+  assert len(corpus) == 3 * 30 * 3
+  refs = corpus.query(doc_id="b", text="revenue", pages=[2, 4])
+  assert [(r.doc_id, r.page) for r in refs] == [("b", 2), ("b", 4)]
+  assert corpus.text(refs[0]) == "B Revenue page 2"
+  assert {r.doc_id for r in corpus.query(types="table", pages=5)} == {"a", "b", "c"}
+  start = time.perf_counter()
+  corpus.query(types="table", region=(0.6, 0.7, 0.7, 0.8), text="table")
+  assert time.perf_counter() - start < 0.1
+
+
+def test_parse_writes_index_as_an_output(tmp_path):
+  import fitz
+
+  from layoutscribe.api import parse
+
+  pdf = fitz.open()
+  for n in range(2):
+    pdf.new_page().insert_text((72, 72), f"Page {n + 1} revenue")
+  pdf.save(tmp_path / "r.pdf")
+  options = dict(llm="fake/m", dpi=50, output_dir=tmp_path / "out")
+  asyncio.run(parse(str(tmp_path / "r.pdf"), outputs=["layout_index"], **options))
+  index = LayoutIndex.load(tmp_path / "out" / INDEX_FILENAME)
+  assert index.doc_ids == ["r"] and len(index) > 0
+  assert {ref.page for ref in index.query()} == {1, 2}
@@ -0,0 +1,40 @@
+from layoutscribe.layout.compose import compose_markdown, compose_text
+from layoutscribe.layout.store import BlockStore
+from layoutscribe.types import ParsedDocument
+
+PAGES = [
+  {
+    "page_number": 1,
+    "width_px": 100,
+    "height_px": 200,
+    "blocks": [
+      {"id": "b2", "type": "paragraph", "bbox": [0.1, 0.3, 0.9, 0.4], "text": "Body", "conf": 0.5},
+      {"id": "b1", "type": "heading", "bbox": [0.1, 0.1, 0.9, 0.2], "text": "Intro", "level": 2},
+      {
+        "id": "b3",
+        "type": "table",
+        "bbox": [0.1, 0.35, 0.9, 0.6],
+        "table": {"rows": [["A", "B"], ["1", "2"]]},
+      },
+    ],
+  },
+  {"page_number": 2, "width_px": 100, "height_px": 200, "blocks": []},
+]
+
+
+def test_store_composes_like_dicts():
+  store = BlockStore.from_pages(PAGES)
+  assert compose_markdown(store) == compose_markdown(PAGES)
+  assert compose_text(store) == compose_text(PAGES)
+
+
+def test_layout_json_materializes_lazily():
+  store = BlockStore.from_pages(PAGES)
+  doc = ParsedDocument(layout_store=store)
+  assert doc.layout_store is store
+  assert doc.layout_dict()["pages"][0]["blocks"][1]["level"] == 2
+  layout = doc.layout_json
+  assert doc.layout_store is None
+  assert layout.pages[0].blocks[0].conf == 0.5
+  assert layout.pages[0].blocks[2].table.rows == [["A", "B"], ["1", "2"]]
+  assert doc.model_dump()["layout_json"]["pages"][1]["blocks"] == []
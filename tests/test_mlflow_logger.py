@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+from layoutscribe.tracing.mlflow_logger import RunLogger
+
+
+class _SlowClient:
+  """In-memory tracking client whose requests take `delay` seconds."""
+
+  def __init__(self, delay=0.05, gate=None):
+    self.delay = delay
+    self.gate = gate
+    self.calls = []
+
+  def _request(self, *call):
+    if self.gate is not None:
+      self.gate.wait()
+    time.sleep(self.delay)
+    self.calls.append(call)
+
+  def log_batch(self, run_id, metrics=(), params=()):
+    self._request("log_batch", list(metrics), list(params))
+
+  def log_artifact(self, run_id, path, artifact_path=None):
+    self._request("log_artifact", path, artifact_path)
+
+  def log_artifacts(self, run_id, path, artifact_path=None):
+    self._request("log_artifacts", path, artifact_path)
+
+
+def _mlflow(client):
+  ended = []
+  module = SimpleNamespace(
+    tracking=SimpleNamespace(MlflowClient=lambda: client),
+    entities=SimpleNamespace(
+      Metric=namedtuple("Metric", "key value timestamp step"),
+      Param=namedtuple("Param", "key value"),
+    ),
+    end_run=lambda status: ended.append(status),
+  )
+  return module, ended
+
+
+def test_logging_does_not_wait_for_the_server_and_batches(tmp_path):
+  client = _SlowClient()
+  mlflow, ended = _mlflow(client)
+  tracer = RunLogger(mlflow, "run")
+  overlays = tmp_path / "overlays"
+  overlays.mkdir()
+  for n in range(3):
+    (overlays / f"page-{n}.png").write_bytes(b"png")
+
+  start = time.perf_counter()
+  tracer.log_params({"llm": "m", "api_key": "secret", "pages": None})
+  for n in range(1, 101):
+    tracer.log_page({"page_number": n, "blocks": [{"type": "table", "text": "ab"}]})
+  tracer.log_files(sorted(overlays.iterdir()), artifact_path="overlays")
+  assert time.perf_counter() - start < 0.05  # one request alone takes 0.05s
+  tracer.close()
+  tracer.close(status="FAILED")  # idempotent
+
+  batches = [c for c in client.calls if c[0] == "log_batch"]
+  metrics = [m for c in batches for m in c[1]]
+  params = [p for c in batches for p in c[2]]
+  assert len(metrics) == 400 and len(batches) < 10
+  assert {(p.key, p.value) for p in params} == {("llm", "m")}
+  assert ("log_artifacts", overlays.as_posix(), "overlays") in client.calls
+  assert ended == ["FINISHED"] and tracer.dropped == 0 and tracer.errors == 0
+
+
+def test_full_queue_drops_metrics_instead_of_blocking():
+  gate = threading.Event()
+  client = _SlowClient(delay=0, gate=gate)
+  mlflow, ended = _mlflow(client)
+  tracer = RunLogger(mlflow, "run", max_queue=2, flush_timeout_s=0.2)
+  start = time.perf_counter()
+  for step in range(50):
+    tracer.log_metrics({"x": step}, step=step)
+  assert time.perf_counter() - start < 0.05
+  assert tracer.dropped >= 45
+  gate.set()
+  tracer.close()
+  assert ended == ["FINISHED"] and tracer.errors == 0
+
+
+def test_close_reports_a_flush_that_did_not_finish(tmp_path):
+  gate = threading.Event()
+  client = _SlowClient(delay=0, gate=gate)
+  mlflow, ended = _mlflow(client)
+  tracer = RunLogger(mlflow, "run", flush_timeout_s=0.1)
+  tracer.log_artifacts(tmp_path)
+  tracer.close()
+  assert tracer.unflushed and tracer.errors == 1 and ended == ["FINISHED"]
+  assert "flush did not finish" in tracer.last_error
+  gate.set()
+  tracer._thread.join(5)
+  assert client.calls == [("log_artifacts", tmp_path.as_posix(), None)]
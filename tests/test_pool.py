@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from layoutscribe.exceptions import ProviderRateLimitError
+from layoutscribe.llm.pool import EndpointPool, EndpointSpec, parse_endpoint
+
+
+def test_parse_endpoint_spec():
+  spec = parse_endpoint("azure/gpt-4o,weight=2,concurrency=8,api_base=https://eu.example.com")
+  assert spec == EndpointSpec(
+    "azure/gpt-4o", weight=2.0, max_concurrency=8, api_base="https://eu.example.com"
+  )
+  assert spec.completion_kwargs() == {"api_base": "https://eu.example.com"}
+  with pytest.raises(ValueError):
+    parse_endpoint("openai/gpt-4o,region=eu")
+
+
+def test_throttled_endpoint_is_drained_and_calls_fail_over():
+  pool = EndpointPool([EndpointSpec("a"), EndpointSpec("b")], cooldown_s=60)
+  seen = []
+
+  async def call(spec):
+    seen.append(spec.model)
+    if spec.model == "a":
+      raise ProviderRateLimitError("429")
+    return spec.model
+
+  async def main():
+    return [await pool.call(call) for _ in range(3)]
+
+  assert asyncio.run(main()) == ["b", "b", "b"]
+  assert seen == ["a", "b", "b", "b"]
+  stats = {s["model"]: s for s in pool.stats()}
+  assert stats["a"]["drains"] == 1 and stats["b"]["failures"] == 0
+
+
+def test_load_spreads_by_weight_and_in_flight():
+  pool = EndpointPool([EndpointSpec("a", weight=2.0), EndpointSpec("b")])
+  started = []
+
+  async def call(spec):
+    started.append(spec.model)
+    await asyncio.sleep(0.05)
+    return spec.model
+
+  async def main():
+    await asyncio.gather(*(pool.call(call) for _ in range(6)))
+
+  asyncio.run(main())
+  assert started.count("a") == 4 and started.count("b") == 2
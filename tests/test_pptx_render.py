@@ -0,0 +1,62 @@
+import asyncio
+import io
+
+import pytest
+
+pptx = pytest.importorskip("pptx")
+
+from PIL import Image  # noqa: E402
+from pptx.enum.shapes import MSO_SHAPE  # noqa: E402
+from pptx.util import Inches  # noqa: E402
+
+from layoutscribe.loaders.pptx import render_pptx_to_images  # noqa: E402
+
+
+def _deck(path):
+  prs = pptx.Presentation()
+  slide = prs.slides.add_slide(prs.slide_layouts[0])
+  slide.shapes.title.text = "Quarterly Report"
+  slide = prs.slides.add_slide(prs.slide_layouts[5])
+  slide.shapes.title.text = "Numbers"
+  table = slide.shapes.add_table(2, 2, Inches(1), Inches(2), Inches(4), Inches(1)).table
+  for r in range(2):
+    for c in range(2):
+      table.cell(r, c).text = f"r{r}c{c}"
+  slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(6), Inches(2), Inches(2), Inches(1)).text = "Oval"
+  picture = io.BytesIO()
+  Image.new("RGB", (20, 10), (200, 30, 30)).save(picture, "PNG")
+  picture.seek(0)
+  slide.shapes.add_picture(picture, Inches(6), Inches(4), Inches(2), Inches(1))
+  prs.save(path)
+  return path
+
+
+def test_slides_are_drawn_not_blank(tmp_path):
+  deck = _deck(tmp_path / "deck.pptx")
+  slides = render_pptx_to_images(deck, 72, tmp_path)
+  assert [s.index0 for s in slides] == [0, 1]
+  assert (slides[0].width_px, slides[0].height_px) == (720, 540)
+  for slide in slides:
+    img = Image.open(slide.image_path).convert("L")
+    assert img.getextrema()[0] < 128  # something dark was drawn
+  assert "r1c1" in slides[1].text and "Oval" in slides[1].text
+  assert slides[1].images == 1 and slides[1].drawings > 0
+  # The picture lands where the shape says (6in, 4in at 72 dpi).
+  red = Image.open(slides[1].image_path).convert("RGB").getpixel((6 * 72 + 20, 4 * 72 + 20))
+  assert red == (200, 30, 30)
+
+
+def test_only_selected_slides_are_rendered(tmp_path):
+  deck = _deck(tmp_path / "deck.pptx")
+  slides = render_pptx_to_images(deck, 50, tmp_path, selected_pages=[2, 9])
+  assert [s.index0 for s in slides] == [1]
+  assert not (tmp_path / "slide-0001.png").exists()
+
+
+def test_parse_pptx_honours_pages_spec(tmp_path):
+  from layoutscribe.api import parse
+
+  deck = _deck(tmp_path / "deck.pptx")
+  options = dict(outputs=["markdown"], llm="fake/m", dpi=50, output_dir=tmp_path)
+  doc = asyncio.run(parse(str(deck), pages_spec="2", **options))
+  assert [p.page_number for p in doc.metadata.pages] == [2]
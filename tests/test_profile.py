@@ -0,0 +1,64 @@
+import asyncio
+import json
+import pstats
+
+import fitz
+
+from layoutscribe.tracing.profile import Profiler, span
+
+
+def test_spans_become_per_task_tracks_with_stage_concurrency(tmp_path):
+  async def _page(n):
+    with span("wait", "wait"):
+      await asyncio.sleep(0.01 * n)
+    with span("llm call", "llm", page=n):
+      await asyncio.sleep(0.05)
+
+  async def _run():
+    await asyncio.gather(*(asyncio.create_task(_page(n), name=f"w{n}") for n in range(3)))
+
+  with span("ignored", "render"):  # no profiler active: a no-op
+    pass
+  profiler = Profiler(cpu=False).start()
+  asyncio.run(_run())
+  paths = profiler.write(tmp_path)
+
+  assert [p.name for p in paths] == ["trace.json", "stages.json"]
+  events = json.loads(paths[0].read_text())["traceEvents"]
+  tracks = {e["args"]["name"]: e["tid"] for e in events if e["name"] == "thread_name"}
+  assert set(tracks) == {"w0", "w1", "w2"}
+  calls = [e for e in events if e["ph"] == "X" and e["cat"] == "llm"]
+  assert sorted(e["tid"] for e in calls) == sorted(tracks.values())
+  assert all(e["dur"] >= 50_000 for e in calls)  # microseconds
+  stages = json.loads(paths[1].read_text())
+  assert set(stages) == {"wait", "llm"}
+  assert stages["llm"]["count"] == 3 and stages["llm"]["max_concurrency"] == 3
+  assert stages["llm"]["mean_concurrency"] > 1.5
+  assert stages["llm"]["mem_peak_bytes"] > 0
+
+
+def test_parse_writes_profile(tmp_path):
+  from layoutscribe.api import parse
+
+  pdf = fitz.open()
+  for n in range(2):
+    pdf.new_page().insert_text((72, 72), f"Page {n + 1}")
+  pdf.save(tmp_path / "p.pdf")
+  doc = asyncio.run(
+    parse(
+      str(tmp_path / "p.pdf"),
+      outputs=["markdown"],
+      llm="fake/m",
+      dpi=50,
+      output_dir=tmp_path / "out",
+      profile=tmp_path / "out" / "profile",
+    )
+  )
+  profile_dir = tmp_path / "out" / "profile"
+  assert sorted(doc.artifact_paths["profile"]) == sorted(
+    (profile_dir / name).as_posix() for name in ("trace.json", "stages.json", "cpu.pstats")
+  )
+  stages = json.loads((profile_dir / "stages.json").read_text())
+  assert {"render", "encode", "llm", "review", "page", "export"} <= set(stages)
+  assert stages["page"]["count"] == 2
+  assert pstats.Stats(str(profile_dir / "cpu.pstats")).total_calls > 0
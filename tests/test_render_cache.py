@@ -0,0 +1,68 @@
+import asyncio
+import shutil
+
+import fitz
+
+from layoutscribe.utils.images import render_pdf_to_images
+from layoutscribe.utils.render_cache import RenderCache
+
+
+def _pdf(path, pages=3):
+  doc = fitz.open()
+  for n in range(pages):
+    doc.new_page().insert_text((72, 72), f"Page {n + 1} text")
+  doc.save(path)
+  return path
+
+
+def test_pages_are_reused_across_runs_and_copies(tmp_path, monkeypatch):
+  pdf = _pdf(tmp_path / "a.pdf")
+  cache_dir = tmp_path / "cache"
+  first = tmp_path / "run1"
+  first.mkdir()
+  cold = render_pdf_to_images(pdf, 50, first, cache=RenderCache(cache_dir))
+
+  copy = shutil.copy(pdf, tmp_path / "renamed.pdf")
+  second = tmp_path / "run2"
+  second.mkdir()
+  cache = RenderCache(cache_dir)
+  monkeypatch.setattr(fitz, "open", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+  warm = render_pdf_to_images(copy, 50, second, [2, 3], cache=cache)
+  assert cache.stats() == {"hits": 2, "misses": 0}
+  assert [(p.index0, p.text, p.width_px) for p in warm] == [
+    (p.index0, p.text, p.width_px) for p in cold[1:]
+  ]
+  assert warm[0].image_path.parent == second
+  assert warm[0].image_path.read_bytes() == cold[1].image_path.read_bytes()
+
+
+def test_other_dpi_misses_and_eviction_keeps_recent_pages(tmp_path):
+  pdf = _pdf(tmp_path / "a.pdf", pages=4)
+  cache = RenderCache(tmp_path / "cache")
+  render_pdf_to_images(pdf, 50, tmp_path, cache=cache)
+  render_pdf_to_images(pdf, 60, tmp_path, [1], cache=cache)
+  assert cache.stats() == {"hits": 0, "misses": 5}
+
+  _, total = cache._scan()
+  cache.max_bytes = total // 2
+  freed = cache.evict()
+  remaining, left = cache._scan()
+  assert freed > 0 and left <= cache.max_bytes and left == total - freed
+  assert cache._size == left
+  # The most recently written page (60 dpi) survives.
+  assert any("60dpi" in meta.parent.name for _, _, meta, _ in remaining)
+
+  # A write past the limit evicts and leaves the running size matching disk.
+  render_pdf_to_images(pdf, 70, tmp_path, cache=cache)
+  assert cache._size == cache._scan()[1] <= cache.max_bytes
+
+
+def test_parse_reports_render_cache_hits(tmp_path):
+  from layoutscribe.api import parse
+
+  pdf = _pdf(tmp_path / "a.pdf", pages=2)
+  options = dict(outputs=["markdown"], dpi=50, render_cache=tmp_path / "cache")
+  asyncio.run(parse(str(pdf), llm="fake/a", **options))
+  doc = asyncio.run(parse(str(pdf), llm="fake/b", **options))
+  assert doc.metadata.render_cache.hits == 2
+  assert doc.metadata.render_cache.misses == 0
@@ -0,0 +1,71 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from layoutscribe.agents.scheduler import (
+  predicted_cost,
+  run_ordered,
+  run_streamed,
+  schedule_order,
+)
+from layoutscribe.utils.images import RenderedPage
+
+
+def _page(index0, text="", drawings=0, images=0):
+  return RenderedPage(index0, Path("/nonexistent.png"), 100, 100, text, drawings, images)
+
+
+PAGES = [_page(0, "x" * 40), _page(1, drawings=300), _page(2, "x" * 400), _page(3)]
+
+
+def test_dense_pages_predicted_costlier():
+  assert predicted_cost(_page(0, drawings=40)) > predicted_cost(_page(0))
+  assert predicted_cost(_page(0, images=2)) > predicted_cost(_page(0, "x" * 40))
+
+
+def test_schedule_modes():
+  assert schedule_order(PAGES, "lpt") == [1, 2, 0, 3]
+  assert schedule_order(PAGES, "first_pages", head=1) == [0, 1, 2, 3]
+  assert schedule_order(PAGES[::-1], "first_pages", head=1) == [0, 2, 1, 3]
+  assert schedule_order(PAGES, "page_order") == [0, 1, 2, 3]
+  with pytest.raises(ValueError):
+    schedule_order(PAGES, "random")  # type: ignore[arg-type]
+
+
+def test_run_ordered_caps_concurrency_and_keeps_item_order():
+  started, running, peak = [], [0], [0]
+
+  async def work(item):
+    started.append(item)
+    running[0] += 1
+    peak[0] = max(peak[0], running[0])
+    await asyncio.sleep(0.001)
+    running[0] -= 1
+    return item * 10
+
+  results = asyncio.run(run_ordered([1, 2, 3, 4], [3, 1, 0, 2], work, concurrency=2))
+  assert results == [10, 20, 30, 40]
+  assert started == [4, 2, 1, 3]
+  assert peak[0] == 2
+
+
+def test_run_streamed_stops_pulling_after_a_failure():
+  pulled = []
+
+  def source():
+    for i in range(10):
+      pulled.append(i)
+      yield i
+
+  async def work(item):
+    await asyncio.sleep(0.001)
+    if item == 1:
+      raise RuntimeError("boom")
+    return item
+
+  items, results = asyncio.run(run_streamed(iter(range(4)), lambda i: asyncio.sleep(0, i), 2))
+  assert items == [0, 1, 2, 3] and results == [0, 1, 2, 3]
+  with pytest.raises(RuntimeError):
+    asyncio.run(run_streamed(source(), work, concurrency=1))
+  assert len(pulled) < 10
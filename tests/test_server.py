@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from layoutscribe.server.http import make_server
+from layoutscribe.server.jobs import JobManager
+
+SAMPLE = Path(__file__).resolve().parents[1] / "notebooks" / "samples" / "promo.pdf"
+
+
+@pytest.fixture()
+def base_url(tmp_path):
+  pytest.importorskip("fitz")
+  manager = JobManager(llm="fake/model", workers=2)
+  manager.start()
+  server = make_server(manager, port=0, path_roots=[SAMPLE.parent], upload_dir=tmp_path)
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  yield f"http://127.0.0.1:{server.server_address[1]}"
+  server.shutdown()
+  server.server_close()
+  manager.stop()
+
+
+def _request(url, data=None, headers=None):
+  req = urllib.request.Request(url, data=data, headers=headers or {})
+  try:
+    with urllib.request.urlopen(req, timeout=30) as resp:
+      return resp.status, json.loads(resp.read())
+  except urllib.error.HTTPError as exc:
+    return exc.code, json.loads(exc.read())
+
+
+def _wait_done(base_url, job_id):
+  deadline = time.time() + 60
+  while time.time() < deadline:
+    _, summary = _request(f"{base_url}/jobs/{job_id}")
+    if summary["status"] in {"done", "failed"}:
+      return summary
+    time.sleep(0.05)
+  raise AssertionError("job did not finish")
+
+
+def test_upload_job_streams_pages_and_result(base_url):
+  status, created = _request(
+    f"{base_url}/jobs?filename=promo.pdf&outputs=markdown,layout_json",
+    data=SAMPLE.read_bytes(),
+    headers={"Content-Type": "application/pdf"},
+  )
+  assert status == 202
+  summary = _wait_done(base_url, created["id"])
+  assert summary["status"] == "done", summary
+  _, pages = _request(f"{base_url}/jobs/{created['id']}/pages?since=0")
+  assert pages["pages"] and pages["pages"][0]["blocks"][0]["text"].startswith("fake page")
+  status, result = _request(f"{base_url}/jobs/{created['id']}/result")
+  assert status == 200 and "fake page" in result["markdown"]
+
+
+def test_path_job_respects_roots(base_url):
+  body = json.dumps({"path": "/etc/passwd"}).encode()
+  status, _ = _request(f"{base_url}/jobs", data=body, headers={"Content-Type": "application/json"})
+  assert status == 403
+  body = json.dumps({"path": SAMPLE.as_posix(), "outputs": ["text"]}).encode()
+  status, created = _request(
+    f"{base_url}/jobs", data=body, headers={"Content-Type": "application/json"}
+  )
+  assert status == 202
+  assert _wait_done(base_url, created["id"])["status"] == "done"
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"x"', b"1", b"{"])
+def test_path_job_rejects_non_object_body(base_url, body):
+  status, error = _request(
+    f"{base_url}/jobs", data=body, headers={"Content-Type": "application/json"}
+  )
+  assert status == 400 and error["error"]
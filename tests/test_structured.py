@@ -0,0 +1,60 @@
+import json
+
+from jsonschema import Draft202012Validator
+
+from layoutscribe.agents.reviewer import ReaskStats
+from layoutscribe.layout.validate import build_default_validator
+from layoutscribe.llm.structured import drop_nulls, response_format_for, strict_page_schema
+
+
+def _walk(node):
+  if isinstance(node, dict):
+    yield node
+    for value in node.values():
+      yield from _walk(value)
+  elif isinstance(node, list):
+    for item in node:
+      yield from _walk(item)
+
+
+def test_strict_schema_is_self_contained_and_fully_required():
+  schema = strict_page_schema()
+  Draft202012Validator.check_schema(schema)
+  assert "$ref" not in json.dumps(schema)
+  for node in _walk(schema):
+    if node.get("type") == "object" and "properties" in node:
+      assert sorted(node["required"]) == sorted(node["properties"])
+      assert node["additionalProperties"] is False
+
+
+def test_strict_answer_validates_after_dropping_nulls():
+  answer = {
+    "page_number": 1,
+    "width_px": 100,
+    "height_px": 100,
+    "blocks": [
+      {
+        "id": "b1",
+        "type": "paragraph",
+        "bbox": [0.1, 0.1, 0.9, 0.2],
+        "text": "hi",
+        "level": None,
+        "table": None,
+        "conf": 0.9,
+      }
+    ],
+  }
+  assert not list(Draft202012Validator(strict_page_schema()).iter_errors(answer))
+  assert not list(build_default_validator().iter_errors(drop_nulls(answer)))
+
+
+def test_json_object_mode_and_reask_rates():
+  assert response_format_for("openai/gpt-4o", "json_object") == {"type": "json_object"}
+  assert response_format_for("fake/x", "auto")["type"] == "json_schema"
+  stats = ReaskStats()
+  for model, failed in [("openai/gpt-4o", True), ("openai/gpt-4o-mini", False), ("azure/x", False)]:
+    stats.record(model, failed)
+  assert stats.stats() == [
+    {"provider": "azure", "answers": 1, "reasks": 0, "reask_rate": 0.0},
+    {"provider": "openai", "answers": 2, "reasks": 1, "reask_rate": 0.5},
+  ]
@@ -0,0 +1,76 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+import litellm  # noqa: E402
+
+from layoutscribe.llm.prompts import build_messages, page_prompt, page_vision_instruction  # noqa: E402
+from layoutscribe.llm.router import request_vision_json  # noqa: E402
+from layoutscribe.llm.usage import TokenUsage, usage_counts  # noqa: E402
+
+_PAGE = '{"page_number": 1, "width_px": 10, "height_px": 20, "blocks": []}'
+
+
+def test_static_prefix_is_shared_and_page_values_come_last():
+  static = page_vision_instruction()
+  first = build_messages("openai/gpt-4o", static, "data:a", page_prompt(800, 600))
+  second = build_messages("openai/gpt-4o", static, "data:b", page_prompt(612, 792))
+  assert first[0] == second[0]
+  assert first[0]["role"] == "system" and "cache_control" not in first[0]["content"][0]
+  assert "800" not in first[0]["content"][0]["text"]
+  assert first[1]["content"][-1]["text"].endswith("width_px=800, height_px=600.")
+
+  claude = build_messages("anthropic/claude-sonnet-4", "static", "data:a")
+  assert claude[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+  uncached = build_messages("anthropic/x", "s", "u", prompt_cache=False)
+  assert "cache_control" not in uncached[0]["content"][0]
+
+
+def test_usage_counts_read_openai_and_anthropic_shapes():
+  openai = {
+    "prompt_tokens": 1200,
+    "completion_tokens": 300,
+    "prompt_tokens_details": {"cached_tokens": 1024},
+  }
+  anthropic = {
+    "prompt_tokens": 1500,
+    "completion_tokens": 200,
+    "cache_read_input_tokens": 1100,
+    "cache_creation_input_tokens": 0,
+  }
+  assert usage_counts(openai)["cached_prompt_tokens"] == 1024
+  assert usage_counts(anthropic)["cached_prompt_tokens"] == 1100
+  assert usage_counts(None)["prompt_tokens"] == 0
+
+
+def test_router_sends_layout_and_records_usage(monkeypatch):
+  seen = []
+
+  async def fake_acompletion(**kwargs):
+    seen.append(kwargs)
+    message = SimpleNamespace(content=_PAGE)
+    return SimpleNamespace(
+      choices=[SimpleNamespace(message=message)],
+      usage={"prompt_tokens": 1000, "completion_tokens": 50, "cache_read_input_tokens": 900},
+    )
+
+  monkeypatch.setattr(litellm, "acompletion", fake_acompletion)
+  usage = TokenUsage()
+  for _ in range(2):
+    asyncio.run(
+      request_vision_json(
+        "anthropic/claude-sonnet-4",
+        b"png",
+        "static",
+        page_prompt="Page image size: width_px=10, height_px=20.",
+        usage=usage,
+      )
+    )
+  assert seen[0]["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+  [stats] = usage.stats()
+  assert stats["calls"] == 2
+  assert stats["cached_prompt_tokens"] == 1800
+  assert stats["uncached_prompt_tokens"] == 200
+  assert stats["cache_hit_rate"] == 0.9